@@ -23,8 +23,10 @@ from core.config import (
     get_target_description,
 )
 from core.engine import XTFSyncEngine
+from api import RetryableAPIClient
 from core.reader import DataFileReader
 from utils.excel_reader import smart_read_excel, print_engine_info
+from utils.xlsx_peek import list_sheets
 
 
 def setup_logger():
@@ -54,16 +56,13 @@ def main():
     print_engine_info()
 
     try:
-        # 解析目标类型
-        target_type = ConfigManager.parse_target_type()
+        # 命令行参数只解析一次，目标类型和配置文件路径都取自同一结果
+        args = ConfigManager.parse_args()
+        target_type = ConfigManager.parse_target_type(args)
         print(f"\n🎯 目标类型: {target_type.value}")
         print(f"📝 描述: {get_target_description(target_type)}")
         
         # 获取配置文件路径
-        import argparse
-        parser = argparse.ArgumentParser(add_help=False)
-        parser.add_argument('--config', '-c', type=str, default='config.yaml')
-        args, _ = parser.parse_known_args()
         config_file = args.config
         
         # 如果配置文件不存在，创建示例配置
@@ -74,7 +73,7 @@ def main():
             return
         
         # 创建配置和同步引擎
-        config = ConfigManager.create_config()
+        config = ConfigManager.create_config(args)
 
         # 根据配置调整日志级别
         # 修复: 从配置中读取日志级别并应用，添加安全验证
@@ -92,6 +91,7 @@ def main():
         print(f"  批处理大小: {config.batch_size}")
         print(f"  接口调用间隔: {config.rate_limit_delay}秒")
         print(f"  最大重试次数: {config.max_retries}")
+        print(f"  Excel引擎: {config.excel_engine}")
         print(f"  日志级别: {config.log_level}")
         
         # 目标特定信息
@@ -121,6 +121,18 @@ def main():
         # 使用统一的文件读取器
         print(f"\n📖 读取文件: {file_path}")
         print(f"   文件格式: {file_path.suffix.upper()}")
+        if file_path.suffix.lower() in ('.xlsx', '.xls'):
+            print(f"   {print_engine_info(verbose=False, engine=config.excel_engine)}")
+        if file_path.suffix.lower() == '.xlsx':
+            try:
+                sheets = list_sheets(file_path)
+                print(f"   工作表: {', '.join(sheets)}")
+                missing_sheets = [name for name in (config.excel_sheets or []) if name not in sheets]
+                if missing_sheets:
+                    print(f"\n❌ 错误: 工作表不存在 - {', '.join(missing_sheets)}")
+                    return
+            except ValueError as e:
+                logger.debug(f"工作表探测失败: {e}")
 
         # 如果是CSV文件，显示测试阶段警告
         if file_path.suffix.lower() == '.csv':
@@ -128,9 +140,15 @@ def main():
             print("   🏭 生产环境建议使用Excel格式(.xlsx/.xls)")
 
         try:
-            reader = DataFileReader()
-            df = reader.read_file(file_path)
+            reader = DataFileReader(
+                excel_engine=config.excel_engine,
+                sheet_names=config.excel_sheets,
+                concurrent_sheets=config.concurrent_sheets
+            )
+            df = reader.read_file(file_path, **config.get_read_kwargs())
             print(f"✅ 文件读取成功，共 {len(df)} 行，{len(df.columns)} 列")
+            if df.attrs.get('excel_engine') == 'openpyxl' and not df.attrs.get('excel_read_only'):
+                print("   ⚠️  警告: OpenPyXL 未使用只读流式模式读取，大文件可能占用较多内存")
         except ValueError as e:
             print(f"\n❌ 文件读取失败: {e}")
             return
@@ -159,6 +177,9 @@ def main():
     except Exception as e:
         print(f"\n❌ 程序异常: {e}")
         logger.error("程序异常", exc_info=True)
+    finally:
+        # 释放共享HTTP连接池
+        RetryableAPIClient.close_session()
 
 
 if __name__ == "__main__":
@@ -4,14 +4,21 @@
 """
 
 from .auth import FeishuAuth
-from .base import RateLimiter, RetryableAPIClient
+from .base import RateLimitState, RateLimiter, TokenBucket, RetryableAPIClient
+from .concurrency import AIMDController
+from .adaptive_batch import AdaptiveBatcher
 from .bitable import BitableAPI
-from .sheet import SheetAPI
+from .sheet import SheetAPI, StyleBatcher
 
 __all__ = [
     'FeishuAuth',
+    'RateLimitState',
     'RateLimiter',
+    'TokenBucket',
     'RetryableAPIClient',
+    'AIMDController',
+    'AdaptiveBatcher',
     'BitableAPI',
-    'SheetAPI'
+    'SheetAPI',
+    'StyleBatcher'
 ]
\ No newline at end of file
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应批大小模块
+基于AIMD（加性增、乘性减）根据响应延迟和结果动态调整批大小
+"""
+
+import logging
+
+
+class AdaptiveBatcher:
+    """
+    自适应批大小调节器
+
+    - 批次成功且延迟低于目标值时，批大小增加 step
+    - 批次失败（请求过大、超时、频率限制等）时，批大小减半
+    - 批大小始终保持在 [min_size, max_size] 范围内
+    """
+
+    def __init__(self, initial: int = 100, min_size: int = 10, max_size: int = 500,
+                 step: int = 50, latency_target: float = 2.0):
+        """
+        初始化自适应批大小调节器
+
+        Args:
+            initial: 初始批大小
+            min_size: 最小批大小
+            max_size: 最大批大小
+            step: 每次加性增长的步长
+            latency_target: 目标延迟（秒），超过时不再增长
+        """
+        if min_size < 1 or max_size < min_size:
+            raise ValueError(f"批大小范围无效: min_size={min_size}, max_size={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.step = step
+        self.latency_target = latency_target
+        self._size = max(min_size, min(max_size, initial))
+        self.logger = logging.getLogger('XTF.adaptive_batch')
+
+    def next_size(self) -> int:
+        """获取下一批次的大小"""
+        return self._size
+
+    def observe(self, latency: float, success: bool):
+        """
+        根据上一批次的结果调整批大小
+
+        Args:
+            latency: 批次耗时（秒）
+            success: 批次是否成功
+        """
+        old_size = self._size
+        if not success:
+            self._size = max(self.min_size, self._size // 2)
+        elif latency <= self.latency_target:
+            self._size = min(self.max_size, self._size + self.step)
+
+        if self._size != old_size:
+            self.logger.debug(f"批大小调整: {old_size} -> {self._size} (耗时 {latency:.2f}s, 成功: {success})")
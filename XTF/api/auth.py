@@ -5,11 +5,13 @@
 负责获取和管理飞书访问令牌
 """
 
+import time
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
-from .base import RetryableAPIClient, RateLimiter
+from .base import RetryableAPIClient, RateLimiter, parse_json
 
 
 class FeishuAuth:
@@ -31,7 +33,12 @@ class FeishuAuth:
         
         # Token管理
         self.tenant_access_token = None
-        self.token_expires_at = None
+        self.token_expires_at = None  # 过期时间（仅用于展示）
+        # 刷新截止时间（单调时钟，提前5分钟刷新），不受系统时间调整影响
+        self._token_deadline = 0.0
+        
+        # 认证头缓存（令牌刷新时重建），以只读视图共享给所有调用方
+        self._headers_cache: Optional[Mapping[str, str]] = None
     
     def get_tenant_access_token(self) -> str:
         """
@@ -44,8 +51,7 @@ class FeishuAuth:
             Exception: 当获取令牌失败时
         """
         # 检查token是否过期
-        if (self.tenant_access_token and self.token_expires_at and 
-            datetime.now() < self.token_expires_at - timedelta(minutes=5)):
+        if self.tenant_access_token and time.monotonic() < self._token_deadline:
             return self.tenant_access_token
         
         url = "https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal"
@@ -58,7 +64,7 @@ class FeishuAuth:
         response = self.api_client.call_api("POST", url, headers=headers, json=data)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             raise Exception(f"获取访问令牌响应解析失败: {e}, HTTP状态码: {response.status_code}")
         
@@ -70,19 +76,29 @@ class FeishuAuth:
         # 设置过期时间（提前5分钟刷新）
         expires_in = result.get("expire", 7200)
         self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+        self._token_deadline = time.monotonic() + expires_in - 300
+        
+        # 令牌刷新后重建认证头缓存
+        self._headers_cache = MappingProxyType({
+            "Authorization": f"Bearer {self.tenant_access_token}",
+            "Content-Type": "application/json; charset=utf-8"
+        })
         
         self.logger.info("成功获取租户访问令牌")
         return self.tenant_access_token
     
-    def get_auth_headers(self) -> Dict[str, str]:
+    def get_auth_headers(self) -> Mapping[str, str]:
         """
         获取认证头
         
+        返回缓存的只读映射，令牌有效期内所有请求共享同一对象；
+        需要追加请求头时请先复制为 dict。
+        
         Returns:
-            包含认证信息的HTTP头字典
+            包含认证信息的HTTP头只读映射
         """
-        token = self.get_tenant_access_token()
-        return {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json; charset=utf-8"
-        }
\ No newline at end of file
+        if self._headers_cache is not None and time.monotonic() < self._token_deadline:
+            return self._headers_cache
+        
+        self.get_tenant_access_token()
+        return self._headers_cache
\ No newline at end of file
@@ -5,37 +5,359 @@
 提供HTTP请求重试机制和频率限制功能，支持新的统一控制系统
 """
 
+import json
 import time
 import logging
+import threading
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Optional, Mapping, Any, Dict
+
+# 可选的高性能JSON库（编码时释放GIL，速度为标准库的2-5倍）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    解析响应JSON，优先使用 orjson
+    
+    Args:
+        response: 响应对象
+        
+    Returns:
+        解析后的JSON对象
+        
+    Raises:
+        ValueError: 响应内容不是有效JSON时（orjson.JSONDecodeError 同为 ValueError 子类）
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _contains_non_finite(obj: Any) -> bool:
+    """检查对象中是否含有 NaN/Infinity 浮点数（包括 NumPy 标量和数组）"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            # NaN 与 ±Infinity 自减结果均为 NaN，有限数为 0
+            if value - value != 0:
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif getattr(value, 'dtype', None) is not None and value.dtype.kind in 'fc':
+            import numpy as np
+            if not np.isfinite(value).all():
+                return True
+    return False
+
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    将对象编码为 UTF-8 JSON 字节串，优先使用 orjson
+    
+    无论是否安装 orjson，含 NaN/Infinity 的对象都会抛出 ValueError（与 requests 的 json= 一致）。
+    
+    Args:
+        obj: 待编码对象
+        
+    Returns:
+        JSON 字节串
+        
+    Raises:
+        ValueError: 对象中含有 NaN/Infinity
+        TypeError: 对象无法编码为JSON
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            body = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+        else:
+            # orjson 会把 NaN/Infinity 静默编码为 null；只有输出含 null 时才需要检查，
+            # 确有非有限数时交给下方标准库编码，抛出与未安装 orjson 时相同的错误
+            if b'null' not in body or not _contains_non_finite(obj):
+                return body
+    # 与 requests 的 json= 编码保持一致：不允许 NaN/Infinity；
+    # 不转义非ASCII字符并去掉分隔符空格，中文内容的请求体约为默认编码的一半
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+def _encode_json_body(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将 json= 请求体预先编码为 UTF-8 字节串 data=，并补充 Content-Type
+    
+    优先使用 orjson；未安装时使用不转义非ASCII字符的标准库编码，
+    避免 requests 默认编码将每个中文字符转义为6字节。
+    不修改调用方传入的 headers（认证头为共享缓存对象）；
+    无法编码的对象保留 json= 交给 requests 处理。
+    """
+    if kwargs.get('json') is None:
+        return kwargs
+    try:
+        body = dumps_json(kwargs['json'])
+    except (TypeError, ValueError):
+        return kwargs
+    
+    encoded = dict(kwargs)
+    del encoded['json']
+    encoded['data'] = body
+    headers = dict(encoded.get('headers') or {})
+    headers.setdefault('Content-Type', 'application/json; charset=utf-8')
+    encoded['headers'] = headers
+    return encoded
+
+
+class RateLimitState:
+    """
+    服务端频控状态
+
+    根据飞书返回的频控响应头（x-ogw-ratelimit-* / x-ratelimit-* / Retry-After）
+    记录剩余配额，在配额即将耗尽时主动暂停到重置时间，实现闭环限速。
+    """
+    
+    LIMIT_HEADERS = ('x-ogw-ratelimit-limit', 'x-ratelimit-limit')
+    REMAINING_HEADERS = ('x-ogw-ratelimit-remaining', 'x-ratelimit-remaining')
+    RESET_HEADERS = ('x-ogw-ratelimit-reset', 'x-ratelimit-reset')
+    
+    def __init__(self, min_remaining: int = 2, remaining_ratio: float = 0.1):
+        """
+        初始化频控状态
+        
+        Args:
+            min_remaining: 剩余配额低于该值时暂停
+            remaining_ratio: 剩余配额低于 limit * ratio 时暂停
+        """
+        self.min_remaining = min_remaining
+        self.remaining_ratio = remaining_ratio
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.resume_at = 0.0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('XTF.base')
+    
+    @staticmethod
+    def _first_number(headers: Mapping[str, str], names) -> Optional[float]:
+        """读取第一个存在且可解析的数值响应头"""
+        for name in names:
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                continue
+        return None
+    
+    @staticmethod
+    def _to_delay(value: float, now: float) -> float:
+        """将重置时间转换为等待秒数（兼容绝对时间戳和相对秒数）"""
+        if value > 1e9:  # Unix 时间戳
+            return max(0.0, value - now)
+        return max(0.0, value)
+    
+    def update(self, headers: Mapping[str, str]):
+        """
+        根据响应头更新频控状态
+        
+        Args:
+            headers: 响应头（大小写不敏感的映射，如 requests 的 response.headers）
+        """
+        if not headers:
+            return
+        now = time.time()
+        limit = self._first_number(headers, self.LIMIT_HEADERS)
+        remaining = self._first_number(headers, self.REMAINING_HEADERS)
+        reset = self._first_number(headers, self.RESET_HEADERS)
+        retry_after = self._first_number(headers, ('retry-after',))
+        
+        with self._lock:
+            if limit is not None:
+                self.limit = int(limit)
+            if remaining is not None:
+                self.remaining = int(remaining)
+            
+            pause = 0.0
+            if retry_after is not None:
+                pause = self._to_delay(retry_after, now)
+            elif reset is not None and self.remaining is not None:
+                threshold = max(self.min_remaining, self.remaining_ratio * (self.limit or 0))
+                if self.remaining <= threshold:
+                    pause = self._to_delay(reset, now)
+            
+            if pause > 0 and now + pause > self.resume_at:
+                self.resume_at = now + pause
+                self.logger.debug(f"服务端配额即将耗尽 (剩余: {self.remaining}/{self.limit})，暂停 {pause:.2f} 秒")
+    
+    def retry_delay(self) -> float:
+        """距离服务端配额恢复的剩余秒数"""
+        return max(0.0, self.resume_at - time.time())
+    
+    def pause_if_needed(self):
+        """配额耗尽时等待到重置时间"""
+        delay = self.retry_delay()
+        if delay > 0:
+            time.sleep(delay)
 
 
 class RateLimiter:
-    """接口频率限制器"""
+    """接口频率限制器（固定间隔作为下限，服务端频控响应头作为动态上限）"""
     
-    def __init__(self, delay: float = 0.5):
+    def __init__(self, delay: float = 0.5, state: Optional[RateLimitState] = None):
         """
         初始化频率限制器
         
         Args:
             delay: 调用间隔时间（秒）
+            state: 服务端频控状态，未提供时自动创建
         """
         self.delay = delay
         self.last_call = 0
+        self.state = state or RateLimitState()
+        self._lock = threading.Lock()
     
     def wait(self):
-        """等待以遵守频率限制"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call
-        if time_since_last < self.delay:
-            time.sleep(self.delay - time_since_last)
-        self.last_call = time.time()
+        """等待以遵守频率限制（线程安全，并发批次共享同一间隔）"""
+        self.state.pause_if_needed()
+        with self._lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_call
+            if time_since_last < self.delay:
+                time.sleep(self.delay - time_since_last)
+            self.last_call = time.time()
+
+
+class TokenBucket:
+    """
+    令牌桶限速器
+    
+    按固定速率补充令牌，桶内有令牌时立即放行，仅在令牌耗尽时等待；
+    触发频率限制时速率减半，成功调用后逐步恢复（AIMD）。
+    可指定上级令牌桶（如全局限速），获取令牌时需同时满足本桶和上级令牌桶。
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0, min_rate: Optional[float] = None,
+                 parent: Optional['TokenBucket'] = None):
+        """
+        初始化令牌桶
+        
+        Args:
+            rate: 每秒补充的令牌数（即目标QPS），inf 表示不限速
+            capacity: 桶容量（允许的突发请求数）
+            min_rate: 频率限制时速率下调的下限，默认为 rate 的 1/16
+            parent: 上级令牌桶，获取本桶令牌后还需获取上级令牌桶的令牌
+        """
+        if rate <= 0:
+            raise ValueError(f"rate 必须大于0，当前为 {rate}")
+        
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.parent = parent
+        self.logger = logging.getLogger('XTF.base')
+    
+    @classmethod
+    def from_interval(cls, interval: float, capacity: float = 1.0,
+                      parent: Optional['TokenBucket'] = None) -> 'TokenBucket':
+        """
+        按调用间隔创建令牌桶
+        
+        Args:
+            interval: 调用间隔（秒），小于等于0时不限速
+            capacity: 桶容量
+            parent: 上级令牌桶
+            
+        Returns:
+            令牌桶实例
+        """
+        return cls(1.0 / interval if interval > 0 else float('inf'), capacity, parent=parent)
+    
+    def acquire(self, tokens: float = 1.0):
+        """获取令牌，令牌不足时等待（线程安全）；配置了上级令牌桶时随后获取其令牌"""
+        self._acquire_own(tokens)
+        if self.parent is not None:
+            self.parent.acquire(tokens)
+    
+    def _acquire_own(self, tokens: float):
+        """获取本桶令牌，令牌不足时等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) / self.rate
+            time.sleep(wait_time)
+    
+    def on_throttled(self):
+        """记录一次频率限制，速率减半"""
+        with self._lock:
+            if self.rate == float('inf'):
+                return
+            old_rate = self.rate
+            self.rate = max(self.min_rate, self.rate / 2)
+        if self.rate != old_rate:
+            self.logger.warning(f"触发频率限制，请求速率从 {old_rate:.2f}/s 降至 {self.rate:.2f}/s")
+    
+    def on_success(self):
+        """记录一次成功调用，速率加性恢复至初始值"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
 
 
 class RetryableAPIClient:
     """可重试的API客户端，支持新的统一控制系统"""
     
+    # 进程内共享的HTTP会话，复用TCP/TLS连接
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        获取共享的HTTP会话（懒加载）
+        
+        Returns:
+            配置了连接池的 requests.Session
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.headers['Connection'] = 'keep-alive'
+                    # 适配器层不做重试，重试与退避统一由 call_api 处理，避免重试次数叠加
+                    adapter = HTTPAdapter(pool_connections=cls.POOL_CONNECTIONS,
+                                          pool_maxsize=cls.POOL_MAXSIZE,
+                                          max_retries=0)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    cls._session = session
+        return cls._session
+    
+    @classmethod
+    def close_session(cls):
+        """关闭共享的HTTP会话，释放连接池"""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+    
     def __init__(self, max_retries: int = 3, rate_limiter: Optional[RateLimiter] = None, 
                  use_global_controller: bool = True):
         """
@@ -55,7 +377,8 @@ class RetryableAPIClient:
         self._controller = None
         if self.use_global_controller:
             try:
-                from core.control import GlobalRequestController
+                from core.control import GlobalRequestController, rate_limit_key
+                self._rate_limit_key = rate_limit_key
                 global_controller = GlobalRequestController()
                 controller = global_controller.get_controller()
                 if controller:
@@ -85,10 +408,14 @@ class RetryableAPIClient:
         Raises:
             Exception: 当所有重试都失败时
         """
+        kwargs = _encode_json_body(kwargs)
+        
         # 如果配置了全局控制器并且可用，使用新的统一控制系统
         if self.use_global_controller and self._controller:
             def _make_request():
-                response = requests.request(method, url, timeout=60, **kwargs)
+                self.rate_limiter.state.pause_if_needed()
+                response = self.get_session().request(method, url, timeout=60, **kwargs)
+                self.rate_limiter.state.update(response.headers)
                 
                 # 检查是否需要重试的响应状态
                 if response.status_code == 429:  # 频率限制
@@ -99,7 +426,7 @@ class RetryableAPIClient:
                 
                 return response
             
-            return self._controller.execute_request(_make_request)
+            return self._controller.execute_request(_make_request, key=self._rate_limit_key(url))
         
         # 否则使用传统的重试和频控机制（向后兼容）
         return self._call_api_legacy(method, url, **kwargs)
@@ -112,13 +439,15 @@ class RetryableAPIClient:
             try:
                 self.rate_limiter.wait()
                 
-                response = requests.request(method, url, timeout=60, **kwargs)
+                response = self.get_session().request(method, url, timeout=60, **kwargs)
+                self.rate_limiter.state.update(response.headers)
                 
                 # 检查是否需要重试
                 if response.status_code == 429:  # 频率限制
                     if attempt < self.max_retries:
-                        wait_time = 2 ** attempt  # 指数退避
-                        self.logger.warning(f"频率限制，等待 {wait_time} 秒后重试...")
+                        # 优先遵循服务端 Retry-After / 重置时间，否则指数退避
+                        wait_time = self.rate_limiter.state.retry_delay() or 2 ** attempt
+                        self.logger.warning(f"频率限制，等待 {wait_time:.2f} 秒后重试...")
                         time.sleep(wait_time)
                         continue
                 
@@ -5,12 +5,25 @@
 提供飞书多维表格的字段和记录操作功能
 """
 
-import uuid
+import secrets
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Dict, Any, List, Optional, Tuple, Union, Iterator, FrozenSet
 
 from .auth import FeishuAuth
-from .base import RetryableAPIClient
+from .base import RetryableAPIClient, parse_json
+
+
+def _new_client_token() -> str:
+    """
+    生成 uuidv4 格式的 client_token（飞书要求标准 uuidv4 格式）
+    
+    直接由随机字节设置版本位和变体位后格式化，不构造 UUID 对象。
+    """
+    raw = bytearray(secrets.token_bytes(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # 版本号 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 变体
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 class BitableAPI:
@@ -27,25 +40,25 @@ class BitableAPI:
         self.auth = auth
         self.api_client = api_client or auth.api_client
         self.logger = logging.getLogger('XTF.bitable')
+        
+        # 字段名集合缓存: (app_token, table_id) -> frozenset(field_name)
+        self._field_names_cache: Dict[Tuple[str, str], FrozenSet[str]] = {}
     
-    def list_fields(self, app_token: str, table_id: str) -> List[Dict[str, Any]]:
+    def iter_fields(self, app_token: str, table_id: str) -> Iterator[Dict[str, Any]]:
         """
-        列出表格字段
+        逐页迭代表格字段
         
         Args:
             app_token: 应用Token
             table_id: 数据表ID
             
-        Returns:
-            字段列表
+        Yields:
+            字段信息字典
             
         Raises:
             Exception: 当API调用失败时
         """
         url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/fields"
-        headers = self.auth.get_auth_headers()
-        
-        all_fields = []
         page_token = None
         
         while True:
@@ -53,10 +66,10 @@ class BitableAPI:
             if page_token:
                 params["page_token"] = page_token
             
-            response = self.api_client.call_api("GET", url, headers=headers, params=params)
+            response = self.api_client.call_api("GET", url, headers=self.auth.get_auth_headers(), params=params)
             
             try:
-                result = response.json()
+                result = parse_json(response)
             except ValueError as e:
                 raise Exception(f"获取字段列表响应解析失败: {e}, HTTP状态码: {response.status_code}")
             
@@ -65,13 +78,51 @@ class BitableAPI:
                 raise Exception(f"获取字段列表失败: 错误码 {result.get('code')}, 错误信息: {error_msg}")
             
             data = result.get("data", {})
-            all_fields.extend(data.get("items", []))
+            yield from data.get("items", [])
             
             if not data.get("has_more"):
                 break
             page_token = data.get("page_token")
+    
+    def list_fields(self, app_token: str, table_id: str) -> List[Dict[str, Any]]:
+        """
+        列出表格字段
         
-        return all_fields
+        Args:
+            app_token: 应用Token
+            table_id: 数据表ID
+            
+        Returns:
+            字段列表
+            
+        Raises:
+            Exception: 当API调用失败时
+        """
+        fields = list(self.iter_fields(app_token, table_id))
+        self._field_names_cache[(app_token, table_id)] = frozenset(
+            field.get('field_name', '') for field in fields
+        )
+        return fields
+    
+    def has_field(self, app_token: str, table_id: str, field_name: str) -> bool:
+        """
+        检查字段是否存在（基于字段名集合缓存，O(1)）
+        
+        缓存由 list_fields 建立，create_field 成功后失效并在下次检查时重新拉取。
+        
+        Args:
+            app_token: 应用Token
+            table_id: 数据表ID
+            field_name: 字段名称
+            
+        Returns:
+            字段是否存在
+        """
+        names = self._field_names_cache.get((app_token, table_id))
+        if names is None:
+            self.list_fields(app_token, table_id)
+            names = self._field_names_cache[(app_token, table_id)]
+        return field_name in names
     
     def create_field(self, app_token: str, table_id: str, field_name: str, field_type: int = 1) -> bool:
         """
@@ -96,7 +147,7 @@ class BitableAPI:
         response = self.api_client.call_api("POST", url, headers=headers, json=data)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"创建字段 '{field_name}' 响应解析失败: {e}, HTTP状态码: {response.status_code}")
             return False
@@ -106,6 +157,9 @@ class BitableAPI:
             self.logger.error(f"创建字段 '{field_name}' 失败: 错误码 {result.get('code')}, 错误信息: {error_msg}")
             return False
         
+        # 字段集合已变化，使缓存失效
+        self._field_names_cache.pop((app_token, table_id), None)
+        
         # 获取字段类型信息用于日志显示
         field_type_name = self._get_field_type_display_name(field_type)
         field_config_info = {"type": field_type}
@@ -143,7 +197,7 @@ class BitableAPI:
         response = self.api_client.call_api("POST", url, headers=headers, params=params, json=data)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             raise Exception(f"搜索记录响应解析失败: {e}, HTTP状态码: {response.status_code}")
         
@@ -157,28 +211,38 @@ class BitableAPI:
         
         return records, next_page_token
     
-    def get_all_records(self, app_token: str, table_id: str) -> List[Dict]:
+    def iter_all_records(self, app_token: str, table_id: str) -> Iterator[Dict]:
         """
-        获取所有记录
+        逐页迭代所有记录，每次仅在内存中保留一页数据
         
         Args:
             app_token: 应用Token
             table_id: 数据表ID
             
-        Returns:
-            所有记录的列表
+        Yields:
+            记录字典
         """
-        all_records = []
         page_token = None
         
         while True:
             records, page_token = self.search_records(app_token, table_id, page_token)
-            all_records.extend(records)
+            yield from records
             
             if not page_token:
                 break
+    
+    def get_all_records(self, app_token: str, table_id: str) -> List[Dict]:
+        """
+        获取所有记录
         
-        return all_records
+        Args:
+            app_token: 应用Token
+            table_id: 数据表ID
+            
+        Returns:
+            所有记录的列表
+        """
+        return list(self.iter_all_records(app_token, table_id))
     
     def batch_create_records(self, app_token: str, table_id: str, records: List[Dict]) -> bool:
         """
@@ -196,7 +260,7 @@ class BitableAPI:
         headers = self.auth.get_auth_headers()
         
         # 生成唯一的client_token，并添加性能优化参数
-        client_token = str(uuid.uuid4())
+        client_token = _new_client_token()
         params = {
             "client_token": client_token,
             "ignore_consistency_check": "true",  # 忽略一致性检查，提高性能
@@ -208,7 +272,7 @@ class BitableAPI:
         response = self.api_client.call_api("POST", url, headers=headers, params=params, json=data)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"批量创建记录响应解析失败: {e}, HTTP状态码: {response.status_code}")
             self.logger.debug(f"响应内容: {response.text[:500]}")
@@ -251,7 +315,7 @@ class BitableAPI:
         response = self.api_client.call_api("POST", url, headers=headers, params=params, json=data)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"批量更新记录响应解析失败: {e}, HTTP状态码: {response.status_code}")
             self.logger.debug(f"响应内容: {response.text[:500]}")
@@ -287,7 +351,7 @@ class BitableAPI:
         response = self.api_client.call_api("POST", url, headers=headers, json=data)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"批量删除记录响应解析失败: {e}, HTTP状态码: {response.status_code}")
             self.logger.debug(f"响应内容: {response.text[:500]}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并发控制模块
+提供基于AIMD（加性增、乘性减）的自适应并发度控制
+"""
+
+import threading
+import logging
+
+
+class AIMDController:
+    """
+    AIMD并发控制器
+
+    - 请求成功且延迟低于目标值时，并发上限加性增长 alpha
+    - 请求失败（频率限制、服务器错误等）时，并发上限乘以 beta
+    - 并发上限始终保持在 [c_min, c_max] 范围内
+    """
+
+    def __init__(self, c_min: int = 1, c_max: int = 16, alpha: float = 0.5,
+                 beta: float = 0.5, latency_target: float = 2.0):
+        """
+        初始化AIMD控制器
+
+        Args:
+            c_min: 最小并发数
+            c_max: 最大并发数
+            alpha: 加性增长步长
+            beta: 乘性减少因子（0-1）
+            latency_target: 目标延迟（秒），超过时不再增长
+        """
+        if c_min < 1 or c_max < c_min:
+            raise ValueError(f"并发范围无效: c_min={c_min}, c_max={c_max}")
+        if not 0 < beta < 1:
+            raise ValueError(f"beta 必须在 (0, 1) 范围内，当前为 {beta}")
+
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_target = latency_target
+
+        self._limit = float(c_min)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self.logger = logging.getLogger('XTF.concurrency')
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return max(self.c_min, min(self.c_max, int(self._limit)))
+
+    def acquire(self):
+        """获取一个并发槽位，达到上限时阻塞等待"""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        """释放并发槽位"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float):
+        """
+        记录一次成功请求
+
+        Args:
+            latency: 请求耗时（秒）
+        """
+        with self._cond:
+            if latency <= self.latency_target and self._limit < self.c_max:
+                self._limit = min(float(self.c_max), self._limit + self.alpha)
+                self._cond.notify_all()
+
+    def on_error(self):
+        """记录一次失败请求，并发上限乘性减少"""
+        with self._cond:
+            old_limit = self.limit
+            self._limit = max(float(self.c_min), self._limit * self.beta)
+            if self.limit != old_limit:
+                self.logger.warning(f"检测到请求失败，并发度从 {old_limit} 降至 {self.limit}")
@@ -5,19 +5,160 @@
 提供飞书电子表格的读写操作功能
 """
 
+import gzip
 import logging
+import random
+import re
 import time
-from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterable, Iterator
 
 from .auth import FeishuAuth
-from .base import RetryableAPIClient
+from .base import RetryableAPIClient, TokenBucket, parse_json, dumps_json
+
+# 可选的流式JSON解析库（读取大范围数据时逐行解析，降低峰值内存）
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# 范围字符串解析，如 "Sheet1!A1:C10" -> (sheet_id, 起始列, 起始行, 结束列, 结束行)
+_RANGE_RE = re.compile(r'^([^!]+)!([A-Z]+)(\d+):([A-Z]+)(\d+)$')
+
+# 下拉列表颜色数量不足时用于补齐的默认颜色
+_DEFAULT_DROPDOWN_COLORS: Tuple[str, ...] = ("#1FB6C1", "#F006C2", "#FB16C3", "#FFB6C1", "#32CD32", "#FF6347")
+
+
+@lru_cache(maxsize=32768)
+def _column_number_to_letter(col_num: int) -> str:
+    """将列号转换为字母（1->A, 2->B, ..., 26->Z, 27->AA），结果按列号缓存"""
+    result = ""
+    while col_num > 0:
+        col_num -= 1
+        result = chr(65 + col_num % 26) + result
+        col_num //= 26
+    return result or "A"
+
+
+@lru_cache(maxsize=32768)
+def _column_letter_to_number(col_letter: str) -> int:
+    """将列字母转换为数字（A->1, B->2, ..., AA->27），结果按列字母缓存"""
+    result = 0
+    # 转换为大写以处理小写字母
+    for char in col_letter.upper():
+        result = result * 26 + (ord(char) - ord('A') + 1)
+    return result
+
+
+@lru_cache(maxsize=256)
+def _formatter_description(formatter: str) -> str:
+    """获取数字/日期格式字符串的中文描述（同一批任务中格式通常只有少数几种）"""
+    lower = formatter.lower()
+    if 'yyyy' in lower or 'mm' in lower or 'dd' in lower:
+        return "日期格式"
+    elif '#' in formatter or '0' in formatter:
+        return "数字格式"
+    else:
+        return f"自定义格式({formatter})"
+
+
+@dataclass(frozen=True)
+class RangeSpec:
+    """解析后的单元格范围，如 Sheet1!A1:C10"""
+    sheet_id: str
+    start_col: str
+    start_col_num: int
+    start_row: int
+    end_col: str
+    end_col_num: int
+    end_row: int
+    
+    def __str__(self) -> str:
+        return f"{self.sheet_id}!{self.start_col}{self.start_row}:{self.end_col}{self.end_row}"
+
+
+def _parse_range(range_str: str) -> Optional[RangeSpec]:
+    """
+    解析范围字符串
+    
+    Args:
+        range_str: 范围字符串，如 "Sheet1!A1:C10"
+        
+    Returns:
+        RangeSpec，格式无效时返回 None
+    """
+    match = _RANGE_RE.match(range_str)
+    if not match:
+        return None
+    sheet_id, start_col, start_row, end_col, end_row = match.groups()
+    return RangeSpec(sheet_id, start_col, _column_letter_to_number(start_col), int(start_row),
+                     end_col, _column_letter_to_number(end_col), int(end_row))
+
+
+class StyleBatcher:
+    """
+    样式批量合并器
+    
+    在 with 语句块内，SheetAPI.set_cell_style（及 set_date_format / set_number_format）
+    不立即发送请求，而是缓存 (范围列表, 样式)；退出语句块时合并为尽量少的
+    styles_batch_update 请求，每个请求的 data 数组包含多组范围与样式。
+    
+    Examples:
+        >>> with sheet_api.batch_styles(token) as batch:
+        ...     sheet_api.set_date_format(token, date_ranges)
+        ...     sheet_api.set_number_format(token, number_ranges)
+        >>> batch.success
+        True
+    """
+    
+    def __init__(self, sheet_api: 'SheetAPI', spreadsheet_token: str):
+        """
+        初始化样式批量合并器
+        
+        Args:
+            sheet_api: 电子表格API实例
+            spreadsheet_token: 电子表格Token（仅合并该表格的样式设置）
+        """
+        self.sheet_api = sheet_api
+        self.spreadsheet_token = spreadsheet_token
+        self.entries: List[Tuple[List[str], Dict[str, Any]]] = []
+        self.success = True
+        self._previous: Optional['StyleBatcher'] = None
+    
+    def add(self, ranges: List[str], style: Dict[str, Any]):
+        """缓存一组范围及其样式"""
+        self.entries.append((ranges, style))
+    
+    def flush(self) -> bool:
+        """提交所有缓存的样式设置，返回是否全部成功"""
+        entries, self.entries = self.entries, []
+        return self.sheet_api._flush_style_entries(self.spreadsheet_token, entries)
+    
+    def __enter__(self) -> 'StyleBatcher':
+        self._previous = self.sheet_api._style_batcher
+        self.sheet_api._style_batcher = self
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.sheet_api._style_batcher = self._previous
+        if exc_type is None:
+            self.success = self.flush()
+        return False
 
 
 class SheetAPI:
     """飞书电子表格API客户端"""
     
     def __init__(self, auth: FeishuAuth, api_client: Optional[RetryableAPIClient] = None,
-                 start_row: int = 1, start_column: str = "A"):
+                 start_row: int = 1, start_column: str = "A", max_workers: int = 1,
+                 gzip_requests: bool = False, rate_limiter: Optional[TokenBucket] = None,
+                 sheet_rate_limit_delay: float = 0.0):
         """
         初始化电子表格API客户端
         
@@ -26,16 +167,131 @@ class SheetAPI:
             api_client: API客户端实例
             start_row: 起始行号 (1-based)
             start_column: 起始列号
+            max_workers: 互不重叠范围的最大并发请求数（1 表示串行）
+            gzip_requests: 是否对较大的写入请求体进行gzip压缩
+            rate_limiter: 所有写操作共享的令牌桶；未提供时各方法按自身的调用间隔限速
+            sheet_rate_limit_delay: 单个电子表格的最小调用间隔（秒），大于0时每个电子表格
+                使用独立的令牌桶（同时受共享令牌桶限制），0 表示仅使用共享令牌桶
         """
         self.auth = auth
         self.api_client = api_client or auth.api_client
         self.logger = logging.getLogger('XTF.sheet')
         self.ERROR_CODE_REQUEST_TOO_LARGE = 90227
+        self.ERROR_CODE_RATE_LIMITED = 99991400
+        # 请求未得到响应（底层重试耗尽）时使用的错误码
+        self.ERROR_CODE_TRANSPORT = -1
+        
+        # 写入遇到业务层频控时的重试次数与退避参数（秒）
+        self.MAX_WRITE_RETRIES = 3
+        self.WRITE_RETRY_BASE_DELAY = 0.5
+        self.WRITE_RETRY_MAX_DELAY = 30.0
+        
+        # 单次 values_batch_update 请求的范围数和单元格总数上限
+        self.MAX_RANGES_PER_REQUEST = 100
+        self.MAX_CELLS_PER_REQUEST = 100000
+        # 单次 styles_batch_update 请求合并的范围数上限（请求过大时二分）
+        self.MAX_STYLE_RANGES_PER_REQUEST = 100
+        
+        # 写入请求体压缩（超过阈值才压缩，小请求不值得付出CPU开销）
+        self.gzip_requests = gzip_requests
+        self.GZIP_MIN_BYTES = 32 * 1024
+        
+        # 按字节估算的单块数据上限（低于飞书请求体限制），请求过大时减半
+        self.BYTE_BUDGET = 4 * 1024 * 1024
+        self.MIN_BYTE_BUDGET = 256 * 1024
+        self.BYTE_SAMPLE_ROWS = 100
+        self._byte_budget = self.BYTE_BUDGET
+        
+        # 工作表网格尺寸缓存: spreadsheet_token -> (过期时间, {sheet_id: (行数, 列数)})
+        self.GRID_CACHE_TTL = 300
+        self._grid_cache: Dict[str, Tuple[float, Dict[str, Tuple[int, int]]]] = {}
+        
+        # 读取结果缓存: 键 -> (过期时间, 结果)，任何写操作都会使对应表格的缓存失效
+        self.SHEET_INFO_CACHE_TTL, self.SHEET_INFO_CACHE_SIZE = 60, 128
+        self.SHEET_READ_CACHE_TTL, self.SHEET_READ_CACHE_SIZE = 15, 256
+        self._sheet_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._sheet_read_cache: Dict[Tuple[str, str], Tuple[float, List[List[Any]]]] = {}
         
         # 存储起始位置配置
         self.start_row = start_row
         self.start_column = start_column
-        self.start_col_num = self.column_letter_to_number(start_column)
+        self.start_col_num = _column_letter_to_number(start_column)
+        self.max_workers = max(1, max_workers)
+        self._rate_limiter = rate_limiter
+        self.sheet_rate_limit_delay = sheet_rate_limit_delay
+        self._sheet_limiters: Dict[str, TokenBucket] = {}
+        
+        # 当前生效的样式批量合并器（见 batch_styles）
+        self._style_batcher: Optional[StyleBatcher] = None
+        
+        # 各 (电子表格, 列块宽度) 已知可成功上传的单块行数上限，供后续写入直接采用
+        self._safe_rows: Dict[Tuple[str, int], int] = {}
+    
+    @staticmethod
+    def _cache_get(cache: Dict, key) -> Optional[Any]:
+        """读取未过期的缓存值，不存在或已过期时返回 None"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            cache.pop(key, None)
+            return None
+        return entry[1]
+    
+    @staticmethod
+    def _cache_put(cache: Dict, key, value: Any, ttl: float, maxsize: int):
+        """写入缓存，超过容量时淘汰最早写入的条目"""
+        cache.pop(key, None)
+        while len(cache) >= maxsize:
+            cache.pop(next(iter(cache)))
+        cache[key] = (time.monotonic() + ttl, value)
+    
+    def invalidate(self, spreadsheet_token: str):
+        """
+        使指定电子表格的读取缓存失效（所有写操作开始前自动调用）
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+        """
+        self._sheet_info_cache.pop(spreadsheet_token, None)
+        for key in [key for key in self._sheet_read_cache if key[0] == spreadsheet_token]:
+            self._sheet_read_cache.pop(key, None)
+    
+    def _json_request_kwargs(self, headers, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        构建JSON请求体参数
+        
+        启用 gzip_requests 且编码后的请求体不小于 GZIP_MIN_BYTES 时，
+        以 Content-Encoding: gzip 发送压缩后的字节串。
+        
+        Args:
+            headers: 认证请求头
+            payload: 请求体对象
+            
+        Returns:
+            传给 call_api 的 headers/json 或 headers/data 参数
+        """
+        if not self.gzip_requests:
+            return {'headers': headers, 'json': payload}
+        return self._body_request_kwargs(headers, dumps_json(payload))
+    
+    def _body_request_kwargs(self, headers, body: bytes) -> Dict[str, Any]:
+        """
+        构建预编码JSON请求体参数（启用 gzip_requests 且超过阈值时压缩）
+        
+        Args:
+            headers: 认证请求头
+            body: 已编码的JSON字节串
+            
+        Returns:
+            传给 call_api 的 headers/data 参数
+        """
+        request_headers = dict(headers)
+        request_headers['Content-Type'] = 'application/json; charset=utf-8'
+        if self.gzip_requests and len(body) >= self.GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=3)
+            request_headers['Content-Encoding'] = 'gzip'
+        return {'headers': request_headers, 'data': body}
     
     def get_sheet_info(self, spreadsheet_token: str) -> Dict[str, Any]:
         """
@@ -50,13 +306,17 @@ class SheetAPI:
         Raises:
             Exception: 当API调用失败时
         """
+        cached = self._cache_get(self._sheet_info_cache, spreadsheet_token)
+        if cached is not None:
+            return cached
+        
         url = f"https://open.feishu.cn/open-apis/sheets/v3/spreadsheets/{spreadsheet_token}"
         headers = self.auth.get_auth_headers()
         
         response = self.api_client.call_api("GET", url, headers=headers)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             raise Exception(f"获取电子表格信息响应解析失败: {e}, HTTP状态码: {response.status_code}")
         
@@ -64,12 +324,57 @@ class SheetAPI:
             error_msg = result.get('msg', '未知错误')
             raise Exception(f"获取电子表格信息失败: 错误码 {result.get('code')}, 错误信息: {error_msg}")
         
-        return result.get("data", {})
+        info = result.get("data", {})
+        self._cache_put(self._sheet_info_cache, spreadsheet_token, info,
+                        self.SHEET_INFO_CACHE_TTL, self.SHEET_INFO_CACHE_SIZE)
+        return info
+    
+    def _get_sheet_grids(self, spreadsheet_token: str, refresh: bool = False) -> Dict[str, Tuple[int, int]]:
+        """
+        获取电子表格中各工作表的网格尺寸（带TTL缓存）
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            refresh: 是否忽略缓存强制刷新
+            
+        Returns:
+            {sheet_id: (行数, 列数)} 字典
+            
+        Raises:
+            Exception: 当API调用失败时
+        """
+        cached = self._grid_cache.get(spreadsheet_token)
+        if cached and not refresh and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        url = f"https://open.feishu.cn/open-apis/sheets/v3/spreadsheets/{spreadsheet_token}/sheets/query"
+        headers = self.auth.get_auth_headers()
+        
+        response = self.api_client.call_api("GET", url, headers=headers)
+        
+        try:
+            result = parse_json(response)
+        except ValueError as e:
+            raise Exception(f"获取工作表信息响应解析失败: {e}, HTTP状态码: {response.status_code}")
+        
+        if result.get("code") != 0:
+            error_msg = result.get('msg', '未知错误')
+            raise Exception(f"获取工作表信息失败: 错误码 {result.get('code')}, 错误信息: {error_msg}")
+        
+        grids = {}
+        for sheet in result.get("data", {}).get("sheets", []):
+            grid = sheet.get("grid_properties") or {}
+            grids[sheet.get("sheet_id")] = (grid.get("row_count", 0), grid.get("column_count", 0))
+        
+        self._grid_cache[spreadsheet_token] = (time.monotonic() + self.GRID_CACHE_TTL, grids)
+        return grids
     
     def get_sheet_data(self, spreadsheet_token: str, range_str: str) -> List[List[Any]]:
         """
         读取电子表格数据
         
+        结果会短时缓存，写操作会使缓存失效；调用方不应修改返回值。
+        
         Args:
             spreadsheet_token: 电子表格Token
             range_str: 范围字符串，如 "Sheet1!A1:C10"
@@ -77,6 +382,33 @@ class SheetAPI:
         Returns:
             二维数组表示的表格数据
             
+        Raises:
+            Exception: 当API调用失败时
+        """
+        key = (spreadsheet_token, range_str)
+        cached = self._cache_get(self._sheet_read_cache, key)
+        if cached is not None:
+            return cached
+        
+        values = list(self.iter_sheet_data(spreadsheet_token, range_str))
+        self._cache_put(self._sheet_read_cache, key, values,
+                        self.SHEET_READ_CACHE_TTL, self.SHEET_READ_CACHE_SIZE)
+        return values
+    
+    def iter_sheet_data(self, spreadsheet_token: str, range_str: str) -> Iterator[List[Any]]:
+        """
+        逐行读取电子表格数据
+        
+        安装 ijson 时以流式方式边下载边解析，不在内存中保留完整响应体；
+        否则一次性解析响应后逐行返回。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            range_str: 范围字符串，如 "Sheet1!A1:C10"
+            
+        Yields:
+            List[Any]: 单行数据
+            
         Raises:
             Exception: 当API调用失败时
         """
@@ -88,10 +420,14 @@ class SheetAPI:
         url = f"https://open.feishu.cn/open-apis/sheets/v2/spreadsheets/{spreadsheet_token}/values/{range_str}"
         headers = self.auth.get_auth_headers()
         
+        if IJSON_AVAILABLE:
+            yield from self._iter_values_streaming(url, headers)
+            return
+        
         response = self.api_client.call_api("GET", url, headers=headers)
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             raise Exception(f"读取电子表格数据响应解析失败: {e}, HTTP状态码: {response.status_code}")
         
@@ -101,7 +437,51 @@ class SheetAPI:
         
         data = result.get("data", {})
         value_range = data.get("valueRange", {})
-        return value_range.get("values", [])
+        yield from value_range.get("values", [])
+    
+    def _iter_values_streaming(self, url: str, headers) -> Iterator[List[Any]]:
+        """
+        流式请求并逐行解析 data.valueRange.values
+        
+        Args:
+            url: 读取数据的请求URL
+            headers: 请求头
+            
+        Yields:
+            List[Any]: 单行数据
+            
+        Raises:
+            Exception: 当响应解析失败或返回错误码时
+        """
+        row_prefix = 'data.valueRange.values.item'
+        response = self.api_client.call_api("GET", url, headers=headers, stream=True)
+        try:
+            # 由 urllib3 透明解压 gzip 等编码
+            response.raw.decode_content = True
+            code, msg = None, '未知错误'
+            builder = None
+            
+            try:
+                for prefix, event, value in ijson.parse(response.raw, use_float=True):
+                    if builder is not None:
+                        builder.event(event, value)
+                        if prefix == row_prefix and event == 'end_array':
+                            yield builder.value
+                            builder = None
+                    elif prefix == row_prefix and event == 'start_array':
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    elif prefix == 'code':
+                        code = value
+                    elif prefix == 'msg':
+                        msg = value
+            except ijson.JSONError as e:
+                raise Exception(f"读取电子表格数据响应解析失败: {e}, HTTP状态码: {response.status_code}")
+            
+            if code != 0:
+                raise Exception(f"读取电子表格数据失败: 错误码 {code}, 错误信息: {msg}")
+        finally:
+            response.close()
     
     def write_sheet_data(self, spreadsheet_token: str, sheet_id: str, values: List[List[Any]],
                          row_batch_size: int = 500, col_batch_size: int = 80,
@@ -115,81 +495,177 @@ class SheetAPI:
             values: 要写入的数据（包含表头）
             row_batch_size: 初始行批次大小
             col_batch_size: 列批次大小
-            rate_limit_delay: 接口调用间隔
+            rate_limit_delay: 接口调用间隔（未配置共享令牌桶时生效）
             
         Returns:
             是否写入成功
         """
+        self.invalidate(spreadsheet_token)
         if not values:
             self.logger.warning("写入数据为空")
             return True
 
         self.logger.info("🔄 执行写入操作 (具备自动二分重试能力)")
 
+        # 采用此前上传中学习到的安全行数，避免每次写入都重新触发请求过大错误
+        width = min(col_batch_size, len(values[0]))
+        safe_rows = self._safe_rows.get((spreadsheet_token, width))
+        if safe_rows is not None and safe_rows < row_batch_size:
+            self.logger.info(f"📏 采用已学习的安全行批次: {row_batch_size} -> {safe_rows}")
+            row_batch_size = safe_rows
+        
+        # 分块与上传流水线进行：数据块按需生成并合并为多范围请求，
+        # _run_tasks 同时在途的请求数有上限，因此已生成但未上传的数据块也有上限
         data_chunks = self._create_data_chunks(values, row_batch_size, col_batch_size)
-        total_chunks = len(data_chunks)
+        buckets = self._group_chunks_into_buckets(data_chunks)
         
-        self.logger.info(f"📦 初始数据分块完成: 共 {total_chunks} 个数据块")
+        self.logger.info(f"📦 开始分块上传: 行批次 {row_batch_size}，列批次 {col_batch_size}")
 
-        for i, chunk in enumerate(data_chunks, 1):
-            self.logger.info(f"--- 开始处理初始数据块 {i}/{total_chunks} ---")
-            if not self._upload_chunk_with_auto_split(spreadsheet_token, sheet_id, chunk, rate_limit_delay):
-                self.logger.error(f"❌ 初始数据块 {i}/{total_chunks} (行 {chunk['start_row']}-{chunk['end_row']}) 最终上传失败")
+        limiter = self._limiter(rate_limit_delay, spreadsheet_token)
+        total_chunks = 0
+        
+        def upload(i: int, bucket: List[Dict]) -> bool:
+            self.logger.info(f"--- 开始处理批量请求 {i} ({len(bucket)} 个数据块) ---")
+            if not self._upload_bucket_with_auto_split(spreadsheet_token, sheet_id, bucket, limiter):
+                self.logger.error(f"❌ 批量请求 {i} (行 {bucket[0]['start_row']}-{bucket[-1]['end_row']}) 最终上传失败")
                 return False
-            self.logger.info(f"--- ✅ 成功处理初始数据块 {i}/{total_chunks} ---")
+            self.logger.info(f"--- ✅ 成功处理批量请求 {i} ---")
+            return True
+        
+        def tasks() -> Iterator[Callable[[], bool]]:
+            nonlocal total_chunks
+            for i, bucket in enumerate(buckets, 1):
+                total_chunks += len(bucket)
+                yield lambda i=i, bucket=bucket: upload(i, bucket)
+        
+        if not self._run_tasks(tasks()):
+            return False
             
         self.logger.info(f"🎉 写入操作全部完成: 成功处理 {total_chunks} 个初始数据块")
         return True
     
-    def _write_single_batch(self, spreadsheet_token: str, range_str: str, values: List[List[Any]]) -> Tuple[bool, Optional[int]]:
+    def _group_chunks_into_buckets(self, data_chunks: Iterable[Dict]) -> Iterator[List[Dict]]:
         """
-        写入单个批次数据。
-
+        将数据块按顺序分组，每组的范围数、单元格总数和估算字节数不超过单次请求上限
+        
+        Args:
+            data_chunks: _create_data_chunks 生成的数据块
+            
         Returns:
-            元组 (是否成功, 错误码)
+            按需生成的数据块分组（字节上限在生成每组时读取，上传中收紧的预算对后续分组生效）
         """
-        url = f"https://open.feishu.cn/open-apis/sheets/v2/spreadsheets/{spreadsheet_token}/values"
-        headers = self.auth.get_auth_headers()
-        
-        data = {
-            "valueRange": {
-                "range": range_str,
-                "values": values
-            }
-        }
+        current = []
+        current_cells = 0
+        current_bytes = 0
+        
+        for chunk in data_chunks:
+            cells = (chunk['end_row'] - chunk['start_row'] + 1) * (chunk['end_col'] - chunk['start_col'] + 1)
+            est_bytes = chunk.get('est_bytes', 0)
+            if current and (len(current) >= self.MAX_RANGES_PER_REQUEST or
+                            current_cells + cells > self.MAX_CELLS_PER_REQUEST or
+                            current_bytes + est_bytes > self._byte_budget):
+                yield current
+                current = []
+                current_cells = 0
+                current_bytes = 0
+            current.append(chunk)
+            current_cells += cells
+            current_bytes += est_bytes
+        
+        if current:
+            yield current
+    
+    def _limiter(self, rate_limit_delay: float, spreadsheet_token: Optional[str] = None) -> TokenBucket:
+        """
+        获取本次操作使用的令牌桶
         
-        response = self.api_client.call_api("PUT", url, headers=headers, json=data)
+        Args:
+            rate_limit_delay: 未配置共享令牌桶时使用的调用间隔（秒）
+            spreadsheet_token: 电子表格Token，配置了 sheet_rate_limit_delay 时用于选择该表格的令牌桶
+            
+        Returns:
+            该电子表格的令牌桶（上级为共享令牌桶），共享令牌桶，或按调用间隔新建的令牌桶
+        """
+        sheet_limiter = self._sheet_limiter(spreadsheet_token)
+        if sheet_limiter is not None:
+            return sheet_limiter
+        return self._rate_limiter or TokenBucket.from_interval(rate_limit_delay)
+    
+    def _sheet_limiter(self, spreadsheet_token: Optional[str]) -> Optional[TokenBucket]:
+        """获取电子表格的独立令牌桶（按需创建），未启用按表格限速时返回None"""
+        if spreadsheet_token is None or self.sheet_rate_limit_delay <= 0:
+            return None
+        limiter = self._sheet_limiters.get(spreadsheet_token)
+        if limiter is None:
+            limiter = self._sheet_limiters.setdefault(
+                spreadsheet_token,
+                TokenBucket.from_interval(self.sheet_rate_limit_delay, parent=self._rate_limiter))
+        return limiter
+    
+    def _record_rate_limit(self, code: Optional[int], status_code: int, spreadsheet_token: Optional[str] = None):
+        """根据响应结果调整令牌桶的速率（启用按表格限速时调整该表格的令牌桶）"""
+        limiter = self._sheet_limiter(spreadsheet_token) or self._rate_limiter
+        if limiter is None:
+            return
+        if code == self.ERROR_CODE_RATE_LIMITED or status_code == 429:
+            limiter.on_throttled()
+        elif code == 0:
+            limiter.on_success()
+    
+    def _run_tasks(self, tasks: Iterable[Callable[[], bool]]) -> bool:
+        """
+        执行一组互不依赖的请求任务，任一任务失败即停止
         
-        try:
-            result = response.json()
-        except ValueError as e:
-            self.logger.error(f"写入电子表格数据响应解析失败: {e}, HTTP状态码: {response.status_code}")
-            self.logger.debug(f"响应内容: {response.text[:500]}")
-            return False, None
+        max_workers > 1 时使用线程池并发执行，同时在途的任务不超过 max_workers 个，
+        请求频率由任务内部的令牌桶控制；否则按顺序串行执行。
+        任务按需从 tasks 中取出，失败后剩余任务不再提交。
         
-        code = result.get("code")
-        if code != 0:
-            error_msg = result.get('msg', '未知错误')
-            self.logger.error(f"写入电子表格数据失败: 错误码 {code}, 错误信息: {error_msg}")
-            self.logger.debug(f"API响应: {result}")
-            return False, code
-        
-        self.logger.debug(f"成功写入 {len(values)} 行数据")
-        return True, 0
+        Args:
+            tasks: 返回是否成功的无参任务（列表或生成器）
+            
+        Returns:
+            是否全部成功
+        """
+        if self.max_workers <= 1:
+            return all(task() for task in tasks)
+        
+        task_iter = iter(tasks)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = set()
+            for task in task_iter:
+                in_flight.add(executor.submit(task))
+                if len(in_flight) < self.max_workers:
+                    continue
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                if not all(future.result() for future in done):
+                    return False
+            # 等待最后一轮在途任务结束
+            return all(future.result() for future in in_flight)
+    
+    def _write_single_batch(self, spreadsheet_token: str, range_str: str, values: List[List[Any]],
+                            body: Optional[bytes] = None) -> Tuple[bool, Optional[int]]:
+        """
+        写入单个批次数据。
+
+        Args:
+            spreadsheet_token: 电子表格Token
+            range_str: 范围字符串
+            values: 数据
+            body: 预先编码好的请求体（可选）
+
+        Returns:
+            元组 (是否成功, 错误码)
+        """
+        return self._batch_update_ranges(spreadsheet_token, [{"range": range_str, "values": values}], body=body)
     
     def column_number_to_letter(self, col_num: int) -> str:
         """将列号转换为字母（1->A, 2->B, ..., 26->Z, 27->AA）"""
-        result = ""
-        while col_num > 0:
-            col_num -= 1
-            result = chr(65 + col_num % 26) + result
-            col_num //= 26
-        return result or "A"
+        return _column_number_to_letter(col_num)
     
     def _build_range_string(self, sheet_id: str, start_row: int, start_col: int, end_row: int, end_col: int) -> str:
         """构建范围字符串"""
-        start_col_letter = self.column_number_to_letter(start_col)
-        end_col_letter = self.column_number_to_letter(end_col)
+        start_col_letter = _column_number_to_letter(start_col)
+        end_col_letter = _column_number_to_letter(end_col)
         return f"{sheet_id}!{start_col_letter}{start_row}:{end_col_letter}{end_row}"
     
     def append_sheet_data(self, spreadsheet_token: str, sheet_id: str, values: List[List[Any]],
@@ -203,11 +679,12 @@ class SheetAPI:
             sheet_id: 工作表ID
             values: 要追加的数据
             row_batch_size: 初始行批次大小
-            rate_limit_delay: 接口调用间隔
+            rate_limit_delay: 接口调用间隔（未配置共享令牌桶时生效）
             
         Returns:
             是否追加成功
         """
+        self.invalidate(spreadsheet_token)
         if not values:
             self.logger.warning("追加数据为空")
             return True
@@ -215,19 +692,22 @@ class SheetAPI:
         self.logger.info("➕ 执行追加操作 (具备自动二分重试能力)")
         
         # 对于追加操作，我们只按行分块
+        # 数据块按需生成，上一块追加完成后再切分下一块
         data_chunks = self._create_data_chunks(values, row_batch_size, len(values[0]) if values else 0)
-        total_chunks = len(data_chunks)
         
-        self.logger.info(f"📦 初始数据分块完成: 共 {total_chunks} 个数据块")
+        self.logger.info(f"📦 开始分块追加: 行批次 {row_batch_size}")
+        limiter = self._limiter(rate_limit_delay, spreadsheet_token)
+        total_chunks = 0
 
         for i, chunk in enumerate(data_chunks, 1):
-            self.logger.info(f"--- 开始处理初始追加块 {i}/{total_chunks} ---")
+            total_chunks = i
+            self.logger.info(f"--- 开始处理初始追加块 {i} ---")
             # 注意：追加操作的range只需要指定工作表ID
             append_range = f"{sheet_id}"
-            if not self._append_chunk_with_auto_split(spreadsheet_token, append_range, chunk['data'], rate_limit_delay):
-                self.logger.error(f"❌ 初始追加块 {i}/{total_chunks} 最终上传失败")
+            if not self._append_chunk_with_auto_split(spreadsheet_token, append_range, chunk['data'], limiter):
+                self.logger.error(f"❌ 初始追加块 {i} 最终上传失败")
                 return False
-            self.logger.info(f"--- ✅ 成功处理初始追加块 {i}/{total_chunks} ---")
+            self.logger.info(f"--- ✅ 成功处理初始追加块 {i} ---")
             
         self.logger.info(f"🎉 追加操作全部完成: 成功处理 {total_chunks} 个初始数据块")
         return True
@@ -249,16 +729,17 @@ class SheetAPI:
             }
         }
         
-        response = self.api_client.call_api("POST", url, headers=headers, json=data)
+        response = self.api_client.call_api("POST", url, **self._json_request_kwargs(headers, data))
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"追加电子表格数据响应解析失败: {e}, HTTP状态码: {response.status_code}")
             self.logger.debug(f"响应内容: {response.text[:500]}")
             return False, None
         
         code = result.get("code")
+        self._record_rate_limit(code, response.status_code, spreadsheet_token)
         if code != 0:
             error_msg = result.get('msg', '未知错误')
             self.logger.error(f"追加电子表格数据失败: 错误码 {code}, 错误信息: {error_msg}")
@@ -282,11 +763,12 @@ class SheetAPI:
             column_data: 字典，键为列名，值为该列的数据列表
             column_positions: 字典，键为列名，值为列位置（1-based）
             start_row: 开始行号（1-based）
-            rate_limit_delay: 接口调用间隔
+            rate_limit_delay: 接口调用间隔（未配置共享令牌桶时生效）
             
         Returns:
             是否写入成功
         """
+        self.invalidate(spreadsheet_token)
         if not column_data:
             self.logger.warning("选择性写入数据为空")
             return True
@@ -307,7 +789,7 @@ class SheetAPI:
         
         # 使用批量更新API
         if value_ranges:
-            time.sleep(rate_limit_delay)
+            self._limiter(rate_limit_delay, spreadsheet_token).acquire()
             success, _ = self._batch_update_ranges(spreadsheet_token, value_ranges)
             if success:
                 self.logger.info(f"✅ 选择性列写入成功: {len(value_ranges)} 个范围")
@@ -336,6 +818,11 @@ class SheetAPI:
         # 按列位置排序
         sorted_columns = sorted(column_data.keys(), key=lambda x: column_positions.get(x, 0))
         
+        # 列位置 -> 列名 反向映射（同一位置保留首个列名）
+        pos_to_name = {}
+        for name, pos in column_positions.items():
+            pos_to_name.setdefault(pos, name)
+        
         ranges_data = []
         i = 0
         
@@ -358,8 +845,8 @@ class SheetAPI:
             start_col = column_positions[sorted_columns[range_start]]
             end_col = column_positions[sorted_columns[range_end]]
             
-            start_col_letter = self.column_number_to_letter(start_col)
-            end_col_letter = self.column_number_to_letter(end_col)
+            start_col_letter = _column_number_to_letter(start_col)
+            end_col_letter = _column_number_to_letter(end_col)
             
             # 计算数据行数
             max_rows = max(len(column_data[col]) for col in sorted_columns[range_start:range_end+1])
@@ -367,30 +854,19 @@ class SheetAPI:
             
             range_str = f"{start_col_letter}{start_row}:{end_col_letter}{end_row}"
             
-            # 构建该范围的数据矩阵
-            range_values = []
-            for row_idx in range(max_rows):
-                row_data = []
-                for col_idx in range(start_col, end_col + 1):
-                    col_letter = self.column_number_to_letter(col_idx)
-                    # 查找对应的列名
-                    col_name = None
-                    for name, pos in column_positions.items():
-                        if pos == col_idx:
-                            col_name = name
-                            break
-                    
-                    if col_name and col_name in column_data:
-                        # 有数据的列
-                        if row_idx < len(column_data[col_name]):
-                            row_data.append(column_data[col_name][row_idx])
-                        else:
-                            row_data.append("")
-                    else:
-                        # 空列（用于填充间隔）
-                        row_data.append("")
-                
-                range_values.append(row_data)
+            # 构建该范围的数据矩阵：先按列补齐到 max_rows（空列用于填充间隔，短列以空字符串补齐），
+            # 再用 zip 一次性转置为行，避免逐单元格判断
+            empty_column = [""] * max_rows
+            padded_columns = []
+            for col_idx in range(start_col, end_col + 1):
+                col = column_data.get(pos_to_name.get(col_idx))
+                if col is None:
+                    padded_columns.append(empty_column)
+                elif len(col) < max_rows:
+                    padded_columns.append(list(col) + empty_column[len(col):])
+                else:
+                    padded_columns.append(col)
+            range_values = [list(row) for row in zip(*padded_columns)]
             
             ranges_data.append({
                 'range': range_str,
@@ -413,25 +889,124 @@ class SheetAPI:
         Returns:
             是否清空成功
         """
-        # 构建完整范围字符串用于验证
-        full_range = f"{sheet_id}!{range_str}"
+        return self.clear_sheet_ranges(spreadsheet_token, [f"{sheet_id}!{range_str}"])
+    
+    def clear_sheet_ranges(self, spreadsheet_token: str, ranges: List[str]) -> bool:
+        """
+        一次性清空多个范围的数据
         
-        # 验证范围有效性
-        is_valid, error_msg = self._validate_range(spreadsheet_token, full_range)
-        if not is_valid:
-            self.logger.error(f"清空数据范围验证失败: {error_msg}")
+        重复或被其他范围完全包含的范围会被去除，其余范围按单次请求的范围数上限合并提交。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            ranges: 完整范围字符串列表，如 ["Sheet1!A1:Z1000", "Sheet1!AB1:AC50"]
+            
+        Returns:
+            是否全部清空成功
+        """
+        self.invalidate(spreadsheet_token)
+        
+        # 验证范围格式和边界（网格限制在去重后统一验证）
+        specs = []
+        for full_range in ranges:
+            is_valid, error_msg = self._validate_range(spreadsheet_token, full_range, skip_grid_check=True)
+            if not is_valid:
+                self.logger.error(f"清空数据范围验证失败: {error_msg}")
+                return False
+            specs.append(_parse_range(full_range))
+        
+        specs = self._drop_covered_ranges(specs)
+        if not specs:
+            return True
+        
+        if not self._validate_ranges_size(spreadsheet_token, specs):
             return False
+        
+        for start in range(0, len(specs), self.MAX_RANGES_PER_REQUEST):
+            batch = [str(spec) for spec in specs[start:start + self.MAX_RANGES_PER_REQUEST]]
+            self.logger.info(f"准备清空范围: {', '.join(batch)}")
+            # 通过调用batch_update并传递空值数组来清空
+            # 修复: 使用空的 `values` 数组 `[]` 来清空范围，而不是 `[[]]`
+            value_ranges = [{"range": full_range, "values": []} for full_range in batch]
+            success, _ = self._batch_update_ranges(spreadsheet_token, value_ranges, is_clear=True)
+            if not success:
+                self.logger.error(f"❌ 范围 {', '.join(batch)} 清空失败")
+                return False
+            self.logger.info(f"✅ 范围 {', '.join(batch)} 清空成功")
+        return True
+    
+    @staticmethod
+    def _drop_covered_ranges(specs: List[RangeSpec]) -> List[RangeSpec]:
+        """去除重复范围及被同一工作表中其他范围完全包含的范围（保持原有顺序）"""
+        def covers(outer: RangeSpec, inner: RangeSpec) -> bool:
+            return (outer.sheet_id == inner.sheet_id and
+                    outer.start_row <= inner.start_row and inner.end_row <= outer.end_row and
+                    outer.start_col_num <= inner.start_col_num and inner.end_col_num <= outer.end_col_num)
+        
+        unique = list(dict.fromkeys(specs))
+        return [spec for spec in unique
+                if not any(other is not spec and covers(other, spec) for other in unique)]
+    
+    def write_many(self, spreadsheet_token: str, sheet_id: str, ranges_values: Dict[str, List[List[Any]]],
+                   rate_limit_delay: float = 0.05) -> bool:
+        """
+        以尽量少的请求写入多个互不相关的范围
+        
+        范围按单次请求的范围数和单元格总数上限合并为 values_batch_update 请求；
+        请求过大时将该组二分重试。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            sheet_id: 工作表ID
+            ranges_values: 范围（如 "A1:C10"）到二维数据的映射
+            rate_limit_delay: 接口调用间隔（未配置共享令牌桶时生效）
             
-        self.logger.info(f"准备清空范围: {full_range}")
-        # 通过调用batch_update并传递空值数组来清空
-        # 修复: 使用空的 `values` 数组 `[]` 来清空范围，而不是 `[[]]`
-        value_ranges = [{"range": full_range, "values": []}]
-        success, _ = self._batch_update_ranges(spreadsheet_token, value_ranges, is_clear=True)
-        if success:
-            self.logger.info(f"✅ 范围 {full_range} 清空成功")
-        else:
-            self.logger.error(f"❌ 范围 {full_range} 清空失败")
-        return success
+        Returns:
+            是否全部写入成功
+        """
+        self.invalidate(spreadsheet_token)
+        if not ranges_values:
+            return True
+        
+        groups = []
+        current, current_cells = [], 0
+        for range_str, values in ranges_values.items():
+            cells = sum(len(row) for row in values)
+            if current and (len(current) >= self.MAX_RANGES_PER_REQUEST or
+                            current_cells + cells > self.MAX_CELLS_PER_REQUEST):
+                groups.append(current)
+                current, current_cells = [], 0
+            current.append({"range": f"{sheet_id}!{range_str}", "values": values})
+            current_cells += cells
+        if current:
+            groups.append(current)
+        
+        self.logger.info(f"📦 多范围写入: {len(ranges_values)} 个范围，合并为 {len(groups)} 个批量请求")
+        limiter = self._limiter(rate_limit_delay, spreadsheet_token)
+        
+        # 使用栈来模拟递归，避免栈溢出
+        group_stack = list(reversed(groups))
+        while group_stack:
+            value_ranges = group_stack.pop()
+            limiter.acquire()
+            success, error_code = self._batch_update_ranges(spreadsheet_token, value_ranges)
+            if success:
+                continue
+            
+            if error_code == self.ERROR_CODE_REQUEST_TOO_LARGE and len(value_ranges) > 1:
+                self._shrink_byte_budget()
+                mid_point = len(value_ranges) // 2
+                self.logger.warning(f"检测到请求过大错误 (错误码 {error_code})，当前请求包含 {len(value_ranges)} 个范围，将进行二分。")
+                # 注意：后进先出，所以先压入后半部分
+                group_stack.append(value_ranges[mid_point:])
+                group_stack.append(value_ranges[:mid_point])
+                continue
+            
+            self.logger.error(f"❌ 多范围写入失败 (错误码: {error_code})")
+            return False
+        
+        self.logger.info(f"✅ 多范围写入成功: {len(ranges_values)} 个范围")
+        return True
     
     def set_dropdown_validation(self, spreadsheet_token: str, range_str: str, 
                                options: List[str], multiple_values: bool = False, 
@@ -451,12 +1026,15 @@ class SheetAPI:
         Returns:
             是否设置成功
         """
+        self.invalidate(spreadsheet_token)
         if not options:
             self.logger.warning("下拉列表选项为空，跳过设置")
             return True
             
         # 验证范围有效性
-        is_valid, error_msg = self._validate_range(spreadsheet_token, range_str)
+        spec = _parse_range(range_str)
+        is_valid, error_msg = self._validate_range_spec(spreadsheet_token, spec) if spec else \
+            (False, f"范围格式无效: {range_str}，期望格式如 'Sheet1!A1:C10'")
         if not is_valid:
             self.logger.error(f"下拉列表设置范围验证失败: {error_msg}")
             return False
@@ -467,16 +1045,7 @@ class SheetAPI:
             options = options[:500]
         
         # 验证选项值
-        valid_options = []
-        for option in options:
-            option_str = str(option)
-            if ',' in option_str:
-                self.logger.warning(f"选项值包含逗号，将被跳过: {option_str}")
-                continue
-            if len(option_str.encode('utf-8')) > 100:
-                self.logger.warning(f"选项值过长，将被截取: {option_str[:20]}...")
-                option_str = option_str[:50]  # 保守截取
-            valid_options.append(option_str)
+        valid_options = self._normalize_dropdown_options(options)
         
         if not valid_options:
             self.logger.warning("没有有效的下拉列表选项")
@@ -485,37 +1054,71 @@ class SheetAPI:
         # 处理颜色配置
         if colors and len(colors) != len(valid_options):
             self.logger.warning(f"颜色数量({len(colors)})与选项数量({len(valid_options)})不匹配，将自动补齐")
-            default_colors = ["#1FB6C1", "#F006C2", "#FB16C3", "#FFB6C1", "#32CD32", "#FF6347"]
-            colors = [colors[i % len(colors)] if i < len(colors) else default_colors[i % len(default_colors)] 
-                     for i in range(len(valid_options))]
+            colors = [colors[i] if i < len(colors) else _DEFAULT_DROPDOWN_COLORS[i % len(_DEFAULT_DROPDOWN_COLORS)]
+                      for i in range(len(valid_options))]
         
         # 分块处理下拉列表设置
         self.logger.info(f"📝 开始分块设置下拉列表，批次大小: {max_rows_per_batch} 行")
         
         # 将大范围分解为小块
-        range_chunks = self._split_range_into_chunks(range_str, max_rows_per_batch, 1)
-        success_count = 0
+        range_chunks = self._split_range_into_chunks(spec, max_rows_per_batch, 1)
+        total = self._count_range_chunks(spec, max_rows_per_batch, 1)
         
-        self.logger.info(f"📋 范围 {range_str} 分解为 {len(range_chunks)} 个块")
+        self.logger.info(f"📋 范围 {range_str} 分解为 {total} 个块")
         
-        for i, chunk in enumerate(range_chunks, 1):
-            chunk_range = chunk[0]  # 每个chunk包含一个range列表
-            
-            self.logger.info(f"🔄 设置下拉列表批次 {i}/{len(range_chunks)}: {chunk_range}")
+        limiter = self._limiter(0.1, spreadsheet_token)
+        
+        def set_batch(i: int, chunk_range: str) -> bool:
+            limiter.acquire()
+            self.logger.info(f"🔄 设置下拉列表批次 {i}/{total}: {chunk_range}")
             
             if self._set_dropdown_single_batch(spreadsheet_token, chunk_range, valid_options, 
                                              multiple_values, colors):
-                success_count += 1
                 self.logger.info(f"✅ 下拉列表批次 {i} 设置成功")
             else:
                 self.logger.error(f"❌ 下拉列表批次 {i} 设置失败")
                 return False
+            return True
+        
+        # 每个chunk包含一个range列表
+        tasks = [lambda i=i, chunk=chunk: set_batch(i, chunk[0]) for i, chunk in enumerate(range_chunks, 1)]
+        if not self._run_tasks(tasks):
+            return False
+        
+        self.logger.info(f"🎉 下拉列表设置完成: 成功 {total}/{total} 个批次")
+        return True
+    
+    def _normalize_dropdown_options(self, options: List[Any]) -> List[str]:
+        """
+        校验并规范化下拉列表选项：跳过含逗号的选项，截取超过100字节的选项
+        
+        UTF-8 每个字符最多4字节，25个字符以内的选项无需编码即可确定不超长；
+        纯ASCII选项的字节数等于字符数，也无需编码。
+        
+        Args:
+            options: 原始选项列表
             
-            # 接口频率控制
-            time.sleep(0.1)
+        Returns:
+            有效选项字符串列表
+        """
+        option_strs = list(map(str, options))
         
-        self.logger.info(f"🎉 下拉列表设置完成: 成功 {success_count}/{len(range_chunks)} 个批次")
-        return success_count == len(range_chunks)
+        # 快速路径：所有选项都不含逗号且都不可能超长时直接返回
+        if ',' not in ''.join(option_strs) and all(len(opt) <= 25 for opt in option_strs):
+            return option_strs
+        
+        valid_options = []
+        for option_str in option_strs:
+            if ',' in option_str:
+                self.logger.warning(f"选项值包含逗号，将被跳过: {option_str}")
+                continue
+            if len(option_str) > 25:
+                byte_len = len(option_str) if option_str.isascii() else len(option_str.encode('utf-8'))
+                if byte_len > 100:
+                    self.logger.warning(f"选项值过长，将被截取: {option_str[:20]}...")
+                    option_str = option_str[:50]  # 保守截取
+            valid_options.append(option_str)
+        return valid_options
     
     def _set_dropdown_single_batch(self, spreadsheet_token: str, range_str: str, 
                                   options: List[str], multiple_values: bool, 
@@ -545,85 +1148,160 @@ class SheetAPI:
             "dataValidation": data_validation
         }
         
-        response = self.api_client.call_api("POST", url, headers=headers, json=request_data)
+        response = self.api_client.call_api("POST", url, **self._json_request_kwargs(headers, request_data))
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"设置下拉列表响应解析失败: {e}, HTTP状态码: {response.status_code}")
             self.logger.debug(f"响应内容: {response.text[:500]}")
             return False
         
-        if result.get("code") != 0:
+        code = result.get("code")
+        self._record_rate_limit(code, response.status_code, spreadsheet_token)
+        if code != 0:
             error_msg = result.get('msg', '未知错误')
-            self.logger.error(f"设置下拉列表失败: 错误码 {result.get('code')}, 错误信息: {error_msg}")
-            self.logger.debug(f"请求数据: {request_data}")
-            self.logger.debug(f"API响应: {result}")
+            self.logger.error(f"设置下拉列表失败: 错误码 {code}, 错误信息: {error_msg}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"请求数据: {request_data}")
+                self.logger.debug(f"API响应: {result}")
             return False
         
         return True
     
-    def _validate_range(self, spreadsheet_token: str, range_str: str) -> Tuple[bool, str]:
+    def _validate_range(self, spreadsheet_token: str, range_str: str,
+                        skip_grid_check: bool = False) -> Tuple[bool, str]:
         """
         完整的范围有效性验证
         
         Args:
             spreadsheet_token: 电子表格Token
             range_str: 范围字符串，如 "Sheet1!A1:A10"
+            skip_grid_check: 是否跳过网格限制验证（调用方已对包含该范围的更大范围完成验证时使用）
             
         Returns:
             (是否有效, 错误信息)
         """
         # 1. 基本格式验证
-        import re
-        if not re.match(r'^[^!]+![A-Z]+\d+:[A-Z]+\d+$', range_str):
+        spec = _parse_range(range_str)
+        if spec is None:
             return False, f"范围格式无效: {range_str}，期望格式如 'Sheet1!A1:C10'"
         
-        # 2. 解析范围组件
-        try:
-            match = re.match(r'^([^!]+)!([A-Z]+)(\d+):([A-Z]+)(\d+)$', range_str)
-            if not match:
-                return False, f"无法解析范围: {range_str}"
-            
-            sheet_id, start_col, start_row, end_col, end_row = match.groups()
-            start_row, end_row = int(start_row), int(end_row)
+        return self._validate_range_spec(spreadsheet_token, spec, skip_grid_check)
+    
+    def _validate_range_spec(self, spreadsheet_token: str, spec: RangeSpec,
+                             skip_grid_check: bool = False) -> Tuple[bool, str]:
+        """
+        验证已解析范围的边界、逻辑关系和网格限制
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            spec: 已解析的范围
+            skip_grid_check: 是否跳过网格限制验证
             
-            # 3. 边界检查
+        Returns:
+            (是否有效, 错误信息)
+        """
+        try:
+            # 2. 边界检查
             MAX_ROWS = 1048576  # Excel/电子表格通用限制
             MAX_COLS = 16384    # Excel/电子表格通用限制
             
-            if start_row < 1 or end_row < 1:
-                return False, f"行号不能小于1: {start_row}-{end_row}"
-            
-            if start_row > MAX_ROWS or end_row > MAX_ROWS:
-                return False, f"行号超过限制({MAX_ROWS}): {start_row}-{end_row}"
+            if spec.start_row < 1 or spec.end_row < 1:
+                return False, f"行号不能小于1: {spec.start_row}-{spec.end_row}"
             
-            start_col_num = self.column_letter_to_number(start_col)
-            end_col_num = self.column_letter_to_number(end_col)
+            if spec.start_row > MAX_ROWS or spec.end_row > MAX_ROWS:
+                return False, f"行号超过限制({MAX_ROWS}): {spec.start_row}-{spec.end_row}"
             
-            if start_col_num > MAX_COLS or end_col_num > MAX_COLS:
-                return False, f"列号超过限制({MAX_COLS}): {start_col}-{end_col}"
+            if spec.start_col_num > MAX_COLS or spec.end_col_num > MAX_COLS:
+                return False, f"列号超过限制({MAX_COLS}): {spec.start_col}-{spec.end_col}"
             
-            # 4. 范围逻辑验证
-            if start_row > end_row:
-                return False, f"起始行({start_row})不能大于结束行({end_row})"
+            # 3. 范围逻辑验证
+            if spec.start_row > spec.end_row:
+                return False, f"起始行({spec.start_row})不能大于结束行({spec.end_row})"
             
-            if start_col_num > end_col_num:
-                return False, f"起始列({start_col})不能大于结束列({end_col})"
+            if spec.start_col_num > spec.end_col_num:
+                return False, f"起始列({spec.start_col})不能大于结束列({spec.end_col})"
             
-            # 5. 网格限制验证
-            if not self._validate_range_size(spreadsheet_token, range_str):
-                return False, f"范围超出电子表格网格限制: {range_str}"
+            # 4. 网格限制验证
+            if not skip_grid_check and not self._validate_range_size(spreadsheet_token, spec):
+                return False, f"范围超出电子表格网格限制: {spec}"
             
             return True, ""
             
         except Exception as e:
             return False, f"范围验证异常: {e}"
     
-    def _validate_range_size(self, spreadsheet_token: str, range_str: str) -> bool:
+    def _validate_range_size(self, spreadsheet_token: str, spec: RangeSpec) -> bool:
         """
         验证范围是否在表格网格限制内
         
+        优先使用缓存的工作表网格尺寸在本地比较；缓存判定越界时刷新一次再比较，
+        仍越界或工作表不在元数据中时才回退为网络探测（读取时服务端会自动裁剪超出网格的范围）。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            spec: 已解析的范围
+            
+        Returns:
+            是否在网格限制内
+        """
+        sheet_id = spec.sheet_id
+        try:
+            grids = self._get_sheet_grids(spreadsheet_token)
+            if sheet_id in grids and not self._within_grid(grids[sheet_id], spec):
+                # 表格可能已扩展，刷新缓存后再判断
+                grids = self._get_sheet_grids(spreadsheet_token, refresh=True)
+            if sheet_id in grids:
+                if self._within_grid(grids[sheet_id], spec):
+                    return True
+                self.logger.debug(f"范围 {spec} 超出缓存的网格尺寸 {grids[sheet_id]}，使用网络探测确认")
+        except Exception as e:
+            self.logger.debug(f"获取工作表网格尺寸失败，回退为网络探测: {e}")
+        
+        return self._probe_range_size(spreadsheet_token, str(spec))
+    
+    def _validate_ranges_size(self, spreadsheet_token: str, specs: List[RangeSpec]) -> bool:
+        """
+        验证多个范围是否都在表格网格限制内
+        
+        网格限制只取决于结束单元格，因此先按工作表验证一次包含所有范围的外接范围；
+        外接范围越界时才逐个验证。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            specs: 已解析的范围列表
+            
+        Returns:
+            是否全部在网格限制内
+        """
+        by_sheet: Dict[str, List[RangeSpec]] = {}
+        for spec in specs:
+            by_sheet.setdefault(spec.sheet_id, []).append(spec)
+        
+        for sheet_id, sheet_specs in by_sheet.items():
+            end_row = max(spec.end_row for spec in sheet_specs)
+            end_col_num = max(spec.end_col_num for spec in sheet_specs)
+            end_col = _column_number_to_letter(end_col_num)
+            bounding = RangeSpec(sheet_id, "A", 1, 1, end_col, end_col_num, end_row)
+            if len(sheet_specs) > 1 and self._validate_range_size(spreadsheet_token, bounding):
+                continue
+            for spec in sheet_specs:
+                if not self._validate_range_size(spreadsheet_token, spec):
+                    self.logger.error(f"范围超出电子表格网格限制: {spec}")
+                    return False
+        return True
+    
+    @staticmethod
+    def _within_grid(grid: Tuple[int, int], spec: RangeSpec) -> bool:
+        """判断范围的结束单元格是否位于 (行数, 列数) 网格内"""
+        row_count, col_count = grid
+        return spec.end_row <= row_count and spec.end_col_num <= col_count
+    
+    def _probe_range_size(self, spreadsheet_token: str, range_str: str) -> bool:
+        """
+        通过读取指定范围探测其是否在表格网格限制内
+        
         Args:
             spreadsheet_token: 电子表格Token
             range_str: 范围字符串，如 "Sheet1!A1:A10"
@@ -640,7 +1318,7 @@ class SheetAPI:
                 headers=self.auth.get_auth_headers()
             )
             
-            result = test_response.json()
+            result = parse_json(test_response)
             
             # 如果返回错误码90202，说明范围超出网格限制
             if result.get("code") == 90202:
@@ -671,6 +1349,7 @@ class SheetAPI:
         Returns:
             是否设置成功
         """
+        self.invalidate(spreadsheet_token)
         if not ranges:
             self.logger.warning("样式设置范围为空，跳过设置")
             return True
@@ -684,78 +1363,113 @@ class SheetAPI:
         
         self.logger.info(f"🎨 开始分块设置单元格样式，批次大小: {max_rows_per_batch}行 × {max_cols_per_batch}列")
         
-        success_batches = 0
-        total_batches = 0
+        style_type = self._get_style_type_description(style)
+        limiter = self._limiter(0.1, spreadsheet_token)
         
+        # 所有输入范围的分块依次合并进批量请求，每个请求包含多个范围
+        batches = []
+        pending = []
+        chunk_count = 0
         for range_str in ranges:
             # 解析范围
-            chunks = self._split_range_into_chunks(range_str, max_rows_per_batch, max_cols_per_batch)
-            total_batches += len(chunks)
+            spec = _parse_range(range_str)
+            if spec is None:
+                self.logger.warning(f"无法解析范围字符串: {range_str}")
+                chunks = [[range_str]]  # 使用原始范围
+                total = 1
+            else:
+                chunks = self._split_range_into_chunks(spec, max_rows_per_batch, max_cols_per_batch)
+                total = self._count_range_chunks(spec, max_rows_per_batch, max_cols_per_batch)
             
-            self.logger.info(f"📋 范围 {range_str} 分解为 {len(chunks)} 个块")
+            self.logger.info(f"📋 范围 {range_str} 分解为 {total} 个块")
+            chunk_count += total
             
-            # 分批处理每个块
-            for i, chunk_ranges in enumerate(chunks, 1):
-                # 解析范围信息用于详细日志
-                range_details = []
-                for chunk_range in chunk_ranges:
-                    range_details.append(self._parse_range_for_log(chunk_range))
-                
-                # 显示详细的处理信息
-                if len(range_details) == 1:
-                    detail = range_details[0]
-                    style_type = self._get_style_type_description(style)
-                    self.logger.info(f"🔄 设置{detail['col_name']}列的{detail['start_row']}-{detail['end_row']}行为{style_type} (批次 {i}/{len(chunks)})")
-                else:
-                    self.logger.info(f"🔄 处理样式批次 {i}/{len(chunks)}: {len(chunk_ranges)} 个范围")
-                
-                if self._set_style_single_batch(spreadsheet_token, chunk_ranges, style):
-                    success_batches += 1
-                    if len(range_details) == 1:
-                        detail = range_details[0]
-                        style_type = self._get_style_type_description(style)
-                        range_info = f"{detail['col_name']}{detail['start_row']}:{detail['col_name']}{detail['end_row']}"
-                        self.logger.info(f"✅ {detail['col_name']}列样式设置成功: 范围 {range_info}, 格式 {style_type}, 共 {detail['end_row'] - detail['start_row'] + 1} 行")
-                    else:
-                        total_ranges = len(chunk_ranges)
-                        style_type = self._get_style_type_description(style)
-                        self.logger.info(f"✅ 样式批次 {i} 设置成功: {total_ranges} 个范围, 格式 {style_type}")
-                else:
-                    self.logger.error(f"❌ 样式批次 {i} 设置失败")
-                    return False
-                
-                # 接口频率控制
-                time.sleep(0.1)
+            for chunk_ranges in chunks:
+                pending.extend(chunk_ranges)
+                if len(pending) >= self.MAX_STYLE_RANGES_PER_REQUEST:
+                    batches.append(pending)
+                    pending = []
+        if pending:
+            batches.append(pending)
+        
+        batcher = self._style_batcher
+        if batcher is not None and batcher.spreadsheet_token == spreadsheet_token:
+            for batch in batches:
+                batcher.add(batch, style)
+            self.logger.info(f"📥 {chunk_count} 个样式块已加入批量合并，退出批量上下文时统一提交")
+            return True
+        
+        self.logger.info(f"📦 {chunk_count} 个样式块合并为 {len(batches)} 个批量请求")
+        
+        tasks = [lambda i=i, batch=batch: self._set_style_chunk(spreadsheet_token, batch, style, style_type,
+                                                                 i, len(batches), limiter)
+                 for i, batch in enumerate(batches, 1)]
+        if not self._run_tasks(tasks):
+            return False
+        
+        self.logger.info(f"🎉 样式设置完成: 成功 {len(batches)}/{len(batches)} 个批次")
+        return True
+    
+    def _set_style_chunk(self, spreadsheet_token: str, chunk_ranges: List[str], style: Dict[str, Any],
+                         style_type: str, index: int, total: int, limiter: TokenBucket) -> bool:
+        """
+        设置单个样式批次并输出详细日志，请求过大时二分重试
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            chunk_ranges: 该批次包含的范围列表
+            style: 样式配置字典
+            style_type: 样式类型描述
+            index: 批次序号（1-based）
+            total: 批次总数
+            limiter: 令牌桶限速器
+            
+        Returns:
+            是否设置成功
+        """
+        # 单个范围时解析范围信息用于详细日志
+        detail = self._parse_range_for_log(chunk_ranges[0]) if len(chunk_ranges) == 1 else None
+        
+        # 显示详细的处理信息
+        if detail:
+            self.logger.info(f"🔄 设置{detail['col_name']}列的{detail['start_row']}-{detail['end_row']}行为{style_type} (批次 {index}/{total})")
+        else:
+            self.logger.info(f"🔄 处理样式批次 {index}/{total}: {len(chunk_ranges)} 个范围")
         
-        self.logger.info(f"🎉 样式设置完成: 成功 {success_batches}/{total_batches} 个批次")
-        return success_batches == total_batches
+        if not self._send_style_data(spreadsheet_token, [{"ranges": chunk_ranges, "style": style}], limiter):
+            self.logger.error(f"❌ 样式批次 {index} 设置失败")
+            return False
+        
+        if detail:
+            range_info = f"{detail['col_name']}{detail['start_row']}:{detail['col_name']}{detail['end_row']}"
+            row_count = detail['end_row'] - detail['start_row'] + 1 if 'sheet_id' in detail else '?'
+            self.logger.info(f"✅ {detail['col_name']}列样式设置成功: 范围 {range_info}, 格式 {style_type}, 共 {row_count} 行")
+        else:
+            self.logger.info(f"✅ 样式批次 {index} 设置成功: {len(chunk_ranges)} 个范围, 格式 {style_type}")
+        return True
     
     def _parse_range_for_log(self, range_str: str) -> Dict[str, Any]:
         """解析范围字符串用于日志显示"""
-        import re
-        match = re.match(r'([^!]+)!([A-Z]+)(\d+):([A-Z]+)(\d+)', range_str)
-        if match:
-            sheet_id, start_col, start_row, end_col, end_row = match.groups()
+        spec = _parse_range(range_str)
+        if spec:
             return {
-                'sheet_id': sheet_id,
-                'col_name': start_col if start_col == end_col else f"{start_col}-{end_col}",
-                'start_row': start_row,
-                'end_row': end_row
+                'sheet_id': spec.sheet_id,
+                'col_name': spec.start_col if spec.start_col == spec.end_col else f"{spec.start_col}-{spec.end_col}",
+                'start_row': spec.start_row,
+                'end_row': spec.end_row
             }
         return {'col_name': '未知', 'start_row': '?', 'end_row': '?'}
     
     def _parse_range_for_detailed_log(self, range_str: str) -> Dict[str, Any]:
-        """解析范围字符串用于详细日志显示"""
-        import re
-        match = re.match(r'([^!]+)!([A-Z]+)(\d+):([A-Z]+)(\d+)', range_str)
+        """解析范围字符串用于详细日志显示（只取正则分组，不构造 RangeSpec）"""
+        match = _RANGE_RE.match(range_str)
         if match:
-            sheet_id, start_col, start_row, end_col, end_row = match.groups()
             return {
-                'sheet_id': sheet_id,
-                'start_col': start_col,
-                'end_col': end_col,
-                'start_row': int(start_row),
-                'end_row': int(end_row)
+                'sheet_id': match[1],
+                'start_col': match[2],
+                'end_col': match[4],
+                'start_row': int(match[3]),
+                'end_row': int(match[5])
             }
         return {
             'sheet_id': '未知',
@@ -768,13 +1482,7 @@ class SheetAPI:
     def _get_style_type_description(self, style: Dict[str, Any]) -> str:
         """获取样式类型的中文描述"""
         if 'formatter' in style:
-            formatter = style['formatter']
-            if 'yyyy' in formatter.lower() or 'mm' in formatter.lower() or 'dd' in formatter.lower():
-                return "日期格式"
-            elif '#' in formatter or '0' in formatter:
-                return "数字格式"
-            else:
-                return f"自定义格式({formatter})"
+            return _formatter_description(style['formatter'])
         elif 'fore_color' in style or 'background_color' in style:
             return "颜色样式"
         elif 'bold' in style or 'italic' in style:
@@ -782,94 +1490,184 @@ class SheetAPI:
         else:
             return "样式"
     
-    def _split_range_into_chunks(self, range_str: str, max_rows: int, max_cols: int) -> List[List[str]]:
+    def _split_range_into_chunks(self, spec: RangeSpec, max_rows: int, max_cols: int) -> Iterator[List[str]]:
         """
-        将大范围分解为符合API限制的小块
+        将大范围分解为符合API限制的小块（按需逐块生成）
         
         Args:
-            range_str: 原始范围，如 "Sheet1!A1:AK94277"
+            spec: 已解析的原始范围，如 "Sheet1!A1:AK94277"
             max_rows: 最大行数
             max_cols: 最大列数
             
-        Returns:
-            分块后的范围列表的列表
+        Yields:
+            单个分块的范围列表
         """
-        import re
-        
-        # 解析范围字符串
-        match = re.match(r'([^!]+)!([A-Z]+)(\d+):([A-Z]+)(\d+)', range_str)
-        if not match:
-            self.logger.warning(f"无法解析范围字符串: {range_str}")
-            return [[range_str]]  # 返回原始范围
+        sheet_id = spec.sheet_id
+        start_row, end_row = spec.start_row, spec.end_row
+        start_col_num, end_col_num = spec.start_col_num, spec.end_col_num
         
-        sheet_id, start_col, start_row, end_col, end_row = match.groups()
-        start_row, end_row = int(start_row), int(end_row)
+        # 范围本身未超出限制时无需分块
+        if end_row - start_row + 1 <= max_rows and end_col_num - start_col_num + 1 <= max_cols:
+            yield [str(spec)]
+            return
         
-        # 转换列字母为数字
-        start_col_num = self.column_letter_to_number(start_col)
-        end_col_num = self.column_letter_to_number(end_col)
-        
-        chunks = []
+        # 预先计算范围内所有列字母，循环中按偏移取用
+        letters = [_column_number_to_letter(n) for n in range(start_col_num, end_col_num + 1)]
         
         # 按列分块
         for col_start in range(start_col_num, end_col_num + 1, max_cols):
             col_end = min(col_start + max_cols - 1, end_col_num)
+            # 同一列块的所有行块共用 "sheet!起始列" 前缀和结束列字母
+            prefix = f"{sheet_id}!{letters[col_start - start_col_num]}"
+            end_letter = letters[col_end - start_col_num]
             
             # 按行分块
             for row_start in range(start_row, end_row + 1, max_rows):
                 row_end = min(row_start + max_rows - 1, end_row)
-                
-                # 构建块范围
-                chunk_start_col = self.column_number_to_letter(col_start)
-                chunk_end_col = self.column_number_to_letter(col_end)
-                chunk_range = f"{sheet_id}!{chunk_start_col}{row_start}:{chunk_end_col}{row_end}"
-                
-                chunks.append([chunk_range])
-        
-        return chunks
+                yield [f"{prefix}{row_start}:{end_letter}{row_end}"]
+    
+    @staticmethod
+    def _count_range_chunks(spec: RangeSpec, max_rows: int, max_cols: int) -> int:
+        """计算 _split_range_into_chunks 将生成的分块数量（无需实际生成分块）"""
+        row_chunks = -(-(spec.end_row - spec.start_row + 1) // max_rows)
+        col_chunks = -(-(spec.end_col_num - spec.start_col_num + 1) // max_cols)
+        return row_chunks * col_chunks
     
     def column_letter_to_number(self, col_letter: str) -> int:
         """将列字母转换为数字（A->1, B->2, ..., AA->27）"""
-        result = 0
-        # 转换为大写以处理小写字母
-        for char in col_letter.upper():
-            result = result * 26 + (ord(char) - ord('A') + 1)
-        return result
+        return _column_letter_to_number(col_letter)
     
-    def _set_style_single_batch(self, spreadsheet_token: str, ranges: List[str], style: Dict[str, Any]) -> bool:
+    def batch_styles(self, spreadsheet_token: str) -> StyleBatcher:
+        """
+        创建样式批量合并上下文，语句块内对该表格的样式设置在退出时合并提交
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            
+        Returns:
+            样式批量合并器（退出语句块后通过 success 属性获取提交结果）
         """
-        设置单个批次的样式
+        return StyleBatcher(self, spreadsheet_token)
+    
+    def _flush_style_entries(self, spreadsheet_token: str, entries: List[Tuple[List[str], Dict[str, Any]]]) -> bool:
+        """
+        将缓存的 (范围列表, 样式) 合并为批量请求提交
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            entries: 缓存的范围列表与样式
+            
+        Returns:
+            是否全部设置成功
+        """
+        if not entries:
+            return True
+        
+        requests_data = []
+        current = []
+        current_ranges = 0
+        for ranges, style in entries:
+            if current and current_ranges + len(ranges) > self.MAX_STYLE_RANGES_PER_REQUEST:
+                requests_data.append(current)
+                current = []
+                current_ranges = 0
+            current.append({"ranges": ranges, "style": style})
+            current_ranges += len(ranges)
+        if current:
+            requests_data.append(current)
+        
+        self.logger.info(f"📦 {len(entries)} 组样式设置合并为 {len(requests_data)} 个批量请求")
+        limiter = self._limiter(0.1, spreadsheet_token)
+        
+        tasks = [lambda data=data: self._send_style_data(spreadsheet_token, data, limiter)
+                 for data in requests_data]
+        if not self._run_tasks(tasks):
+            self.logger.error("❌ 批量样式设置失败")
+            return False
+        
+        self.logger.info(f"🎉 批量样式设置完成: 成功 {len(requests_data)}/{len(requests_data)} 个批次")
+        return True
+    
+    def _send_style_data(self, spreadsheet_token: str, data: List[Dict[str, Any]], limiter: TokenBucket) -> bool:
+        """
+        提交一个 styles_batch_update 请求，请求过大时二分重试
+        
+        多组样式时按组二分；仅剩一组时按范围二分。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            data: styles_batch_update 的 data 数组，每项包含 ranges 和 style
+            limiter: 令牌桶限速器
+            
+        Returns:
+            是否设置成功
+        """
+        # 使用栈来模拟递归，避免栈溢出
+        data_stack = [data]
+        while data_stack:
+            current = data_stack.pop()
+            limiter.acquire()
+            success, error_code = self._styles_batch_update(spreadsheet_token, current)
+            if success:
+                continue
+            
+            if error_code == self.ERROR_CODE_REQUEST_TOO_LARGE:
+                if len(current) > 1:
+                    mid_point = len(current) // 2
+                    first, second = current[:mid_point], current[mid_point:]
+                elif len(current[0]["ranges"]) > 1:
+                    ranges, style = current[0]["ranges"], current[0]["style"]
+                    mid_point = len(ranges) // 2
+                    first = [{"ranges": ranges[:mid_point], "style": style}]
+                    second = [{"ranges": ranges[mid_point:], "style": style}]
+                else:
+                    return False
+                self.logger.warning(f"检测到请求过大错误 (错误码 {error_code})，将样式请求二分重试。")
+                # 注意：后进先出，所以先压入后半部分
+                data_stack.append(second)
+                data_stack.append(first)
+                continue
+            
+            return False
+        return True
+    
+    def _styles_batch_update(self, spreadsheet_token: str, data: List[Dict[str, Any]]) -> Tuple[bool, Optional[int]]:
+        """
+        调用 styles_batch_update 设置一组或多组范围的样式
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            data: 每项包含 ranges 和 style 的列表
+        
+        Returns:
+            元组 (是否成功, 错误码)
         """
         url = f"https://open.feishu.cn/open-apis/sheets/v2/spreadsheets/{spreadsheet_token}/styles_batch_update"
         headers = self.auth.get_auth_headers()
         
         # 构建请求数据
-        request_data = {
-            "data": [
-                {
-                    "ranges": ranges,
-                    "style": style
-                }
-            ]
-        }
+        request_data = {"data": data}
         
-        response = self.api_client.call_api("PUT", url, headers=headers, json=request_data)
+        response = self.api_client.call_api("PUT", url, **self._json_request_kwargs(headers, request_data))
         
         try:
-            result = response.json()
+            result = parse_json(response)
         except ValueError as e:
             self.logger.error(f"设置单元格样式响应解析失败: {e}, HTTP状态码: {response.status_code}")
             self.logger.debug(f"响应内容: {response.text[:500]}")
-            return False
+            return False, None
         
-        if result.get("code") != 0:
+        code = result.get("code")
+        self._record_rate_limit(code, response.status_code, spreadsheet_token)
+        if code != 0:
             error_msg = result.get('msg', '未知错误')
-            self.logger.error(f"设置单元格样式失败: 错误码 {result.get('code')}, 错误信息: {error_msg}")
-            self.logger.debug(f"请求数据: {request_data}")
-            self.logger.debug(f"API响应: {result}")
-            return False
+            self.logger.error(f"设置单元格样式失败: 错误码 {code}, 错误信息: {error_msg}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"请求数据: {request_data}")
+                self.logger.debug(f"API响应: {result}")
+            return False, code
         
-        return True
+        return True, 0
     
     def set_date_format(self, spreadsheet_token: str, ranges: List[str], 
                        date_format: str = "yyyy/MM/dd") -> bool:
@@ -890,91 +1688,239 @@ class SheetAPI:
         
         return self.set_cell_style(spreadsheet_token, ranges, style)
 
-    def _create_data_chunks(self, values: List[List[Any]], row_batch_size: int, col_batch_size: int) -> List[Dict]:
+    def _rows_within_byte_budget(self, values: List[List[Any]], max_rows: int,
+                                 col_start: int, col_end: int) -> Tuple[int, float]:
+        """
+        根据抽样估算的单元格平均字节数，计算列块 [col_start, col_end) 不超过字节预算的每块行数
+        
+        按列块分别抽样估算，避免少数大文本列拉高（或拉低）其他列块的估算值。
+        
+        Args:
+            values: 待写入数据
+            max_rows: 行批次上限
+            col_start: 列块起始下标（包含）
+            col_end: 列块结束下标（不包含）
+            
+        Returns:
+            元组 (每块行数（1 到 max_rows 之间）, 单元格平均字节数（无法估算时为0）)
+        """
+        width = col_end - col_start
+        sample = [row[col_start:col_end] for row in values[:self.BYTE_SAMPLE_ROWS]]
+        cells = sum(len(row) for row in sample)
+        if not cells or width <= 0:
+            return max_rows, 0.0
+        
+        try:
+            avg_cell_bytes = len(dumps_json(sample)) / cells
+        except (TypeError, ValueError):
+            return max_rows, 0.0
+        
+        rows = max(1, min(max_rows, int(self._byte_budget // (avg_cell_bytes * width))))
+        if rows < max_rows:
+            self.logger.info(f"📏 按字节预算调整第 {col_start + 1}-{col_end} 列的行批次: {max_rows} -> {rows} "
+                             f"(单元格均约 {avg_cell_bytes:.0f} 字节)")
+        return rows, avg_cell_bytes
+    
+    def _update_safe_rows(self, spreadsheet_token: str, width: int, num_rows: int, too_large: bool):
+        """
+        根据数据块上传结果更新 (电子表格, 列块宽度) 的安全行数（AIMD）
+        
+        请求过大时安全行数降为该块行数的一半；上传成功且已有记录时，
+        安全行数按成功行数的 25% 加性恢复。
+        
+        Args:
+            spreadsheet_token: 电子表格Token
+            width: 数据块列数
+            num_rows: 数据块行数
+            too_large: 是否因请求过大失败
+        """
+        key = (spreadsheet_token, width)
+        if too_large:
+            self._safe_rows[key] = max(1, num_rows // 2)
+            return
+        safe_rows = self._safe_rows.get(key)
+        if safe_rows is not None and num_rows >= safe_rows:
+            self._safe_rows[key] = num_rows + max(1, num_rows // 4)
+    
+    def _shrink_byte_budget(self):
+        """请求过大时将字节预算减半，供后续分块使用"""
+        new_budget = max(self.MIN_BYTE_BUDGET, self._byte_budget // 2)
+        if new_budget != self._byte_budget:
+            self.logger.info(f"字节预算调整: {self._byte_budget} -> {new_budget}")
+            self._byte_budget = new_budget
+    
+    def _create_data_chunks(self, values: List[List[Any]], row_batch_size: int, col_batch_size: int) -> Iterator[Dict]:
         """
         创建数据分块
         
+        以生成器形式按需产出，调用方上传一块再取下一块，无需一次性持有全部分块。
+        
         Returns:
-            包含分块信息的字典列表，每个字典包含：
+            按需生成的分块信息字典，每个字典包含：
             - data: 数据块
             - start_row, end_row: 行范围
             - start_col, end_col: 列范围
+            - est_bytes: 按抽样估算的序列化字节数
         """
-        chunks = []
         total_rows = len(values)
         total_cols = len(values[0]) if values else 0
+        start_row_offset = self.start_row
+        start_col_offset = self.start_col_num
         
         # 按列分块（外层循环）
         for col_start in range(0, total_cols, col_batch_size):
             col_end = min(col_start + col_batch_size, total_cols)
+            width = col_end - col_start
+            empty_pad = [""] * width
+            
+            # 按估算字节数收紧该列块的行批次，避免单块请求过大触发二分重试
+            rows_per_chunk, avg_cell_bytes = self._rows_within_byte_budget(values, row_batch_size, col_start, col_end)
             
             # 按行分块（内层循环）
-            for row_start in range(0, total_rows, row_batch_size):
-                row_end = min(row_start + row_batch_size, total_rows)
+            for row_start in range(0, total_rows, rows_per_chunk):
+                row_end = min(row_start + rows_per_chunk, total_rows)
+                
+                # 提取数据块，较短的行用空字符串补齐到列块宽度
+                rows = values[row_start:row_end]
+                if width == total_cols and all(len(row) == width for row in rows):
+                    # 列块覆盖整行且各行等宽时直接复用原始行对象，无需逐行复制
+                    chunk_data = rows
+                else:
+                    chunk_data = []
+                    for r in rows:
+                        if len(r) <= col_start:
+                            # 在该列块内无数据的行共用同一个补齐行对象，编码时只序列化一次
+                            chunk_data.append(empty_pad)
+                            continue
+                        row = r[col_start:col_end]
+                        if len(row) < width:
+                            row = [*row, *empty_pad[:width - len(row)]]
+                        chunk_data.append(row)
                 
-                # 提取数据块
-                chunk_data = []
-                for row_idx in range(row_start, row_end):
-                    if row_idx < len(values):
-                        chunk_row = values[row_idx][col_start:col_end]
-                        # 确保行长度与列块大小一致
-                        while len(chunk_row) < (col_end - col_start):
-                            chunk_row.append("")
-                        chunk_data.append(chunk_row)
+                # 应用配置的起始行和列偏移量
+                actual_start_row = row_start + start_row_offset
+                actual_start_col = col_start + start_col_offset
                 
-                if chunk_data:  # 只添加非空块
-                    # 应用配置的起始行和列偏移量
-                    actual_start_row = row_start + self.start_row
-                    actual_end_row = actual_start_row + len(chunk_data) - 1
-                    actual_start_col = col_start + self.start_col_num
-                    actual_end_col = actual_start_col + (col_end - col_start) - 1
-                    
-                    chunks.append({
-                        'data': chunk_data,
-                        'start_row': actual_start_row,
-                        'end_row': actual_end_row,
-                        'start_col': actual_start_col,
-                        'end_col': actual_end_col
-                    })
-        
-        return chunks
+                chunk = {
+                    'data': chunk_data,
+                    'start_row': actual_start_row,
+                    'end_row': actual_start_row + (row_end - row_start) - 1,
+                    'start_col': actual_start_col,
+                    'end_col': actual_start_col + width - 1,
+                    'est_bytes': int(avg_cell_bytes * len(chunk_data) * width)
+                }
+                yield chunk
 
-    def _upload_chunk_with_auto_split(self, spreadsheet_token: str, sheet_id: str, chunk: Dict, rate_limit_delay: float) -> bool:
+    def _encode_value_ranges(self, sheet_id: str, chunks: List[Dict]) -> bytes:
         """
-        上传单个数据块，如果因请求过大失败，则自动二分重试。
-        使用迭代实现避免栈溢出风险。
+        将数据块编码为 values_batch_update 请求体
+        
+        每行只序列化一次并缓存在数据块的 row_bytes 中，
+        二分重试时子块直接拼接已缓存的行字节串。
+        
+        Args:
+            sheet_id: 工作表ID
+            chunks: 数据块列表
+            
+        Returns:
+            JSON 请求体字节串
         """
-        # 使用栈来模拟递归，避免栈溢出
-        chunk_stack = [chunk]
+        parts = []
+        for chunk in chunks:
+            row_bytes = chunk.get('row_bytes')
+            if row_bytes is None:
+                row_bytes = chunk['row_bytes'] = self._encode_rows(chunk['data'])
+            range_str = self._build_range_string(sheet_id, chunk['start_row'], chunk['start_col'],
+                                                 chunk['end_row'], chunk['end_col'])
+            parts.append(self._encode_value_range(range_str, row_bytes))
+        return b'{"valueRanges":[' + b','.join(parts) + b']}'
+    
+    @staticmethod
+    def _encode_rows(rows: List[List[Any]]) -> List[bytes]:
+        """
+        逐行序列化数据块
         
-        while chunk_stack:
-            current_chunk = chunk_stack.pop()
+        同一个行对象在块内重复出现时（如共用的空白补齐行、按引用重复的行）只序列化一次，
+        其余位置复用同一个字节串。
+        
+        Args:
+            rows: 数据块的行列表
+            
+        Returns:
+            与 rows 一一对应的行JSON字节串列表
+        """
+        encoded: Dict[int, bytes] = {}
+        row_bytes = []
+        for row in rows:
+            key = id(row)
+            data = encoded.get(key)
+            if data is None:
+                data = encoded[key] = dumps_json(row)
+            row_bytes.append(data)
+        return row_bytes
+    
+    @staticmethod
+    def _encode_value_range(range_str: str, row_bytes: Iterable[bytes]) -> bytes:
+        """将范围字符串和已编码的行拼接为单个 valueRange 对象的JSON字节串"""
+        return b'{"range":' + dumps_json(range_str) + b',"values":[' + b','.join(row_bytes) + b']}'
+    
+    def _upload_chunk_with_auto_split(self, spreadsheet_token: str, sheet_id: str, chunk: Dict, limiter: TokenBucket) -> bool:
+        """
+        上传单个数据块，如果因请求过大失败，则自动二分重试。
+        使用迭代实现避免栈溢出风险；二分时只记录行下标区间，不复制数据块。
+        """
+        data = chunk['data']
+        row_bytes = chunk.pop('row_bytes', None)
+        if row_bytes is None:
+            row_bytes = self._encode_rows(data)
+        width = chunk['end_col'] - chunk['start_col'] + 1
+        
+        # 二分只改变行号，列字母和范围前缀在整个重试过程中保持不变
+        start_letter = _column_number_to_letter(chunk['start_col'])
+        end_letter = _column_number_to_letter(chunk['end_col'])
+        range_prefix = f"{sheet_id}!{start_letter}"
+        columns_info = f"{start_letter}列至{end_letter}列" if start_letter != end_letter else f"{start_letter}列"
+        
+        # 待上传的 [lo, hi) 行下标区间队列，按先进先出顺序处理：
+        # 同一层的区间先于更深层的分割被尝试，分割与成功交替进行
+        work = deque([(0, len(data))])
+        # 已确认请求过大的最小行数，不小于该行数的区间直接分割，不再浪费一次请求
+        too_large_rows = None
+        
+        while work:
+            lo, hi = work.popleft()
+            num_rows = hi - lo
+            if too_large_rows is not None and num_rows >= too_large_rows and num_rows > 1:
+                mid = lo + num_rows // 2
+                work.append((lo, mid))
+                work.append((mid, hi))
+                continue
+            
+            start_row = chunk['start_row'] + lo
+            end_row = chunk['start_row'] + hi - 1
             
             # 准备请求数据
-            range_str = self._build_range_string(sheet_id, current_chunk['start_row'], current_chunk['start_col'], 
-                                               current_chunk['end_row'], current_chunk['end_col'])
-            value_ranges = [{"range": range_str, "values": current_chunk['data']}]
+            range_str = f"{range_prefix}{start_row}:{end_letter}{end_row}"
             
-            self.logger.info(f"📤 尝试上传: {len(current_chunk['data'])} 行 (范围 {range_str})")
+            self.logger.info(f"📤 尝试上传: {num_rows} 行 (范围 {range_str})")
 
-            # 发起API调用
-            success, error_code = self._batch_update_ranges(spreadsheet_token, value_ranges)
+            # 发起API调用（令牌不足时等待），请求体由缓存的行字节串拼接而成
+            body = b'{"valueRanges":[' + self._encode_value_range(range_str, islice(row_bytes, lo, hi)) + b']}'
+            limiter.acquire()
+            success, error_code = self._batch_update_ranges(spreadsheet_token, [], body=body)
             
             if success:
-                # 解析范围信息用于日志显示
-                range_info = self._parse_range_for_detailed_log(range_str)
-                columns_info = f"{range_info['start_col']}列至{range_info['end_col']}列" if range_info['start_col'] != range_info['end_col'] else f"{range_info['start_col']}列"
-                rows_info = f"第{range_info['start_row']}-{range_info['end_row']}行" if range_info['start_row'] != range_info['end_row'] else f"第{range_info['start_row']}行"
-                
-                self.logger.info(f"✅ 上传成功: {len(current_chunk['data'])} 行数据至 {columns_info} {rows_info} (范围: {range_str})")
-                # 成功上传后进行频率控制
-                if rate_limit_delay > 0:
-                    time.sleep(rate_limit_delay)
-                continue  # 继续处理栈中的下一个块
+                self._update_safe_rows(spreadsheet_token, width, num_rows, too_large=False)
+                if self.logger.isEnabledFor(logging.INFO):
+                    rows_info = f"第{start_row}-{end_row}行" if start_row != end_row else f"第{start_row}行"
+                    self.logger.info(f"✅ 上传成功: {num_rows} 行数据至 {columns_info} {rows_info} (范围: {range_str})")
+                continue  # 继续处理队列中的下一个区间
                 
             # 如果失败，检查是否是请求过大错误
             if error_code == self.ERROR_CODE_REQUEST_TOO_LARGE:
-                num_rows = len(current_chunk['data'])
+                self._shrink_byte_budget()
+                self._update_safe_rows(spreadsheet_token, width, num_rows, too_large=True)
+                too_large_rows = num_rows if too_large_rows is None else min(too_large_rows, num_rows)
                 self.logger.warning(f"检测到请求过大错误 (错误码 {error_code})，当前块包含 {num_rows} 行，将进行二分。")
 
                 # 如果块已经小到无法再分，则视为最终失败
@@ -982,45 +1928,87 @@ class SheetAPI:
                     self.logger.error(f"❌ 块大小已为 {num_rows} 行，无法再分割，上传失败。")
                     return False
 
-                # 将当前块分割成两个子块并压入栈
-                mid_point = num_rows // 2
+                # 将当前区间分割成两个子区间加入队列（子块沿用已编码的行字节串）
+                mid = lo + num_rows // 2
+                work.append((lo, mid))
+                work.append((mid, hi))
                 
-                chunk1_data = current_chunk['data'][:mid_point]
-                chunk1 = {
-                    'data': chunk1_data,
-                    'start_row': current_chunk['start_row'],
-                    'end_row': current_chunk['start_row'] + len(chunk1_data) - 1,
-                    'start_col': current_chunk['start_col'],
-                    'end_col': current_chunk['end_col']
-                }
-
-                chunk2_data = current_chunk['data'][mid_point:]
-                chunk2 = {
-                    'data': chunk2_data,
-                    'start_row': current_chunk['start_row'] + mid_point,
-                    'end_row': current_chunk['start_row'] + mid_point + len(chunk2_data) - 1,
-                    'start_col': current_chunk['start_col'],
-                    'end_col': current_chunk['end_col']
-                }
-                
-                # 注意：后进先出，所以先压入chunk2，后压入chunk1
-                chunk_stack.append(chunk2)
-                chunk_stack.append(chunk1)
-                
-                self.logger.info(f" 分割为: 块1 ({len(chunk1_data)}行), 块2 ({len(chunk2_data)}行)")
-                continue  # 继续处理分割后的块
+                self.logger.info(f" 分割为: 块1 ({mid - lo}行), 块2 ({hi - mid}行)")
+                continue  # 继续处理分割后的区间
             
             # 其他类型的API错误，直接判为失败
             self.logger.error(f"❌ 上传发生不可恢复的错误 (错误码: {error_code})")
             return False
         
-        return True  # 所有块都成功上传
+        return True  # 所有区间都成功上传
+    
+    def _upload_bucket_with_auto_split(self, spreadsheet_token: str, sheet_id: str,
+                                       bucket: List[Dict], limiter: TokenBucket) -> bool:
+        """
+        以单次多范围请求上传一组数据块，如果因请求过大失败，则将该组二分重试。
+        分组只剩一个数据块时，交由 _upload_chunk_with_auto_split 按行二分。
+        """
+        # 使用栈来模拟递归，避免栈溢出
+        bucket_stack = [bucket]
+        
+        while bucket_stack:
+            current_bucket = bucket_stack.pop()
+            
+            if len(current_bucket) == 1:
+                if not self._upload_chunk_with_auto_split(spreadsheet_token, sheet_id, current_bucket[0], limiter):
+                    return False
+                continue
+            
+            if self.logger.isEnabledFor(logging.INFO):
+                total_rows = sum(len(chunk['data']) for chunk in current_bucket)
+                self.logger.info(f"📤 尝试批量上传: {len(current_bucket)} 个范围, 共 {total_rows} 行")
+            
+            # 请求体由缓存的行字节串拼接而成，无需再构建 valueRanges 对象
+            body = self._encode_value_ranges(sheet_id, current_bucket)
+            limiter.acquire()
+            success, error_code = self._batch_update_ranges(spreadsheet_token, [], body=body)
+            
+            if success:
+                for chunk in current_bucket:
+                    chunk.pop('row_bytes', None)
+                    self._update_safe_rows(spreadsheet_token, chunk['end_col'] - chunk['start_col'] + 1,
+                                           len(chunk['data']), too_large=False)
+                if self.logger.isEnabledFor(logging.INFO):
+                    first, last = current_bucket[0], current_bucket[-1]
+                    first_range = self._build_range_string(sheet_id, first['start_row'], first['start_col'],
+                                                           first['end_row'], first['end_col'])
+                    last_range = self._build_range_string(sheet_id, last['start_row'], last['start_col'],
+                                                          last['end_row'], last['end_col'])
+                    self.logger.info(f"✅ 批量上传成功: {len(current_bucket)} 个范围 ({first_range} ... {last_range})")
+                continue
+            
+            if error_code == self.ERROR_CODE_REQUEST_TOO_LARGE:
+                self._shrink_byte_budget()
+                mid_point = len(current_bucket) // 2
+                self.logger.warning(f"检测到请求过大错误 (错误码 {error_code})，当前请求包含 {len(current_bucket)} 个范围，将进行二分。")
+                
+                # 注意：后进先出，所以先压入后半部分
+                bucket_stack.append(current_bucket[mid_point:])
+                bucket_stack.append(current_bucket[:mid_point])
+                continue
+            
+            # 其他类型的API错误，直接判为失败
+            self.logger.error(f"❌ 批量上传发生不可恢复的错误 (错误码: {error_code})")
+            return False
+        
+        return True
     
-    def _append_chunk_with_auto_split(self, spreadsheet_token: str, range_str: str, values: List[List[Any]], rate_limit_delay: float) -> bool:
+    def _append_chunk_with_auto_split(self, spreadsheet_token: str, range_str: str, values: List[List[Any]], limiter: TokenBucket) -> bool:
         """
         追加单个数据块，如果因请求过大失败，则自动二分重试。
         使用迭代实现避免栈溢出风险。
         """
+        # 追加范围在重试过程中保持不变，日志所需的列信息只解析一次；未启用 INFO 日志时不解析
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            range_info = self._parse_range_for_detailed_log(range_str)
+            columns_info = f"{range_info['start_col']}列至{range_info['end_col']}列" if range_info['start_col'] != range_info['end_col'] else f"{range_info['start_col']}列"
+        
         # 使用栈来模拟递归，避免栈溢出
         values_stack = [values]
         
@@ -1029,22 +2017,19 @@ class SheetAPI:
             
             self.logger.info(f"📤 尝试追加: {len(current_values)} 行")
 
+            limiter.acquire()
             success, error_code = self._append_single_batch(spreadsheet_token, range_str, current_values)
             
             if success:
-                # 解析范围信息用于日志显示
-                range_info = self._parse_range_for_detailed_log(range_str)
-                columns_info = f"{range_info['start_col']}列至{range_info['end_col']}列" if range_info['start_col'] != range_info['end_col'] else f"{range_info['start_col']}列"
-                start_row = range_info['start_row']
-                end_row = start_row + len(current_values) - 1
-                rows_info = f"第{start_row}-{end_row}行" if start_row != end_row else f"第{start_row}行"
-                
-                self.logger.info(f"✅ 追加成功: {len(current_values)} 行数据至 {columns_info} {rows_info} (范围: {range_str})")
-                if rate_limit_delay > 0:
-                    time.sleep(rate_limit_delay)
+                if log_info:
+                    start_row = range_info['start_row']
+                    end_row = start_row + len(current_values) - 1
+                    rows_info = f"第{start_row}-{end_row}行" if start_row != end_row else f"第{start_row}行"
+                    self.logger.info(f"✅ 追加成功: {len(current_values)} 行数据至 {columns_info} {rows_info} (范围: {range_str})")
                 continue  # 继续处理栈中的下一个块
                 
             if error_code == self.ERROR_CODE_REQUEST_TOO_LARGE:
+                self._shrink_byte_budget()
                 num_rows = len(current_values)
                 self.logger.warning(f"检测到请求过大错误 (错误码 {error_code})，当前追加块包含 {num_rows} 行，将进行二分。")
 
@@ -1070,42 +2055,109 @@ class SheetAPI:
             
         return True  # 所有块都成功追加
 
-    def _batch_update_ranges(self, spreadsheet_token: str, value_ranges: List[Dict], is_clear: bool = False) -> Tuple[bool, Optional[int]]:
+    def _is_retryable_write(self, code: Optional[int], status_code: Optional[int]) -> bool:
+        """
+        写入失败是否需要在此重试
+        
+        只重试 HTTP 200 响应中的业务频控错误码：传输异常和 HTTP 429/5xx 已由
+        api_client 按其重试次数重试过，耗尽后再重试只会成倍放大请求数和等待时间。
+        """
+        return code == self.ERROR_CODE_RATE_LIMITED and status_code == 200
+    
+    @staticmethod
+    def _retry_after_seconds(response) -> Optional[float]:
+        """读取响应的 Retry-After 头（秒），不存在或无法解析时返回 None"""
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+    
+    def _write_retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        计算写入重试前的等待时间
+        
+        指数退避并叠加随机抖动，避免并发线程同时重试；
+        服务端给出 Retry-After 时以其为准（同样不超过退避上限）。
+        
+        Args:
+            attempt: 已失败的次数（从 0 开始）
+            retry_after: 服务端建议的等待秒数
+            
+        Returns:
+            等待秒数
+        """
+        if retry_after is not None:
+            return min(retry_after, self.WRITE_RETRY_MAX_DELAY)
+        backoff = self.WRITE_RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, self.WRITE_RETRY_BASE_DELAY)
+        return min(backoff, self.WRITE_RETRY_MAX_DELAY)
+    
+    def _batch_update_ranges(self, spreadsheet_token: str, value_ranges: List[Dict], is_clear: bool = False,
+                             body: Optional[bytes] = None) -> Tuple[bool, Optional[int]]:
         """
         批量更新多个范围。
 
+        Args:
+            spreadsheet_token: 电子表格Token
+            value_ranges: 范围数据列表
+            is_clear: 是否为清空操作
+            body: 预先编码好的请求体（提供时不再序列化 value_ranges）
+
         Returns:
             元组 (是否成功, 错误码)
         """
         url = f"https://open.feishu.cn/open-apis/sheets/v2/spreadsheets/{spreadsheet_token}/values_batch_update"
         headers = self.auth.get_auth_headers()
         
-        data = {"valueRanges": value_ranges}
-        
-        response = self.api_client.call_api("POST", url, headers=headers, json=data)
-        
-        try:
-            result = response.json()
-        except ValueError as e:
-            self.logger.error(f"批量写入响应解析失败: {e}, HTTP状态码: {response.status_code}")
-            return False, None
-        
-        code = result.get("code")
-        if code != 0:
-            # 清空操作时，允许某些“错误”，比如清空一个已经为空的区域
-            if is_clear and code in [90202]: # 90202: The range is invalid
-                 self.logger.warning(f"清空操作时遇到可忽略的错误 (错误码 {code}), 视为成功。")
-                 return True, 0
-
-            error_msg = result.get('msg', '未知错误')
-            self.logger.error(f"批量写入失败: 错误码 {code}, 错误信息: {error_msg}")
-            self.logger.debug(f"API响应: {result}")
-            return False, code
+        if body is not None:
+            request_kwargs = self._body_request_kwargs(headers, body)
+        else:
+            request_kwargs = self._json_request_kwargs(headers, {"valueRanges": value_ranges})
+        
+        for attempt in range(self.MAX_WRITE_RETRIES + 1):
+            retry_after = None
+            try:
+                response = self.api_client.call_api("POST", url, **request_kwargs)
+            except Exception as e:
+                # 底层客户端的重试已耗尽（网络异常、持续的 429/5xx），不再重试
+                code, status_code = self.ERROR_CODE_TRANSPORT, None
+                error_msg = f"请求异常: {e}"
+            else:
+                status_code = response.status_code
+                retry_after = self._retry_after_seconds(response)
+                try:
+                    result = parse_json(response)
+                except ValueError as e:
+                    code = None
+                    error_msg = f"响应解析失败: {e}, HTTP状态码: {status_code}"
+                else:
+                    code = result.get("code")
+                    self._record_rate_limit(code, status_code, spreadsheet_token)
+                    if code == 0:
+                        break
+                    # 清空操作时，允许某些“错误”，比如清空一个已经为空的区域
+                    if is_clear and code in [90202]: # 90202: The range is invalid
+                         self.logger.warning(f"清空操作时遇到可忽略的错误 (错误码 {code}), 视为成功。")
+                         return True, 0
+                    error_msg = result.get('msg', '未知错误')
+                    self.logger.debug(f"API响应: {result}")
+            
+            if attempt >= self.MAX_WRITE_RETRIES or not self._is_retryable_write(code, status_code):
+                self.logger.error(f"批量写入失败: 错误码 {code}, 错误信息: {error_msg}")
+                return False, code
+            
+            delay = self._write_retry_delay(attempt, retry_after)
+            self.logger.warning(f"批量写入遇到可重试错误 (错误码: {code}, HTTP状态码: {status_code})，"
+                                f"{delay:.2f} 秒后进行第 {attempt + 1}/{self.MAX_WRITE_RETRIES} 次重试")
+            time.sleep(delay)
         
         # 记录详细的写入结果
-        responses = result.get("data", {}).get("responses", [])
-        total_cells = sum(resp.get("updatedCells", 0) for resp in responses)
-        self.logger.debug(f"批量写入成功: {len(responses)} 个范围, 共 {total_cells} 个单元格")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            responses = result.get("data", {}).get("responses", [])
+            total_cells = sum(resp.get("updatedCells", 0) for resp in responses)
+            self.logger.debug(f"批量写入成功: {len(responses)} 个范围, 共 {total_cells} 个单元格")
         
         return True, 0
     
@@ -5,14 +5,67 @@
 提供多维表格和电子表格的统一配置管理
 """
 
-import yaml
 import argparse
+import copy
+import mmap
+import os
 import sys
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 
+# Python 3.10+ 的 dataclass 支持 slots：实例不再携带 __dict__，属性读取走槽位
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=1)
+def _yaml_codec():
+    """
+    首次读写配置文件时才导入 yaml
+    
+    优先使用 libyaml 的 C 实现解析/输出 YAML，未编译 libyaml 时回退为纯 Python 实现（语义一致）
+    
+    Returns:
+        (yaml 模块, Loader, Dumper)
+    """
+    import yaml
+    return (yaml,
+            getattr(yaml, 'CSafeLoader', yaml.SafeLoader),
+            getattr(yaml, 'CSafeDumper', yaml.SafeDumper))
+
+
+def _load_yaml_file(config_file: str, size: int, yaml, loader) -> Any:
+    """
+    将配置文件内存映射后直接交给 YAML 解析器，由解析器自行识别编码
+    
+    空文件或无法映射的文件（如特殊文件）回退为普通的二进制读取。
+    
+    Args:
+        config_file: 配置文件路径
+        size: 文件大小
+        yaml: yaml 模块
+        loader: YAML Loader 类
+        
+    Returns:
+        解析结果
+    """
+    with open(config_file, 'rb') as f:
+        if size > 0:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return yaml.load(mapped, Loader=loader)
+            except (OSError, ValueError):
+                f.seek(0)
+        return yaml.load(f, Loader=loader)
+
+
+# 已解析的配置文件缓存: (绝对路径, 修改时间ns, 文件大小) -> 解析结果，文件变化后自动失效
+_YAML_CACHE: 'OrderedDict[tuple, Any]' = OrderedDict()
+_YAML_CACHE_SIZE = 8
+
 
 class FieldTypeStrategy(Enum):
     """字段类型选择策略枚举"""
@@ -36,7 +89,19 @@ class TargetType(Enum):
     SHEET = "sheet"        # 电子表格
 
 
-@dataclass
+# 配置字符串 -> 枚举成员（直接查枚举内部的取值映射，省去 Enum(value) 的调用开销）
+_SYNC_MODES = SyncMode._value2member_map_
+_TARGET_TYPES = TargetType._value2member_map_
+_FIELD_TYPE_STRATEGIES = FieldTypeStrategy._value2member_map_
+
+
+def _enum_member(enum_cls, members: Dict[Any, Enum], value: str) -> Enum:
+    """按取值查找枚举成员，无效取值交给 Enum 构造以给出标准的 ValueError"""
+    member = members.get(value)
+    return member if member is not None else enum_cls(value)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class SelectiveSyncConfig:
     """选择性同步配置"""
     enabled: bool = False
@@ -47,7 +112,7 @@ class SelectiveSyncConfig:
     preserve_column_order: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SyncConfig:
     """统一同步配置"""
     # 基础配置
@@ -83,6 +148,18 @@ class SyncConfig:
     batch_size: int = 500  # 批处理大小
     rate_limit_delay: float = 0.5  # 接口调用间隔
     max_retries: int = 3  # 最大重试次数
+    max_concurrency: int = 1  # 最大并发批次数（>1 时启用AIMD自适应并发）
+    adaptive_batch_size: bool = False  # 是否根据响应延迟自适应调整批大小（batch_size 作为上限）
+    excel_engine: str = "auto"  # Excel读取引擎: auto, calamine, openpyxl, xlrd
+    gzip_requests: bool = False  # 电子表格写入时是否gzip压缩较大的请求体
+    sheet_rate_limit_delay: float = 0.0  # 单个电子表格的最小调用间隔（秒），0 表示仅受 rate_limit_delay 限制
+    
+    # 读取设置（读取阶段指定类型，减少类型推断和无关列）
+    dtype_map: Optional[Dict[str, str]] = None  # 列类型映射，如 {"ID": "string"}
+    usecols: Optional[List[str]] = None  # 只读取指定列
+    date_cols: Optional[List[str]] = None  # 解析为日期的列
+    excel_sheets: Optional[List[str]] = None  # 需要合并读取的工作表名称（默认只读第一个工作表）
+    concurrent_sheets: bool = True  # 多工作表时是否并发读取
     
     # 高级控制开关
     enable_advanced_control: bool = False  # 是否启用高级重试和频控策略
@@ -95,7 +172,7 @@ class SyncConfig:
     retry_increment: float = 0.5  # 线性增长步长（仅线性增长策略使用）
     
     # 高级频控配置（仅当enable_advanced_control=True时生效）
-    rate_limit_strategy_type: str = "fixed_wait"  # 频控策略: fixed_wait, sliding_window, fixed_window
+    rate_limit_strategy_type: str = "fixed_wait"  # 频控策略: fixed_wait, sliding_window, weighted_sliding_window, fixed_window, token_bucket
     rate_limit_window_size: float = 1.0  # 时间窗大小（秒），支持小于1的数
     rate_limit_max_requests: int = 10  # 时间窗内的最大请求数
     
@@ -106,12 +183,24 @@ class SyncConfig:
     selective_sync: SelectiveSyncConfig = field(default_factory=SelectiveSyncConfig)
     
     def __post_init__(self):
-        if isinstance(self.sync_mode, str):
-            self.sync_mode = SyncMode(self.sync_mode)
-        if isinstance(self.target_type, str):
-            self.target_type = TargetType(self.target_type)
-        if isinstance(self.field_type_strategy, str):
-            self.field_type_strategy = FieldTypeStrategy(self.field_type_strategy)
+        if self.sync_mode.__class__ is str:
+            self.sync_mode = _enum_member(SyncMode, _SYNC_MODES, self.sync_mode)
+        if self.target_type.__class__ is str:
+            self.target_type = _enum_member(TargetType, _TARGET_TYPES, self.target_type)
+        if self.field_type_strategy.__class__ is str:
+            self.field_type_strategy = _enum_member(FieldTypeStrategy, _FIELD_TYPE_STRATEGIES, self.field_type_strategy)
+        if self.max_concurrency < 1:
+            raise ValueError(f"max_concurrency 必须大于等于1，当前为 {self.max_concurrency}")
+        if self.excel_engine not in ('auto', 'calamine', 'openpyxl', 'xlrd'):
+            raise ValueError(f"excel_engine 必须是 auto/calamine/openpyxl/xlrd 之一，当前为 {self.excel_engine}")
+        if self.dtype_map is not None and not isinstance(self.dtype_map, dict):
+            raise ValueError("dtype_map 必须是字典类型")
+        for name in ('usecols', 'date_cols', 'excel_sheets'):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, list):
+                raise ValueError(f"{name} 必须是列表类型")
+        if self.usecols and self.index_column and self.index_column not in self.usecols:
+            raise ValueError(f"usecols 必须包含索引列 '{self.index_column}'")
         
         # 验证必需参数
         if self.target_type == TargetType.BITABLE:
@@ -131,112 +220,169 @@ class SyncConfig:
             # 增强的配置组合有效性检查
             self._validate_selective_sync_config()
     
+    def get_read_kwargs(self) -> Dict[str, Any]:
+        """
+        获取传递给文件读取器的参数（仅包含已配置的项）
+        
+        Returns:
+            Dict[str, Any]: dtype/usecols/parse_dates 参数
+        """
+        read_kwargs: Dict[str, Any] = {}
+        if self.dtype_map:
+            read_kwargs['dtype'] = self.dtype_map
+        if self.usecols:
+            read_kwargs['usecols'] = self.usecols
+        if self.date_cols:
+            read_kwargs['parse_dates'] = self.date_cols
+        return read_kwargs
+    
     def _validate_selective_sync_config(self):
         """验证selective_sync配置的详细有效性"""
-        columns = self.selective_sync.columns
+        selective = self.selective_sync
+        columns = selective.columns
         
         # 1. 检查列表元素有效性
         if not isinstance(columns, list):
             raise ValueError("selective_sync.columns 必须是列表类型")
             
         valid_columns = []
+        counts = Counter()
+        strip = str.strip
+        append = valid_columns.append
         for i, col in enumerate(columns):
-            if col is None:
-                raise ValueError(f"selective_sync.columns[{i}] 不能为 None")
-            if not isinstance(col, str):
-                raise ValueError(f"selective_sync.columns[{i}] 必须是字符串类型，当前为 {type(col)}")
-            if not col.strip():
+            # 常见情况下元素恰好是 str，一次类型比较即可跳过其余类型检查
+            if type(col) is not str:
+                if col is None:
+                    raise ValueError(f"selective_sync.columns[{i}] 不能为 None")
+                if not isinstance(col, str):
+                    raise ValueError(f"selective_sync.columns[{i}] 必须是字符串类型，当前为 {type(col)}")
+            col_clean = strip(col)
+            if not col_clean:
                 raise ValueError(f"selective_sync.columns[{i}] 不能为空字符串")
             
-            col_clean = col.strip()
-            valid_columns.append(col_clean)
-        
-        # 2. 检查重复列名
-        if len(valid_columns) != len(set(valid_columns)):
-            duplicates = [col for col in valid_columns if valid_columns.count(col) > 1]
-            raise ValueError(f"selective_sync.columns 包含重复的列名: {list(set(duplicates))}")
-        
-        # 3. 验证范围优化参数
-        if not isinstance(self.selective_sync.max_gap_for_merge, int):
-            raise ValueError("selective_sync.max_gap_for_merge 必须是整数")
-        if self.selective_sync.max_gap_for_merge < 0:
-            raise ValueError("selective_sync.max_gap_for_merge 不能为负数")
-        if self.selective_sync.max_gap_for_merge > 50:  # 设置合理上限
-            raise ValueError("selective_sync.max_gap_for_merge 不应超过50（性能考虑）")
+            append(col_clean)
+            counts[col_clean] += 1
+        
+        # 2. 检查重复列名（计数在上面的遍历中一并完成）
+        if len(counts) != len(valid_columns):
+            duplicates = [col for col, n in counts.items() if n > 1]
+            raise ValueError(f"selective_sync.columns 包含重复的列名: {duplicates}")
+        
+        # 3. 验证范围优化参数（上限50出于性能考虑；bool 不视为整数）
+        max_gap = selective.max_gap_for_merge
+        if type(max_gap) is not int or not 0 <= max_gap <= 50:
+            raise ValueError(f"selective_sync.max_gap_for_merge 必须是 0-50 的整数，当前为 {max_gap!r}")
         
         # 更新清理后的列名列表
-        self.selective_sync.columns = valid_columns
+        selective.columns = valid_columns
+
+
+def _mask_token(value: str) -> str:
+    """命令行覆盖信息中只显示 Token/ID 的前8位"""
+    return f"{value[:8]}..."
+
+
+def _mask_secret(value: str) -> str:
+    """命令行覆盖信息中隐藏密钥"""
+    return "***"
+
+
+# 命令行参数到配置项的映射: (参数属性名, 配置键, 取值转换函数, 显示函数)
+# 未提供（None/False/空字符串）的参数不覆盖配置；转换/显示函数为 None 时原样使用
+_CLI_FIELDS = (
+    # 基础参数
+    ('file_path', 'file_path', None, None),
+    ('app_id', 'app_id', None, _mask_token),
+    ('app_secret', 'app_secret', None, _mask_secret),
+    ('target_type', 'target_type', None, None),
+    # 多维表格参数（create_missing_fields 支持两种方式，--create-missing-fields 优先）
+    ('app_token', 'app_token', None, _mask_token),
+    ('table_id', 'table_id', None, None),
+    ('create_missing_fields', 'create_missing_fields', lambda v: v.lower() == 'true', None),
+    ('no_create_fields', 'create_missing_fields', lambda v: False, None),
+    ('field_type_strategy', 'field_type_strategy', None, None),
+    # 电子表格参数
+    ('spreadsheet_token', 'spreadsheet_token', None, _mask_token),
+    ('sheet_id', 'sheet_id', None, None),
+    ('start_row', 'start_row', None, None),
+    ('start_column', 'start_column', None, None),
+    # 通用参数
+    ('index_column', 'index_column', None, None),
+    ('sync_mode', 'sync_mode', None, None),
+    ('batch_size', 'batch_size', None, None),
+    ('rate_limit_delay', 'rate_limit_delay', None, None),
+    ('max_retries', 'max_retries', None, None),
+    ('max_concurrency', 'max_concurrency', None, None),
+    ('gzip_requests', 'gzip_requests', None, None),
+    ('log_level', 'log_level', None, None),
+)
+
+
+# 各目标类型的必需配置项
+_REQUIRED_BITABLE = ('file_path', 'app_id', 'app_secret', 'app_token', 'table_id')
+_REQUIRED_SHEET = ('file_path', 'app_id', 'app_secret', 'spreadsheet_token', 'sheet_id')
+
+# 显示参数明细时需要脱敏的配置键 -> 显示函数
+_PARAM_DISPLAY = {key: display for _, key, _, display in _CLI_FIELDS if display is not None}
+
+
+def _format_params(params) -> str:
+    """将 (配置键, 值) 序列格式化为 key=value 列表，Token/密钥按 _PARAM_DISPLAY 脱敏"""
+    parts = []
+    for key, value in params:
+        display = _PARAM_DISPLAY.get(key)
+        parts.append(f"{key}={display(value) if display and isinstance(value, str) else value}")
+    return ', '.join(parts)
 
 
 class ConfigManager:
     """统一配置管理器"""
     
+    # 命令行参数解析器，由 _get_parser 构建一次后复用
+    _parser: Optional[argparse.ArgumentParser] = None
+    
     @staticmethod
     def load_from_file(config_file: str) -> Optional[Dict[str, Any]]:
-        """从YAML文件加载配置"""
+        """
+        从YAML文件加载配置
+        
+        解析结果按 (路径, 修改时间, 大小) 缓存，同一进程内重复加载未变化的文件时不再解析；
+        返回深拷贝，调用方可以自由修改。
+        """
+        yaml, loader, _ = _yaml_codec()
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            stat = os.stat(config_file)
+            key = (os.path.abspath(config_file), stat.st_mtime_ns, stat.st_size)
+            if key in _YAML_CACHE:
+                _YAML_CACHE.move_to_end(key)
+                return copy.deepcopy(_YAML_CACHE[key])
+            
+            data = _load_yaml_file(config_file, stat.st_size, yaml, loader)
+            
+            _YAML_CACHE[key] = data
+            if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+                _YAML_CACHE.popitem(last=False)
+            return copy.deepcopy(data)
         except FileNotFoundError:
             print(f"配置文件不存在: {config_file}")
             return None
         except yaml.YAMLError as e:
-            print(f"YAML配置文件格式错误: {e}")
+            print(f"YAML配置文件格式错误 ({config_file}): {e}")
             return None
     
     @staticmethod
     def save_to_file(config: Dict[str, Any], config_file: str):
         """保存配置到YAML文件"""
+        yaml, _, dumper = _yaml_codec()
         with open(config_file, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True, indent=2)
+            yaml.dump(config, f, Dumper=dumper, default_flow_style=False, allow_unicode=True, indent=2)
     
-    @staticmethod
-    def parse_target_type() -> TargetType:
-        """解析目标类型"""
-        parser = argparse.ArgumentParser(description='XTF - Excel To Feishu 统一同步工具')
-        
-        # 添加目标类型参数
-        parser.add_argument('--target-type', type=str, 
-                          choices=['bitable', 'sheet'],
-                          help='目标类型: bitable(多维表格) 或 sheet(电子表格)')
-        parser.add_argument('--config', '-c', type=str, default='config.yaml',
-                          help='配置文件路径 (默认: config.yaml)')
-        
-        # 只解析已知参数，忽略其他参数
-        args, _ = parser.parse_known_args()
-        
-        # 如果没有指定目标类型，尝试从配置文件推断
-        if not args.target_type:
-            if Path(args.config).exists():
-                try:
-                    config_data = ConfigManager.load_from_file(args.config)
-                    if config_data:
-                        # 首先检查 target_type 参数
-                        if config_data.get('target_type'):
-                            target_type_val = config_data.get('target_type')
-                            if target_type_val == 'bitable':
-                                return TargetType.BITABLE
-                            elif target_type_val == 'sheet':
-                                return TargetType.SHEET
-                        # 如果配置中有app_token和table_id，推断为多维表格
-                        elif config_data.get('app_token') and config_data.get('table_id'):
-                            return TargetType.BITABLE
-                        # 如果配置中有spreadsheet_token和sheet_id，推断为电子表格
-                        elif config_data.get('spreadsheet_token') and config_data.get('sheet_id'):
-                            return TargetType.SHEET
-                except Exception:
-                    pass
-            
-            # 默认使用多维表格
-            print("⚠️  未指定目标类型，默认使用多维表格模式")
-            print("💡 可以通过 --target-type bitable|sheet 指定目标类型")
-            return TargetType.BITABLE
+    @classmethod
+    def _get_parser(cls) -> argparse.ArgumentParser:
+        """获取命令行参数解析器（首次调用时构建，之后复用类级实例）"""
+        if cls._parser is not None:
+            return cls._parser
         
-        return TargetType(args.target_type)
-    
-    @staticmethod
-    def parse_args() -> argparse.Namespace:
-        """解析命令行参数"""
         parser = argparse.ArgumentParser(description='XTF - Excel To Feishu 统一同步工具')
         
         # 基础配置
@@ -275,21 +421,80 @@ class ConfigManager:
         parser.add_argument('--batch-size', type=int, help='批处理大小')
         parser.add_argument('--rate-limit-delay', type=float, help='接口调用间隔秒数')
         parser.add_argument('--max-retries', type=int, help='最大重试次数')
+        parser.add_argument('--max-concurrency', type=int, help='最大并发批次数')
+        parser.add_argument('--gzip-requests', action='store_true',
+                          help='gzip压缩较大的电子表格写入请求体')
         
         # 日志设置
         parser.add_argument('--log-level', type=str, 
                           choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                           help='日志级别')
         
-        return parser.parse_args()
+        cls._parser = parser
+        return parser
     
     @classmethod
-    def create_config(cls) -> SyncConfig:
-        """创建配置对象"""
-        # 先获取目标类型
-        target_type = cls.parse_target_type()
+    def parse_args(cls, argv: Optional[List[str]] = None) -> argparse.Namespace:
+        """
+        解析命令行参数
+        
+        Args:
+            argv: 参数列表，默认为 sys.argv[1:]
+        """
+        return cls._get_parser().parse_args(argv)
+    
+    @classmethod
+    def parse_target_type(cls, args: Optional[argparse.Namespace] = None) -> TargetType:
+        """
+        解析目标类型
+        
+        Args:
+            args: 已解析的命令行参数；未提供时只解析已知参数，忽略其他参数
+        """
+        if args is None:
+            args, _ = cls._get_parser().parse_known_args()
+        
+        # 如果没有指定目标类型，尝试从配置文件推断
+        if not args.target_type:
+            if Path(args.config).exists():
+                try:
+                    config_data = cls.load_from_file(args.config)
+                    if config_data:
+                        # 首先检查 target_type 参数
+                        if config_data.get('target_type'):
+                            target_type_val = config_data.get('target_type')
+                            if target_type_val == 'bitable':
+                                return TargetType.BITABLE
+                            elif target_type_val == 'sheet':
+                                return TargetType.SHEET
+                        # 如果配置中有app_token和table_id，推断为多维表格
+                        elif config_data.get('app_token') and config_data.get('table_id'):
+                            return TargetType.BITABLE
+                        # 如果配置中有spreadsheet_token和sheet_id，推断为电子表格
+                        elif config_data.get('spreadsheet_token') and config_data.get('sheet_id'):
+                            return TargetType.SHEET
+                except Exception:
+                    pass
+            
+            # 默认使用多维表格
+            print("⚠️  未指定目标类型，默认使用多维表格模式")
+            print("💡 可以通过 --target-type bitable|sheet 指定目标类型")
+            return TargetType.BITABLE
         
-        args = cls.parse_args()
+        return TargetType(args.target_type)
+    
+    @classmethod
+    def create_config(cls, args: Optional[argparse.Namespace] = None) -> SyncConfig:
+        """
+        创建配置对象
+        
+        Args:
+            args: 已解析的命令行参数；未提供时解析 sys.argv
+        """
+        if args is None:
+            args = cls.parse_args()
+        # 目标类型直接取自同一次解析结果
+        target_type = cls.parse_target_type(args)
         
         # 根据目标类型设置默认值
         if target_type == TargetType.BITABLE:
@@ -327,19 +532,12 @@ class ConfigManager:
             }
         
         # 尝试从配置文件加载，覆盖默认值
+        file_config = None
         if Path(args.config).exists():
             file_config = cls.load_from_file(args.config)
             if file_config:
                 config_data.update(file_config)
                 print(f"✅ 已从配置文件加载参数: {args.config}")
-                
-                # 显示从配置文件加载的参数
-                loaded_params = []
-                for key, value in file_config.items():
-                    if key in config_data:
-                        loaded_params.append(f"{key}={value}")
-                if loaded_params:
-                    print(f"📋 配置文件参数: {', '.join(loaded_params)}")
             else:
                 print(f"⚠️  配置文件 {args.config} 加载失败，使用默认值")
         else:
@@ -348,78 +546,25 @@ class ConfigManager:
         # 确保target_type在配置数据中
         config_data['target_type'] = target_type.value
         
-        # 命令行参数覆盖文件配置
+        # 命令行参数覆盖文件配置（按 _CLI_FIELDS 声明的顺序，同一配置项只取第一个提供的参数）
         cli_overrides = []
-        
-        # 基础参数
-        if args.file_path:
-            config_data['file_path'] = args.file_path
-            cli_overrides.append(f"file_path={args.file_path}")
-        if args.app_id:
-            config_data['app_id'] = args.app_id
-            cli_overrides.append(f"app_id={args.app_id[:8]}...")
-        if args.app_secret:
-            config_data['app_secret'] = args.app_secret
-            cli_overrides.append(f"app_secret=***")
-        if args.target_type:
-            config_data['target_type'] = args.target_type
-            cli_overrides.append(f"target_type={args.target_type}")
-        
-        # 多维表格参数
-        if args.app_token:
-            config_data['app_token'] = args.app_token
-            cli_overrides.append(f"app_token={args.app_token[:8]}...")
-        if args.table_id:
-            config_data['table_id'] = args.table_id
-            cli_overrides.append(f"table_id={args.table_id}")
-        # 处理create_missing_fields参数（支持两种方式）
-        if args.create_missing_fields is not None:
-            config_data['create_missing_fields'] = args.create_missing_fields.lower() == 'true'
-            cli_overrides.append(f"create_missing_fields={args.create_missing_fields}")
-        elif args.no_create_fields:
-            config_data['create_missing_fields'] = False
-            cli_overrides.append("create_missing_fields=False")
-        if args.field_type_strategy:
-            config_data['field_type_strategy'] = args.field_type_strategy
-            cli_overrides.append(f"field_type_strategy={args.field_type_strategy}")
-        
-        # 电子表格参数
-        if args.spreadsheet_token:
-            config_data['spreadsheet_token'] = args.spreadsheet_token
-            cli_overrides.append(f"spreadsheet_token={args.spreadsheet_token[:8]}...")
-        if args.sheet_id:
-            config_data['sheet_id'] = args.sheet_id
-            cli_overrides.append(f"sheet_id={args.sheet_id}")
-        if args.start_row is not None:
-            config_data['start_row'] = args.start_row
-            cli_overrides.append(f"start_row={args.start_row}")
-        if args.start_column:
-            config_data['start_column'] = args.start_column
-            cli_overrides.append(f"start_column={args.start_column}")
-        
-        # 通用参数
-        if args.index_column:
-            config_data['index_column'] = args.index_column
-            cli_overrides.append(f"index_column={args.index_column}")
-        if args.sync_mode is not None:
-            config_data['sync_mode'] = args.sync_mode
-            cli_overrides.append(f"sync_mode={args.sync_mode}")
-        if args.batch_size is not None:
-            config_data['batch_size'] = args.batch_size
-            cli_overrides.append(f"batch_size={args.batch_size}")
-        if args.rate_limit_delay is not None:
-            config_data['rate_limit_delay'] = args.rate_limit_delay
-            cli_overrides.append(f"rate_limit_delay={args.rate_limit_delay}")
-        if args.max_retries is not None:
-            config_data['max_retries'] = args.max_retries
-            cli_overrides.append(f"max_retries={args.max_retries}")
-        if args.log_level is not None:
-            config_data['log_level'] = args.log_level
-            cli_overrides.append(f"log_level={args.log_level}")
-        
-        # 显示命令行覆盖的参数
-        if cli_overrides:
-            print(f"🔧 命令行参数覆盖: {', '.join(cli_overrides)}")
+        overridden_keys = set()
+        for attr, key, convert, _ in _CLI_FIELDS:
+            value = getattr(args, attr, None)
+            if value is None or value is False or value == '' or key in overridden_keys:
+                continue
+            if convert is not None:
+                value = convert(value)
+            config_data[key] = value
+            overridden_keys.add(key)
+            cli_overrides.append((key, value))
+        
+        # 参数明细只在最终日志级别为 DEBUG/INFO 时格式化并显示
+        if str(config_data.get('log_level', 'INFO')).upper() in ('DEBUG', 'INFO'):
+            if file_config:
+                print(f"📋 配置文件参数: {_format_params(file_config.items())}")
+            if cli_overrides:
+                print(f"🔧 命令行参数覆盖: {_format_params(cli_overrides)}")
         
         # 处理 selective_sync 配置
         if 'selective_sync' in config_data and isinstance(config_data['selective_sync'], dict):
@@ -428,16 +573,11 @@ class ConfigManager:
         elif 'selective_sync' not in config_data:
             config_data['selective_sync'] = SelectiveSyncConfig()
         
-        # 验证必需参数
-        required_fields = ['file_path', 'app_id', 'app_secret']
-        if target_type == TargetType.BITABLE:
-            required_fields.extend(['app_token', 'table_id'])
-        else:  # SHEET
-            required_fields.extend(['spreadsheet_token', 'sheet_id'])
-        
-        missing_fields = [f for f in required_fields if not config_data.get(f)]
+        # 验证必需参数（全部提供时不构建缺失列表）
+        required_fields = _REQUIRED_BITABLE if target_type == TargetType.BITABLE else _REQUIRED_SHEET
         
-        if missing_fields:
+        if not all(config_data.get(f) for f in required_fields):
+            missing_fields = [f for f in required_fields if not config_data.get(f)]
             print(f"\n❌ 错误: 缺少必需参数: {', '.join(missing_fields)}")
             print("💡 请通过以下方式提供这些参数:")
             print("   1. 在配置文件中设置")
@@ -484,53 +624,56 @@ class ConfigManager:
         )
 
 
+# 示例配置内容（只读，create_sample_config 直接写出）
+_SAMPLE_BITABLE = {
+    "file_path": "data.xlsx",
+    "app_id": "cli_your_app_id",
+    "app_secret": "your_app_secret",
+    "target_type": "bitable",
+    "app_token": "your_app_token",
+    "table_id": "your_table_id",
+    "sync_mode": "full",
+    "index_column": "ID",
+    "batch_size": 500,
+    "rate_limit_delay": 0.5,
+    "max_retries": 3,
+    "create_missing_fields": True,
+    "field_type_strategy": "base",
+    "intelligence_date_confidence": 0.85,
+    "intelligence_choice_confidence": 0.9,
+    "intelligence_boolean_confidence": 0.95,
+    "log_level": "INFO"
+}
+
+_SAMPLE_SHEET = {
+    "file_path": "data.xlsx",
+    "app_id": "cli_your_app_id",
+    "app_secret": "your_app_secret",
+    "target_type": "sheet",
+    "spreadsheet_token": "your_spreadsheet_token",
+    "sheet_id": "your_sheet_id",
+    "sync_mode": "full",
+    "index_column": "ID",
+    "start_row": 1,
+    "start_column": "A",
+    "batch_size": 1000,
+    "rate_limit_delay": 0.1,
+    "max_retries": 3,
+    "log_level": "INFO",
+    "selective_sync": {
+        "enabled": False,
+        "columns": ["column1", "column2", "column3"],
+        "auto_include_index": True,
+        "optimize_ranges": True,
+        "max_gap_for_merge": 2,
+        "preserve_column_order": True
+    }
+}
+
+
 def create_sample_config(config_file: str = "config.yaml", target_type: TargetType = TargetType.BITABLE):
     """创建示例配置文件"""
-    if target_type == TargetType.BITABLE:
-        sample_config = {
-            "file_path": "data.xlsx",
-            "app_id": "cli_your_app_id",
-            "app_secret": "your_app_secret",
-            "target_type": "bitable",
-            "app_token": "your_app_token",
-            "table_id": "your_table_id",
-            "sync_mode": "full",
-            "index_column": "ID",
-            "batch_size": 500,
-            "rate_limit_delay": 0.5,
-            "max_retries": 3,
-            "create_missing_fields": True,
-            "field_type_strategy": "base",
-            "intelligence_date_confidence": 0.85,
-            "intelligence_choice_confidence": 0.9,
-            "intelligence_boolean_confidence": 0.95,
-            "log_level": "INFO"
-        }
-    else:  # SHEET
-        sample_config = {
-            "file_path": "data.xlsx",
-            "app_id": "cli_your_app_id",
-            "app_secret": "your_app_secret",
-            "target_type": "sheet",
-            "spreadsheet_token": "your_spreadsheet_token",
-            "sheet_id": "your_sheet_id",
-            "sync_mode": "full",
-            "index_column": "ID",
-            "start_row": 1,
-            "start_column": "A",
-            "batch_size": 1000,
-            "rate_limit_delay": 0.1,
-            "max_retries": 3,
-            "log_level": "INFO",
-            "selective_sync": {
-                "enabled": False,
-                "columns": ["column1", "column2", "column3"],
-                "auto_include_index": True,
-                "optimize_ranges": True,
-                "max_gap_for_merge": 2,
-                "preserve_column_order": True
-            }
-        }
+    sample_config = _SAMPLE_BITABLE if target_type is TargetType.BITABLE else _SAMPLE_SHEET
     
     if not Path(config_file).exists():
         ConfigManager.save_to_file(sample_config, config_file)
@@ -542,10 +685,15 @@ def create_sample_config(config_file: str = "config.yaml", target_type: TargetTy
         return False
 
 
+# 目标类型描述
+_DESC_BITABLE = "多维表格 (支持智能字段管理、复杂数据类型)"
+_DESC_SHEET = "电子表格 (简单快速、适合基础数据同步)"
+
+
 def get_target_description(target_type: TargetType) -> str:
     """获取目标类型的描述"""
-    descriptions = {
-        TargetType.BITABLE: "多维表格 (支持智能字段管理、复杂数据类型)",
-        TargetType.SHEET: "电子表格 (简单快速、适合基础数据同步)"
-    }
-    return descriptions.get(target_type, "未知类型")
\ No newline at end of file
+    if target_type is TargetType.BITABLE:
+        return _DESC_BITABLE
+    if target_type is TargetType.SHEET:
+        return _DESC_SHEET
+    return "未知类型"
\ No newline at end of file
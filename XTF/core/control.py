@@ -5,22 +5,44 @@
 提供全局的重试和频控管理功能，兼容现有配置系统
 """
 
-import time
 import logging
-import requests
+import random
+import sys
 import threading
 from abc import ABC, abstractmethod
-from typing import Optional, Callable, Any, Union
+from typing import Optional, Callable, Any, Dict, Union, TYPE_CHECKING
 from dataclasses import dataclass
-from collections import deque
 from enum import Enum
+from functools import lru_cache
+from time import monotonic as _now, sleep as _sleep
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+
+async def _async_sleep(delay: float):
+    """异步等待；asyncio 只在异步路径上才导入（运行到这里时事件循环已加载它）"""
+    import asyncio
+    await asyncio.sleep(delay)
+
+
+def _wake_waiter(waiter):
+    """在 waiter 所属的事件循环中结束等待"""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+# Python 3.10+ 的 dataclass 支持 slots：实例不再携带 __dict__，属性读取走槽位
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 # ============================================================================
 # 重试策略实现
 # ============================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class RetryConfig:
     """重试配置基类"""
     initial_delay: float = 0.5  # 初始延迟时间，支持小于1的数
@@ -33,6 +55,11 @@ class RetryStrategy(ABC):
     
     def __init__(self, config: RetryConfig):
         self.config = config
+        # 重试等待通过事件实现，cancel() 可立即唤醒所有等待中的线程
+        self._cancel_event = threading.Event()
+        # 正在异步等待的 (事件循环, future)，cancel() 跨线程唤醒它们
+        self._async_waiters = set()
+        self._waiters_lock = threading.Lock()
     
     @abstractmethod
     def get_delay(self, attempt: int) -> float:
@@ -47,13 +74,58 @@ class RetryStrategy(ABC):
             return False
         return True
     
-    def wait(self, attempt: int) -> bool:
-        """执行等待，返回是否应该继续重试"""
+    def _wait_delay(self, attempt: int) -> Optional[float]:
+        """本次重试前需要等待的秒数，超过最大等待时间时返回 None（不再重试）"""
         delay = self.get_delay(attempt)
         if self.config.max_wait_time is not None and delay > self.config.max_wait_time:
+            return None
+        return delay
+    
+    def wait(self, attempt: int) -> bool:
+        """执行等待，返回是否应该继续重试"""
+        delay = self._wait_delay(attempt)
+        if delay is None:
             return False
-        time.sleep(delay)
-        return True
+        # 事件被设置（已取消）时 wait 立即返回 True，此时不再重试
+        return not self._cancel_event.wait(delay)
+    
+    async def async_wait(self, attempt: int) -> bool:
+        """异步执行等待（不占用线程），返回是否应该继续重试；cancel() 会立即结束等待"""
+        import asyncio
+        
+        delay = self._wait_delay(attempt)
+        if delay is None or self._cancel_event.is_set():
+            return False
+        
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        entry = (loop, waiter)
+        with self._waiters_lock:
+            self._async_waiters.add(entry)
+        try:
+            # 先登记再检查：与 cancel() 先置位再取快照的顺序配合，不会漏掉唤醒
+            if self._cancel_event.is_set():
+                return False
+            try:
+                await asyncio.wait_for(waiter, delay)
+            except asyncio.TimeoutError:
+                return True
+            return False
+        finally:
+            with self._waiters_lock:
+                self._async_waiters.discard(entry)
+    
+    def cancel(self):
+        """取消重试：唤醒正在等待的线程和协程，之后的重试等待立即失败"""
+        self._cancel_event.set()
+        with self._waiters_lock:
+            waiters = list(self._async_waiters)
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake_waiter, waiter)
+            except RuntimeError:
+                # 事件循环已关闭，等待者已不存在
+                pass
 
 
 class ExponentialBackoffRetry(RetryStrategy):
@@ -62,12 +134,36 @@ class ExponentialBackoffRetry(RetryStrategy):
     def __init__(self, config: RetryConfig, multiplier: float = 2.0):
         super().__init__(config)
         self.multiplier = multiplier
+        # 重试次数固定，整个延迟序列在构造时算好，get_delay 只做下标访问
+        self._delays = tuple(self._compute_delay(attempt) for attempt in range(config.max_retries + 1))
     
-    def get_delay(self, attempt: int) -> float:
+    def _compute_delay(self, attempt: int) -> float:
         delay = self.config.initial_delay * (self.multiplier ** attempt)
         if self.config.max_wait_time is not None:
             delay = min(delay, self.config.max_wait_time)
         return delay
+    
+    def get_delay(self, attempt: int) -> float:
+        if attempt < len(self._delays):
+            return self._delays[attempt]
+        return self._compute_delay(attempt)
+    
+    def _wait_delay(self, attempt: int) -> Optional[float]:
+        """
+        在指数退避延迟上叠加随机抖动，计算重试前的等待时间
+        
+        延迟在 [get_delay(attempt) / 2, get_delay(attempt)] 内随机取值，
+        整体仍按 multiplier 增长且不超过 max_wait_time，
+        多个客户端同时失败时不会在同一时刻集中重试。只依赖 attempt，不在共享的策略实例上保存状态。
+        
+        Args:
+            attempt: 当前尝试次数（从 0 开始）
+            
+        Returns:
+            Optional[float]: 等待秒数
+        """
+        delay = self.get_delay(attempt)
+        return random.uniform(delay / 2, delay)
 
 
 class LinearGrowthRetry(RetryStrategy):
@@ -76,38 +172,54 @@ class LinearGrowthRetry(RetryStrategy):
     def __init__(self, config: RetryConfig, increment: float = 0.5):
         super().__init__(config)
         self.increment = increment
+        self._delays = tuple(self._compute_delay(attempt) for attempt in range(config.max_retries + 1))
     
-    def get_delay(self, attempt: int) -> float:
+    def _compute_delay(self, attempt: int) -> float:
         delay = self.config.initial_delay + (self.increment * attempt)
         if self.config.max_wait_time is not None:
             delay = min(delay, self.config.max_wait_time)
         return delay
+    
+    def get_delay(self, attempt: int) -> float:
+        if attempt < len(self._delays):
+            return self._delays[attempt]
+        return self._compute_delay(attempt)
 
 
 class FixedWaitRetry(RetryStrategy):
     """固定等待重试策略"""
     
+    def __init__(self, config: RetryConfig):
+        super().__init__(config)
+        self._delay = config.initial_delay
+    
     def get_delay(self, attempt: int) -> float:
         # attempt参数在固定延迟策略中不使用，但保持接口一致性
         _ = attempt  # 标记参数已使用
-        return self.config.initial_delay
+        return self._delay
 
 
 # ============================================================================
 # 频控策略实现
 # ============================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class RateLimitConfig:
     """频控配置基类"""
     pass
 
 
 class RateLimitStrategy(ABC):
-    """频控策略抽象基类"""
+    """
+    频控策略抽象基类
+    
+    同一策略实例会被多个工作线程共享，子类读写频控状态时需持有 self._lock，
+    且不得在持锁期间休眠。
+    """
     
     def __init__(self, config: RateLimitConfig):
         self.config = config
+        self._lock = threading.Lock()
     
     @abstractmethod
     def can_proceed(self) -> bool:
@@ -115,16 +227,30 @@ class RateLimitStrategy(ABC):
         pass
     
     @abstractmethod
-    def wait_if_needed(self) -> bool:
-        """如果需要等待则等待，返回是否成功等待"""
+    def wait_if_needed(self, now: Optional[float] = None) -> bool:
+        """
+        如果需要等待则等待，返回是否成功等待
+        
+        Args:
+            now: 调用方刚读取的单调时钟（time.monotonic），省略时由策略自行读取
+        """
         pass
     
+    async def await_if_needed(self, now: Optional[float] = None) -> bool:
+        """
+        wait_if_needed 的异步版本
+        
+        默认在线程池中执行同步等待；子类提供原生实现时改用 asyncio.sleep，不占用线程。
+        """
+        import asyncio
+        return await asyncio.to_thread(self.wait_if_needed, now)
+    
     def reset(self):
         """重置频控状态"""
         pass
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FixedWaitRateConfig(RateLimitConfig):
     """固定等待频控配置"""
     delay: float = 0.1  # 固定延迟时间
@@ -136,29 +262,41 @@ class FixedWaitRateLimit(RateLimitStrategy):
     def __init__(self, config: FixedWaitRateConfig):
         super().__init__(config)
         self.config: FixedWaitRateConfig = config
-        self.last_request_time = 0
+        self._delay = config.delay
+        # 使用单调时钟，不受系统时间调整影响；初始值保证首个请求无需等待
+        self.last_request_time = -config.delay
     
     def can_proceed(self) -> bool:
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        return time_since_last >= self.config.delay
+        with self._lock:
+            return _now() - self.last_request_time >= self._delay
     
-    def wait_if_needed(self) -> bool:
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.config.delay:
-            wait_time = self.config.delay - time_since_last
-            time.sleep(wait_time)
-        
-        self.last_request_time = time.time()
+    def _reserve(self, current_time: float) -> float:
+        """预约下一个请求时间点，返回需要等待的秒数"""
+        # 持锁预约下一个请求时间点，释放锁后再等待到该时间点，
+        # 并发线程因此各自得到间隔 delay 的不同时间点
+        with self._lock:
+            scheduled_time = max(current_time, self.last_request_time + self._delay)
+            self.last_request_time = scheduled_time
+        return scheduled_time - current_time
+    
+    def wait_if_needed(self, now: Optional[float] = None) -> bool:
+        wait_time = self._reserve(_now() if now is None else now)
+        if wait_time > 0:
+            _sleep(wait_time)
+        return True
+    
+    async def await_if_needed(self, now: Optional[float] = None) -> bool:
+        wait_time = self._reserve(_now() if now is None else now)
+        if wait_time > 0:
+            await _async_sleep(wait_time)
         return True
     
     def reset(self):
-        self.last_request_time = 0
+        with self._lock:
+            self.last_request_time = -self._delay
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SlidingWindowRateConfig(RateLimitConfig):
     """滑动时间窗频控配置"""
     window_size: float = 1.0  # 时间窗大小（秒）
@@ -166,49 +304,140 @@ class SlidingWindowRateConfig(RateLimitConfig):
 
 
 class SlidingWindowRateLimit(RateLimitStrategy):
-    """滑动时间窗频控策略"""
+    """
+    滑动时间窗频控策略
+    
+    用长度为 max_requests 的环形缓冲区记录最近的请求时间：即将被覆盖的槽位就是
+    窗口内最早的请求，新请求只需等到它滑出窗口，每次请求的开销固定且不分配内存。
+    """
     
     def __init__(self, config: SlidingWindowRateConfig):
         super().__init__(config)
         self.config: SlidingWindowRateConfig = config
-        self.request_timestamps = deque()
-    
-    def _cleanup_old_requests(self):
-        current_time = time.time()
-        window_start = current_time - self.config.window_size
-        while self.request_timestamps and self.request_timestamps[0] < window_start:
-            self.request_timestamps.popleft()
+        self._window_size = config.window_size
+        self._capacity = max(1, config.max_requests)
+        self._ring = [float('-inf')] * self._capacity
+        self._index = 0
     
     def can_proceed(self) -> bool:
-        self._cleanup_old_requests()
-        return len(self.request_timestamps) < self.config.max_requests
+        with self._lock:
+            return self._ring[self._index] + self._window_size <= _now()
     
-    def wait_if_needed(self) -> bool:
-        self._cleanup_old_requests()
-        
-        if len(self.request_timestamps) < self.config.max_requests:
-            self.request_timestamps.append(time.time())
-            return True
-        
-        # 需要等待最早请求过期
-        oldest_request = self.request_timestamps[0]
-        wait_time = oldest_request + self.config.window_size - time.time()
-        
+    def _reserve(self, current_time: float) -> float:
+        """预约发送时间点并写入槽位，返回需要等待的秒数"""
+        # 持锁预约发送时间点并写入槽位，释放锁后再等待到该时间点；
+        # 并发线程依次占用后续槽位，窗口内的请求数不会超过 max_requests
+        with self._lock:
+            scheduled_time = max(current_time, self._ring[self._index] + self._window_size)
+            self._ring[self._index] = scheduled_time
+            self._index = (self._index + 1) % self._capacity
+        return scheduled_time - current_time
+    
+    def wait_if_needed(self, now: Optional[float] = None) -> bool:
+        wait_time = self._reserve(_now() if now is None else now)
         if wait_time > 0:
-            time.sleep(wait_time)
-        
-        self._cleanup_old_requests()
-        if len(self.request_timestamps) < self.config.max_requests:
-            self.request_timestamps.append(time.time())
-            return True
-        
-        return False
+            _sleep(wait_time)
+        return True
+    
+    async def await_if_needed(self, now: Optional[float] = None) -> bool:
+        wait_time = self._reserve(_now() if now is None else now)
+        if wait_time > 0:
+            await _async_sleep(wait_time)
+        return True
     
     def reset(self):
-        self.request_timestamps.clear()
+        with self._lock:
+            self._ring = [float('-inf')] * self._capacity
+            self._index = 0
 
 
-@dataclass
+class WeightedSlidingWindowRateLimit(RateLimitStrategy):
+    """
+    加权滑动时间窗频控策略（近似滑动窗口）
+    
+    只保存当前窗口和上一个窗口的请求计数，按上一个窗口与滑动窗口的重叠比例折算：
+    有效请求数 = 上一窗口计数 * (1 - 当前窗口已过比例) + 当前窗口计数。
+    状态固定为三个数，与 max_requests 无关；代价是结果为近似值（假设上一窗口的请求均匀分布）。
+    """
+    
+    def __init__(self, config: SlidingWindowRateConfig):
+        super().__init__(config)
+        self.config: SlidingWindowRateConfig = config
+        self._window_size = config.window_size
+        self._max_requests = max(1, config.max_requests)
+        self.window_start_time = _now()
+        self.current_count = 0
+        self.previous_count = 0
+    
+    def _roll_window(self, current_time: float):
+        """进入新的时间窗时把当前计数转为上一窗口计数（时间窗只向前滚动）"""
+        elapsed = current_time - self.window_start_time
+        if elapsed < self._window_size:
+            return
+        # 跨过两个及以上窗口时，上一窗口内没有请求
+        self.previous_count = self.current_count if elapsed < 2 * self._window_size else 0
+        self.current_count = 0
+        self.window_start_time += (elapsed // self._window_size) * self._window_size
+    
+    def _effective_count(self, current_time: float) -> float:
+        weight = 1 - (current_time - self.window_start_time) / self._window_size
+        if weight < 0:
+            weight = 0.0
+        return self.previous_count * weight + self.current_count
+    
+    def _try_acquire(self, current_time: float) -> Optional[float]:
+        """尝试计入一个请求，成功返回 None，否则返回预计需要等待的秒数"""
+        with self._lock:
+            self._roll_window(current_time)
+            
+            if self._effective_count(current_time) < self._max_requests:
+                self.current_count += 1
+                return None
+            
+            window_end = self.window_start_time + self._window_size
+            if self.current_count >= self._max_requests or self.previous_count == 0:
+                # 当前窗口已满，只能等到下一个时间窗
+                return window_end - current_time
+            # 上一窗口的权重随时间线性下降，求有效请求数降到 max_requests 以下的时间点
+            elapsed_needed = self._window_size * (
+                self.previous_count + self.current_count - self._max_requests) / self.previous_count
+            return min(self.window_start_time + elapsed_needed, window_end) - current_time
+    
+    def can_proceed(self) -> bool:
+        with self._lock:
+            current_time = _now()
+            self._roll_window(current_time)
+            return self._effective_count(current_time) < self._max_requests
+    
+    def wait_if_needed(self, now: Optional[float] = None) -> bool:
+        current_time = _now() if now is None else now
+        while True:
+            wait_time = self._try_acquire(current_time)
+            if wait_time is None:
+                return True
+            # 释放锁后再等待，醒来后重新计算有效请求数
+            if wait_time > 0:
+                _sleep(wait_time)
+            current_time = _now()
+    
+    async def await_if_needed(self, now: Optional[float] = None) -> bool:
+        current_time = _now() if now is None else now
+        while True:
+            wait_time = self._try_acquire(current_time)
+            if wait_time is None:
+                return True
+            if wait_time > 0:
+                await _async_sleep(wait_time)
+            current_time = _now()
+    
+    def reset(self):
+        with self._lock:
+            self.window_start_time = _now()
+            self.current_count = 0
+            self.previous_count = 0
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FixedWindowRateConfig(RateLimitConfig):
     """固定时间窗频控配置"""
     window_size: float = 1.0  # 时间窗大小（秒）
@@ -221,52 +450,142 @@ class FixedWindowRateLimit(RateLimitStrategy):
     def __init__(self, config: FixedWindowRateConfig):
         super().__init__(config)
         self.config: FixedWindowRateConfig = config
-        self.window_start_time = time.time()
+        self._window_size = config.window_size
+        self._max_requests = config.max_requests
+        self.window_start_time = self._window_start(_now())
         self.current_window_requests = 0
     
-    def _get_current_window_start(self) -> float:
-        current_time = time.time()
-        return (current_time // self.config.window_size) * self.config.window_size
+    def _window_start(self, current_time: float) -> float:
+        """时间所在时间窗的起点（按窗口大小对齐）"""
+        return (current_time // self._window_size) * self._window_size
     
-    def _is_new_window(self) -> bool:
-        current_window_start = self._get_current_window_start()
-        return current_window_start > self.window_start_time
+    def _roll_window(self, current_time: float):
+        """进入新的时间窗时重置计数（时间窗只向前滚动，传入的时间略早时保持当前窗口）"""
+        current_window_start = self._window_start(current_time)
+        if current_window_start > self.window_start_time:
+            self.window_start_time = current_window_start
+            self.current_window_requests = 0
     
     def can_proceed(self) -> bool:
-        if self._is_new_window():
-            self.window_start_time = self._get_current_window_start()
-            self.current_window_requests = 0
-        return self.current_window_requests < self.config.max_requests
+        with self._lock:
+            self._roll_window(_now())
+            return self.current_window_requests < self._max_requests
+    
+    def _try_acquire(self, current_time: float) -> Optional[float]:
+        """尝试在当前时间窗内计数，成功返回 None，否则返回到下一个时间窗的秒数"""
+        with self._lock:
+            self._roll_window(current_time)
+            
+            if self.current_window_requests < self._max_requests:
+                self.current_window_requests += 1
+                return None
+            
+            # 需要等待下一个时间窗
+            return self.window_start_time + self._window_size - current_time
+    
+    def wait_if_needed(self, now: Optional[float] = None) -> bool:
+        current_time = _now() if now is None else now
+        while True:
+            wait_time = self._try_acquire(current_time)
+            if wait_time is None:
+                return True
+            # 释放锁后再等待，醒来后在新时间窗内重新计数
+            if wait_time > 0:
+                _sleep(wait_time)
+            current_time = _now()
+    
+    async def await_if_needed(self, now: Optional[float] = None) -> bool:
+        current_time = _now() if now is None else now
+        while True:
+            wait_time = self._try_acquire(current_time)
+            if wait_time is None:
+                return True
+            if wait_time > 0:
+                await _async_sleep(wait_time)
+            current_time = _now()
     
-    def wait_if_needed(self) -> bool:
-        if self._is_new_window():
-            self.window_start_time = self._get_current_window_start()
+    def reset(self):
+        with self._lock:
+            self.window_start_time = self._window_start(_now())
             self.current_window_requests = 0
-        
-        if self.current_window_requests < self.config.max_requests:
-            self.current_window_requests += 1
-            return True
-        
-        # 需要等待下一个时间窗
-        next_window_start = self.window_start_time + self.config.window_size
-        wait_time = next_window_start - time.time()
-        
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class TokenBucketRateConfig(RateLimitConfig):
+    """令牌桶频控配置"""
+    rate: float = 10.0  # 每秒补充的令牌数
+    capacity: int = 10  # 桶容量（允许的最大突发请求数）
+
+
+class TokenBucketRateLimit(RateLimitStrategy):
+    """
+    令牌桶频控策略
+    
+    令牌按 rate 匀速补充、最多积攒 capacity 个，每个请求消耗一个令牌。
+    令牌充足时只需一次时钟读取和一次比较即可放行，突发请求由积攒的令牌吸收，
+    不会像固定时间窗那样在窗口边界处集中放行。
+    """
+    
+    def __init__(self, config: TokenBucketRateConfig):
+        super().__init__(config)
+        self.config: TokenBucketRateConfig = config
+        self._rate = config.rate
+        self._capacity = max(1, config.capacity)
+        self.tokens = float(self._capacity)
+        self.last_refill_time = _now()
+    
+    def _refill(self, current_time: float):
+        """按流逝时间补充令牌，不超过桶容量"""
+        # 调用方传入的时间可能早于其他线程刚记录的补充时间，此时不补充也不回退
+        if current_time <= self.last_refill_time:
+            return
+        tokens = self.tokens + (current_time - self.last_refill_time) * self._rate
+        self.tokens = tokens if tokens < self._capacity else float(self._capacity)
+        self.last_refill_time = current_time
+    
+    def can_proceed(self) -> bool:
+        with self._lock:
+            self._refill(_now())
+            return self.tokens >= 1
+    
+    def _reserve(self, current_time: float) -> float:
+        """取走一个令牌，返回需要等待的秒数"""
+        # 持锁只做令牌计算：不足时预支一个令牌（余额可为负），
+        # 释放锁后等待 (1 - 原余额) / rate 秒，并发线程因此依次排队
+        with self._lock:
+            self._refill(current_time)
+            self.tokens -= 1
+            tokens = self.tokens
+        return -tokens / self._rate
+    
+    def wait_if_needed(self, now: Optional[float] = None) -> bool:
+        wait_time = self._reserve(_now() if now is None else now)
         if wait_time > 0:
-            time.sleep(wait_time)
-        
-        self.window_start_time = self._get_current_window_start()
-        self.current_window_requests = 1
+            _sleep(wait_time)
+        return True
+    
+    async def await_if_needed(self, now: Optional[float] = None) -> bool:
+        wait_time = self._reserve(_now() if now is None else now)
+        if wait_time > 0:
+            await _async_sleep(wait_time)
         return True
     
     def reset(self):
-        self.window_start_time = time.time()
-        self.current_window_requests = 0
+        with self._lock:
+            self.tokens = float(self._capacity)
+            self.last_refill_time = _now()
 
 
 # ============================================================================
 # 统一控制器
 # ============================================================================
 
+@lru_cache(maxsize=1024)
+def rate_limit_key(url: str) -> str:
+    """获取URL的频控分片键（主机名:端口），结果按URL缓存"""
+    return urlsplit(url).netloc
+
+
 class RequestController:
     """统一请求控制器，整合重试和频控功能"""
     
@@ -276,18 +595,82 @@ class RequestController:
         self.retry_strategy = retry_strategy
         self.rate_limit_strategy = rate_limit_strategy
         self.logger = logging.getLogger('XTF.control')
+        # 重试总时长预算（秒），未配置时不需要读取时钟
+        self._time_budget = retry_strategy.config.max_wait_time if retry_strategy else None
+        # 既无重试也无频控时直接执行请求
+        self._fast_path = retry_strategy is None and rate_limit_strategy is None
+        # 按主机分片的频控策略：不同主机的请求各自计数，互不争用同一把锁；
+        # 锁只保护新分片的插入，读取已有分片不加锁
+        self._sharded_rate_limits: Dict[str, RateLimitStrategy] = {}
+        self._shard_lock = threading.Lock()
     
-    def execute_request(self, func: Callable, *args, **kwargs) -> Any:
-        """执行请求并应用重试和频控策略"""
+    def get_rate_limit_strategy(self, key: Optional[str] = None) -> Optional[RateLimitStrategy]:
+        """
+        获取指定分片的频控策略
+        
+        Args:
+            key: 分片键（通常为 rate_limit_key(url)），为 None 时返回共享的频控策略
+            
+        Returns:
+            Optional[RateLimitStrategy]: 该分片的频控策略，未配置频控时返回 None
+        """
+        template = self.rate_limit_strategy
+        if key is None or template is None:
+            return template
+        
+        strategy = self._sharded_rate_limits.get(key)
+        if strategy is None:
+            with self._shard_lock:
+                strategy = self._sharded_rate_limits.get(key)
+                if strategy is None:
+                    # 按共享策略的类型和配置为新主机创建独立的频控状态
+                    strategy = type(template)(template.config)
+                    self._sharded_rate_limits[key] = strategy
+        return strategy
+    
+    def cancel(self):
+        """取消后续重试，正在重试等待中的请求会立即结束并抛出最近一次的异常"""
+        if self.retry_strategy is not None:
+            self.retry_strategy.cancel()
+    
+    def execute_request(self, func: Callable, *args, key: Optional[str] = None, **kwargs) -> Any:
+        """
+        执行请求并应用重试和频控策略
+        
+        Args:
+            func: 要执行的请求函数
+            *args: 传给 func 的位置参数
+            key: 频控分片键，相同键的请求共享频控状态；为 None 时使用共享的频控策略
+            **kwargs: 传给 func 的关键字参数
+            
+        Returns:
+            Any: func 的返回值
+        """
+        if self._fast_path:
+            return func(*args, **kwargs)
+        
         attempt = 0
-        start_time = time.time()
+        # 每轮尝试只读取一次单调时钟，交给频控策略复用；
+        # 截止时间由首轮的时间戳算出，只在配置了时长预算时才检查
+        now = _now()
+        deadline = now + self._time_budget if self._time_budget is not None else None
         last_exception = None
         
+        # 循环中用到的策略方法和日志方法提前绑定为局部变量；
+        # 日志使用 % 参数延迟格式化，级别被过滤时不构造消息
+        rate_limit_strategy = self.get_rate_limit_strategy(key)
+        wait_if_needed = rate_limit_strategy.wait_if_needed if rate_limit_strategy else None
+        retry_strategy = self.retry_strategy
+        should_retry = retry_strategy.should_retry if retry_strategy else None
+        retry_wait = retry_strategy.wait if retry_strategy else None
+        log_warning = self.logger.warning
+        log_error = self.logger.error
+        
         while True:
             try:
                 # 应用频控策略
-                if self.rate_limit_strategy:
-                    if not self.rate_limit_strategy.wait_if_needed():
+                if wait_if_needed is not None:
+                    if not wait_if_needed(now=now):
                         raise Exception("频控限制：已达到最大重试次数或请求限制")
                 
                 # 执行请求
@@ -296,37 +679,115 @@ class RequestController:
                 
             except Exception as e:
                 last_exception = e
-                elapsed_time = time.time() - start_time
                 
-                # 检查是否应该重试
-                if not self.retry_strategy or not self.retry_strategy.should_retry(attempt, elapsed_time):
-                    self.logger.error(f"重试失败，已尝试 {attempt + 1} 次: {e}")
+                # 检查是否应该重试（次数由策略判断，时长预算按截止时间判断）
+                if (should_retry is None or not should_retry(attempt) or
+                        (deadline is not None and _now() >= deadline)):
+                    log_error("重试失败，已尝试 %d 次: %s", attempt + 1, e)
                     raise
                 
                 # 执行重试等待
-                if not self.retry_strategy.wait(attempt):
-                    self.logger.error(f"重试等待超时，已尝试 {attempt + 1} 次: {e}")
+                if not retry_wait(attempt):
+                    log_error("重试等待超时或已取消，已尝试 %d 次: %s", attempt + 1, e)
                     raise
                 
                 attempt += 1
-                self.logger.warning(f"第 {attempt} 次重试，错误: {e}")
+                log_warning("第 %d 次重试，错误: %s", attempt, e)
+                now = _now()
         
         if last_exception:
             raise last_exception
+    
+    async def aexecute_request(self, func: Callable, *args, key: Optional[str] = None, **kwargs) -> Any:
+        """
+        execute_request 的异步版本：频控和重试等待使用 asyncio.sleep，等待期间不阻塞事件循环
+        
+        Args:
+            func: 要执行的协程函数
+            *args: 传给 func 的位置参数
+            key: 频控分片键，相同键的请求共享频控状态；为 None 时使用共享的频控策略
+            **kwargs: 传给 func 的关键字参数
+            
+        Returns:
+            Any: func 协程的返回值
+        """
+        if self._fast_path:
+            return await func(*args, **kwargs)
+        
+        attempt = 0
+        now = _now()
+        deadline = now + self._time_budget if self._time_budget is not None else None
+        
+        rate_limit_strategy = self.get_rate_limit_strategy(key)
+        await_if_needed = rate_limit_strategy.await_if_needed if rate_limit_strategy else None
+        retry_strategy = self.retry_strategy
+        should_retry = retry_strategy.should_retry if retry_strategy else None
+        retry_wait = retry_strategy.async_wait if retry_strategy else None
+        log_warning = self.logger.warning
+        log_error = self.logger.error
+        
+        while True:
+            try:
+                # 应用频控策略
+                if await_if_needed is not None:
+                    if not await await_if_needed(now=now):
+                        raise Exception("频控限制：已达到最大重试次数或请求限制")
+                
+                # 执行请求
+                return await func(*args, **kwargs)
+                
+            except Exception as e:
+                # 检查是否应该重试（次数由策略判断，时长预算按截止时间判断）
+                if (should_retry is None or not should_retry(attempt) or
+                        (deadline is not None and _now() >= deadline)):
+                    log_error("重试失败，已尝试 %d 次: %s", attempt + 1, e)
+                    raise
+                
+                # 执行重试等待
+                if not await retry_wait(attempt):
+                    log_error("重试等待超时或已取消，已尝试 %d 次: %s", attempt + 1, e)
+                    raise
+                
+                attempt += 1
+                log_warning("第 %d 次重试，错误: %s", attempt, e)
+                now = _now()
 
 
 class EnhancedAPIClient:
     """增强的API客户端，兼容原有接口"""
     
+    # 客户端持有的HTTP会话连接池大小
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 32
+    
     def __init__(self, controller: Optional[RequestController] = None):
+        # requests 依赖较重，只在创建客户端时导入
+        import requests
+        from requests.adapters import HTTPAdapter
+        
         self.controller = controller
         self.logger = logging.getLogger('XTF.control')
+        
+        # 复用同一会话的连接池，避免每次请求重新建立 TCP/TLS 连接；
+        # 适配器层不做重试，重试统一由控制器处理
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.POOL_CONNECTIONS,
+                              pool_maxsize=self.POOL_MAXSIZE,
+                              max_retries=0)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+    
+    def close(self):
+        """关闭HTTP会话，释放连接池"""
+        self._session.close()
     
-    def call_api(self, method: str, url: str, **kwargs) -> requests.Response:
+    def call_api(self, method: str, url: str, **kwargs) -> 'requests.Response':
         """调用API，应用统一的重试和频控策略"""
+        import requests
+        session = self._session
         
         def _make_request():
-            response = requests.request(method, url, timeout=60, **kwargs)
+            response = session.request(method, url, timeout=60, **kwargs)
             
             # 检查是否需要重试的响应状态
             if response.status_code == 429:  # 频率限制
@@ -337,44 +798,209 @@ class EnhancedAPIClient:
             
             return response
         
-        if self.controller:
-            return self.controller.execute_request(_make_request)
+        controller = self.controller
+        if controller and not controller._fast_path:
+            return controller.execute_request(_make_request, key=rate_limit_key(url))
         else:
-            # 回退到直接执行
+            # 回退到直接执行（未配置控制器或控制器无任何策略）
             return _make_request()
 
 
+class AsyncEnhancedAPIClient:
+    """
+    异步API客户端（基于 httpx.AsyncClient），接口与 EnhancedAPIClient 对应
+    
+    频控和重试等待期间让出事件循环，多个并发调用的等待可以相互重叠。
+    需要安装可选依赖 httpx（在创建客户端时才导入）。
+    """
+    
+    # 客户端持有的HTTP连接池大小
+    POOL_CONNECTIONS = EnhancedAPIClient.POOL_CONNECTIONS
+    POOL_MAXSIZE = EnhancedAPIClient.POOL_MAXSIZE
+    
+    def __init__(self, controller: Optional[RequestController] = None):
+        # httpx 依赖较重且为可选依赖，只在创建异步客户端时导入
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("AsyncEnhancedAPIClient 需要安装 httpx: pip install httpx") from None
+        
+        self._httpx = httpx
+        self.controller = controller
+        self.logger = logging.getLogger('XTF.control')
+        
+        # 复用同一客户端的连接池，重试统一由控制器处理
+        self._client = httpx.AsyncClient(
+            timeout=60,
+            limits=httpx.Limits(max_connections=self.POOL_MAXSIZE,
+                                max_keepalive_connections=self.POOL_CONNECTIONS)
+        )
+    
+    async def aclose(self):
+        """关闭HTTP客户端，释放连接池"""
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> 'AsyncEnhancedAPIClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def call_api(self, method: str, url: str, **kwargs) -> 'httpx.Response':
+        """异步调用API，应用统一的重试和频控策略"""
+        client = self._client
+        httpx = self._httpx
+        
+        async def _make_request():
+            response = await client.request(method, url, **kwargs)
+            
+            # 检查是否需要重试的响应状态
+            if response.status_code == 429:  # 频率限制
+                raise httpx.HTTPStatusError(f"Rate limit exceeded: {response.status_code}",
+                                            request=response.request, response=response)
+            
+            if response.status_code >= 500:  # 服务器错误
+                raise httpx.HTTPStatusError(f"Server error: {response.status_code}",
+                                            request=response.request, response=response)
+            
+            return response
+        
+        controller = self.controller
+        if controller and not controller._fast_path:
+            return await controller.aexecute_request(_make_request, key=rate_limit_key(url))
+        else:
+            # 回退到直接执行（未配置控制器或控制器无任何策略）
+            return await _make_request()
+
+
+# ============================================================================
+# 策略注册表
+# ============================================================================
+
+def _pick(options: dict, keys: tuple) -> dict:
+    """从配置字典中挑出策略配置类接受的字段"""
+    return {k: v for k, v in options.items() if k in keys}
+
+
+def _create_token_bucket(options: dict) -> TokenBucketRateLimit:
+    # 未显式给出 rate/capacity 时按时间窗参数换算：每个时间窗补满 max_requests 个令牌
+    max_requests = options.get('max_requests', 10)
+    window_size = options.get('window_size', 1.0)
+    return TokenBucketRateLimit(TokenBucketRateConfig(
+        rate=options.get('rate', max_requests / window_size),
+        capacity=options.get('capacity', max_requests)
+    ))
+
+
+_WINDOW_KEYS = ('window_size', 'max_requests')
+
+# 重试策略名称 -> 工厂函数(RetryConfig, 原始配置字典)
+_RETRY_REGISTRY: Dict[str, Callable[[RetryConfig, dict], RetryStrategy]] = {
+    "exponential_backoff": lambda cfg, options: ExponentialBackoffRetry(cfg, options.get('multiplier', 2.0)),
+    "linear_growth": lambda cfg, options: LinearGrowthRetry(cfg, options.get('increment', 0.5)),
+    "fixed_wait": lambda cfg, options: FixedWaitRetry(cfg),
+}
+
+# 频控策略名称 -> 工厂函数(原始配置字典)
+_RATE_LIMIT_REGISTRY: Dict[str, Callable[[dict], RateLimitStrategy]] = {
+    "fixed_wait": lambda options: FixedWaitRateLimit(FixedWaitRateConfig(**_pick(options, ('delay',)))),
+    "sliding_window": lambda options: SlidingWindowRateLimit(
+        SlidingWindowRateConfig(**_pick(options, _WINDOW_KEYS))),
+    "weighted_sliding_window": lambda options: WeightedSlidingWindowRateLimit(
+        SlidingWindowRateConfig(**_pick(options, _WINDOW_KEYS))),
+    "fixed_window": lambda options: FixedWindowRateLimit(
+        FixedWindowRateConfig(**_pick(options, _WINDOW_KEYS))),
+    "token_bucket": _create_token_bucket,
+}
+
+
+def _lookup_strategy(registry: dict, name: str, kind: str) -> Callable:
+    """按名称查找策略工厂，名称未注册时抛出 KeyError 并列出可用名称"""
+    try:
+        return registry[name]
+    except KeyError:
+        raise KeyError(f"未知的{kind}策略类型: {name!r}，可选: {', '.join(registry)}") from None
+
+
+def register_retry_strategy(name: str, factory: Callable[[RetryConfig, dict], RetryStrategy]):
+    """
+    注册自定义重试策略
+    
+    Args:
+        name: 策略名称（对应配置项 retry_strategy_type）
+        factory: 工厂函数，接收 RetryConfig 和原始重试配置字典，返回策略实例
+    """
+    _RETRY_REGISTRY[name] = factory
+
+
+def register_rate_limit_strategy(name: str, factory: Callable[[dict], RateLimitStrategy]):
+    """
+    注册自定义频控策略
+    
+    按主机分片时会以 type(strategy)(strategy.config) 为每个主机创建新实例，
+    自定义策略的构造函数需支持这种调用方式。
+    
+    Args:
+        name: 策略名称（对应配置项 rate_limit_strategy_type）
+        factory: 工厂函数，接收原始频控配置字典，返回策略实例
+    """
+    _RATE_LIMIT_REGISTRY[name] = factory
+
+
 # ============================================================================
 # 全局控制器单例
 # ============================================================================
 
 class GlobalRequestController:
-    """全局请求控制器单例"""
+    """
+    全局请求控制器单例
     
-    _instance = None
-    _controller = None
+    控制器引用只在 configure 中持锁写入；读取是单次属性加载（CPython 下为原子操作），
+    无需加锁，因此每次获取控制器都不会与其他线程竞争锁。
+    同步API客户端全局只创建一个，重新配置时只替换其控制器，连接池始终复用。
+    """
+    
+    __slots__ = ('_controller', '_api_client')
+    
+    # 唯一实例在模块导入时创建（见类定义之后），构造调用直接返回它，无需加锁判断
+    _instance: 'GlobalRequestController'
     _lock = threading.Lock()
     
     def __new__(cls):
-        if cls._instance is None:
-            with GlobalRequestController._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def configure(self, controller: RequestController):
         """配置全局控制器"""
         with GlobalRequestController._lock:
             self._controller = controller
+            if self._api_client is None:
+                self._api_client = EnhancedAPIClient(controller)
+            else:
+                self._api_client.controller = controller
     
     def get_controller(self) -> Optional[RequestController]:
         """获取全局控制器实例"""
-        with GlobalRequestController._lock:
-            return self._controller
+        return self._controller
     
     def get_api_client(self) -> EnhancedAPIClient:
-        """获取配置好的API客户端"""
-        return EnhancedAPIClient(self._controller)
+        """获取配置好的API客户端（全局共享同一个实例及其连接池）"""
+        client = self._api_client
+        if client is None:
+            # 尚未调用 configure 时按需创建，之后的配置会沿用该实例
+            with GlobalRequestController._lock:
+                client = self._api_client
+                if client is None:
+                    client = self._api_client = EnhancedAPIClient(self._controller)
+        return client
+    
+    def get_async_api_client(self) -> AsyncEnhancedAPIClient:
+        """
+        创建配置好的异步API客户端（需要安装 httpx）
+        
+        异步客户端绑定在创建它的事件循环上，因此每次调用都新建实例，
+        调用方需在用完后 await aclose() 或以 async with 方式使用。
+        """
+        return AsyncEnhancedAPIClient(self._controller)
     
     @classmethod
     def create_from_config(cls, 
@@ -385,45 +1011,32 @@ class GlobalRequestController:
         """从配置创建全局控制器"""
         
         # 创建重试策略
-        retry_strategy = None
         if retry_config is None:
             retry_config = {"initial_delay": 0.5, "max_retries": 3}
         
         base_retry_config = RetryConfig(**{k: v for k, v in retry_config.items() 
                                          if k in ['initial_delay', 'max_retries', 'max_wait_time']})
         
-        if retry_type == "exponential_backoff":
-            multiplier = retry_config.get('multiplier', 2.0)
-            retry_strategy = ExponentialBackoffRetry(base_retry_config, multiplier)
-        elif retry_type == "linear_growth":
-            increment = retry_config.get('increment', 0.5)
-            retry_strategy = LinearGrowthRetry(base_retry_config, increment)
-        elif retry_type == "fixed_wait":
-            retry_strategy = FixedWaitRetry(base_retry_config)
+        retry_strategy = _lookup_strategy(_RETRY_REGISTRY, retry_type, "重试")(
+            base_retry_config, retry_config)
         
         # 创建频控策略
-        rate_limit_strategy = None
         if rate_limit_config is None:
             rate_limit_config = {"delay": 0.1}
         
-        if rate_limit_type == "fixed_wait":
-            config = FixedWaitRateConfig(**{k: v for k, v in rate_limit_config.items() 
-                                          if k in ['delay']})
-            rate_limit_strategy = FixedWaitRateLimit(config)
-        elif rate_limit_type == "sliding_window":
-            config = SlidingWindowRateConfig(**{k: v for k, v in rate_limit_config.items() 
-                                              if k in ['window_size', 'max_requests']})
-            rate_limit_strategy = SlidingWindowRateLimit(config)
-        elif rate_limit_type == "fixed_window":
-            config = FixedWindowRateConfig(**{k: v for k, v in rate_limit_config.items() 
-                                            if k in ['window_size', 'max_requests']})
-            rate_limit_strategy = FixedWindowRateLimit(config)
+        rate_limit_strategy = _lookup_strategy(_RATE_LIMIT_REGISTRY, rate_limit_type, "频控")(
+            rate_limit_config)
         
         # 创建控制器
         controller = RequestController(retry_strategy, rate_limit_strategy)
         
         # 配置全局实例
-        global_controller = cls()
+        global_controller = cls._instance
         global_controller.configure(controller)
         
-        return global_controller
\ No newline at end of file
+        return global_controller
+
+
+GlobalRequestController._instance = object.__new__(GlobalRequestController)
+GlobalRequestController._instance._controller = None
+GlobalRequestController._instance._api_client = None
\ No newline at end of file
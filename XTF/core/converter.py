@@ -9,10 +9,11 @@ import re
 import pandas as pd
 import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, Iterable, Iterator, Callable
 import datetime as dt
 
 from .config import TargetType
+from utils.records import df_to_records as iter_row_dicts, iter_batches
 
 
 class DataConverter:
@@ -43,8 +44,8 @@ class DataConverter:
             'warnings': []
         }
     
-    def get_index_value_hash(self, row: pd.Series, index_column: Optional[str]) -> Optional[str]:
-        """计算索引值的哈希"""
+    def get_index_value_hash(self, row: Union[pd.Series, Dict[str, Any]], index_column: Optional[str]) -> Optional[str]:
+        """计算索引值的哈希（row 可以是 Series 或行字典）"""
         if index_column and index_column in row:
             value = str(row[index_column])
             return hashlib.md5(value.encode('utf-8')).hexdigest()
@@ -52,8 +53,8 @@ class DataConverter:
     
     # ========== 多维表格转换方法 ==========
     
-    def build_record_index(self, records: List[Dict], index_column: Optional[str]) -> Dict[str, Dict]:
-        """构建多维表格记录索引"""
+    def build_record_index(self, records: Iterable[Dict], index_column: Optional[str]) -> Dict[str, Dict]:
+        """构建多维表格记录索引（records 可以是列表或分页迭代器）"""
         index = {}
         if not index_column:
             return index
@@ -61,24 +62,42 @@ class DataConverter:
         for record in records:
             fields = record.get('fields', {})
             if index_column in fields:
-                raw_value = fields[index_column]
-                
-                # 处理富文本格式：[{'text': '内容', 'type': 'text'}] 
-                if isinstance(raw_value, list) and len(raw_value) > 0:
-                    if isinstance(raw_value[0], dict) and 'text' in raw_value[0]:
-                        index_value = raw_value[0]['text']
-                    else:
-                        index_value = str(raw_value[0])
-                elif isinstance(raw_value, dict) and 'text' in raw_value:
-                    index_value = raw_value['text']
-                else:
-                    index_value = str(raw_value)
-                
+                index_value = self._extract_index_text(fields[index_column])
                 index_hash = hashlib.md5(index_value.encode('utf-8')).hexdigest()
                 index[index_hash] = record
         
         return index
     
+    def build_record_key_map(self, records: Iterable[Dict], index_column: Optional[str]) -> Dict[str, str]:
+        """
+        构建 索引值文本 -> record_id 映射
+        
+        与 build_record_index 的匹配规则一致，但直接以索引值文本为键，
+        便于和本地索引列做集合运算，无需逐行计算哈希。
+        """
+        key_map = {}
+        if not index_column:
+            return key_map
+        
+        for record in records:
+            fields = record.get('fields', {})
+            if index_column in fields:
+                key_map[self._extract_index_text(fields[index_column])] = record["record_id"]
+        
+        return key_map
+    
+    @staticmethod
+    def _extract_index_text(raw_value: Any) -> str:
+        """提取多维表格字段值中的索引文本"""
+        # 处理富文本格式：[{'text': '内容', 'type': 'text'}] 
+        if isinstance(raw_value, list) and len(raw_value) > 0:
+            if isinstance(raw_value[0], dict) and 'text' in raw_value[0]:
+                return raw_value[0]['text']
+            return str(raw_value[0])
+        if isinstance(raw_value, dict) and 'text' in raw_value:
+            return raw_value['text']
+        return str(raw_value)
+    
     def _detect_excel_validation(self, df: pd.DataFrame, column_name: str) -> tuple:
         """
         检测Excel列是否包含数据验证(下拉列表)
@@ -582,38 +601,82 @@ class DataConverter:
     
     def _force_convert_to_feishu_type(self, value, field_name: str, field_type: int):
         """强制转换值为指定的飞书字段类型"""
-        if field_type == 1:  # 文本字段 - 所有值都可以转换为文本
-            return str(value)
+        return self._get_type_converter(field_type)(value, field_name)
+    
+    def _get_type_converter(self, field_type: int) -> Callable[[Any, str], Any]:
+        """
+        按飞书字段类型返回对应的转换函数
+        
+        Args:
+            field_type: 飞书字段类型编码
+            
+        Returns:
+            签名为 (value, field_name) 的转换函数
+        """
+        if field_type in (1, 13, 22):  # 文本/电话号码/地理位置字段 - 转为字符串
+            return lambda value, field_name: str(value)
         elif field_type == 2:  # 数字字段 - 强制转换为数字
-            return self._force_to_number(value, field_name)
+            return self._force_to_number
         elif field_type == 3:  # 单选字段 - 转换为单个字符串
-            return self._force_to_single_choice(value, field_name)
+            return self._force_to_single_choice
         elif field_type == 4:  # 多选字段 - 转换为字符串数组
-            return self._force_to_multi_choice(value, field_name)
+            return self._force_to_multi_choice
         elif field_type == 5:  # 日期字段 - 强制转换为时间戳
-            return self._force_to_timestamp(value, field_name)
+            return self._force_to_timestamp
         elif field_type == 7:  # 复选框字段 - 强制转换为布尔值
-            return self._force_to_boolean(value, field_name)
-        elif field_type == 11:  # 人员字段
-            return self.convert_to_user_field(value)
-        elif field_type == 13:  # 电话号码字段
-            return str(value)
+            return self._force_to_boolean
+        elif field_type in (11, 23):  # 人员/群组字段
+            return lambda value, field_name: self.convert_to_user_field(value)
         elif field_type == 15:  # 超链接字段
-            return self.convert_to_url_field(value)
+            return lambda value, field_name: self.convert_to_url_field(value)
         elif field_type == 17:  # 附件字段
-            return self.convert_to_attachment_field(value)
-        elif field_type in [18, 21]:  # 关联字段
-            return self.convert_to_link_field(value)
-        elif field_type == 22:  # 地理位置字段
-            return str(value)
-        elif field_type == 23:  # 群组字段
-            return self.convert_to_user_field(value)
-        elif field_type in [19, 20, 1001, 1002, 1003, 1004, 1005]:  # 只读字段
-            self.logger.debug(f"字段 '{field_name}' 是只读字段，跳过设置")
-            return None
+            return lambda value, field_name: self.convert_to_attachment_field(value)
+        elif field_type in (18, 21):  # 关联字段
+            return lambda value, field_name: self.convert_to_link_field(value)
+        elif field_type in (19, 20, 1001, 1002, 1003, 1004, 1005):  # 只读字段
+            def skip_readonly(value, field_name):
+                self.logger.debug(f"字段 '{field_name}' 是只读字段，跳过设置")
+                return None
+            return skip_readonly
         else:
             # 未知类型，默认转为字符串
-            return str(value)
+            return lambda value, field_name: str(value)
+    
+    def build_transformers(self, field_types: Optional[Dict[str, int]] = None) -> Dict[str, Callable[[Any], Any]]:
+        """
+        按字段类型预先构建每个字段的转换函数（每次同步构建一次）
+        
+        转换函数与 convert_field_value_safe 的多维表格分支行为一致（含转换统计），
+        但字段类型分派只在构建时进行一次，逐行转换时不再重复判断。
+        
+        Args:
+            field_types: 字段名 -> 飞书字段类型
+            
+        Returns:
+            Dict[str, Callable]: 字段名 -> 单参数转换函数
+        """
+        if self.target_type != TargetType.BITABLE or not field_types:
+            return {}
+        return {name: self._make_transformer(name, field_type) for name, field_type in field_types.items()}
+    
+    def _make_transformer(self, field_name: str, field_type: int) -> Callable[[Any], Any]:
+        """构建单个字段的转换函数"""
+        convert = self._get_type_converter(field_type)
+        
+        def transform(value):
+            try:
+                converted_value = convert(value, field_name)
+            except Exception as e:
+                self.logger.warning(f"字段 '{field_name}' 强制转换失败: {e}, 原始值: '{value}'")
+                self.conversion_stats['failed'] += 1
+                return None
+            if converted_value is not None:
+                self.conversion_stats['success'] += 1
+            else:
+                self.conversion_stats['failed'] += 1
+            return converted_value
+        
+        return transform
     
     def _force_to_number(self, value, field_name: str):
         """强制转换为数字"""
@@ -1081,18 +1144,35 @@ class DataConverter:
         if self.target_type != TargetType.BITABLE:
             raise ValueError("df_to_records 只支持多维表格模式")
         
-        records = []
-        for _, row in df.iterrows():
-            fields = {}
-            for k, v in row.to_dict().items():
-                if pd.notnull(v):
-                    converted_value = self.convert_field_value_safe(str(k), v, field_types)
-                    if converted_value is not None:
-                        fields[str(k)] = converted_value
-            
-            record = {"fields": fields}
-            records.append(record)
-        return records
+        transformers = self.build_transformers(field_types)
+        return [{"fields": self.row_to_fields(row, transformers)} for row in iter_row_dicts(df)]
+    
+    def iter_record_batches(self, df: pd.DataFrame, field_types: Optional[Dict[str, int]],
+                            batch_size: int) -> Iterator[List[Dict]]:
+        """按批生成飞书记录（多维表格模式），每次只构建一个批次的记录"""
+        if self.target_type != TargetType.BITABLE:
+            raise ValueError("iter_record_batches 只支持多维表格模式")
+        
+        transformers = self.build_transformers(field_types)
+        for rows in iter_batches(df, batch_size):
+            yield [{"fields": self.row_to_fields(row, transformers)} for row in rows]
+    
+    def row_to_fields(self, row: Dict[str, Any], transformers: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+        """
+        将单行数据字典转换为飞书记录的 fields（跳过空值）
+        
+        Args:
+            row: 单行数据字典（缺失值为 None）
+            transformers: build_transformers 构建的字段转换函数，未包含的字段使用智能转换
+        """
+        default = self.smart_convert_value if self.target_type == TargetType.BITABLE else self.simple_convert_value
+        fields = {}
+        for k, v in row.items():
+            if v is not None:
+                converted_value = transformers.get(k, default)(v)
+                if converted_value is not None:
+                    fields[k] = converted_value
+        return fields
     
     def report_conversion_stats(self):
         """输出数据转换统计报告"""
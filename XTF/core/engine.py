@@ -9,13 +9,16 @@ import pandas as pd
 import time
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Union, Tuple
+from typing import Optional, Dict, Any, List, Union, Tuple, Iterator, Iterable
 
 from .config import SyncConfig, SyncMode, TargetType
 from .converter import DataConverter
-from api import FeishuAuth, RetryableAPIClient, BitableAPI, SheetAPI, RateLimiter
+from api import FeishuAuth, RetryableAPIClient, BitableAPI, SheetAPI, RateLimiter, TokenBucket, AIMDController, AdaptiveBatcher
+from utils.records import df_to_records as iter_row_dicts
+from utils.normalize import normalize_for_feishu
 
 
 class XTFSyncEngine:
@@ -52,7 +55,13 @@ class XTFSyncEngine:
                 self.auth,
                 self.api_client,
                 start_row=self.config.start_row,
-                start_column=self.config.start_column
+                start_column=self.config.start_column,
+                max_workers=self.config.max_concurrency,
+                gzip_requests=self.config.gzip_requests,
+                # 所有写操作共享同一令牌桶，并发时允许 max_concurrency 个突发请求
+                rate_limiter=TokenBucket.from_interval(self.config.rate_limit_delay,
+                                                       capacity=self.config.max_concurrency),
+                sheet_rate_limit_delay=self.config.sheet_rate_limit_delay
             )
         # 初始化数据转换器
         self.converter = DataConverter(config.target_type)
@@ -116,9 +125,8 @@ class XTFSyncEngine:
             if not self.config.app_token or not self.config.table_id:
                 self.logger.error("多维表格的 app_token 或 table_id 未配置")
                 return {}
-            existing_fields = self.api.list_fields(self.config.app_token, self.config.table_id)
             field_types = {}
-            for field in existing_fields:
+            for field in self.api.iter_fields(self.config.app_token, self.config.table_id):
                 field_name = field.get('field_name', '')
                 field_type = field.get('type', 1)  # 默认为文本类型
                 field_types[field_name] = field_type
@@ -144,7 +152,6 @@ class XTFSyncEngine:
 
             # 获取现有字段
             existing_fields = self.api.list_fields(self.config.app_token, self.config.table_id)
-            existing_field_names = {field['field_name'] for field in existing_fields}
             
             # 构建字段类型映射
             field_types = {}
@@ -154,12 +161,11 @@ class XTFSyncEngine:
                 field_types[field_name] = field_type
             
             if self.config.create_missing_fields:
-                # 找出缺失的字段，保持原始列顺序
-                required_fields = set(df.columns)
-                missing_fields_set = required_fields - existing_field_names
-                
-                # 按照 DataFrame 列的原始顺序排列缺失字段
-                missing_fields = [col for col in df.columns if col in missing_fields_set]
+                # 找出缺失的字段，按照 DataFrame 列的原始顺序排列
+                missing_fields = [
+                    col for col in df.columns
+                    if not self.api.has_field(self.config.app_token, self.config.table_id, col)
+                ]
                 
                 if missing_fields:
                     self.logger.info(f"检测到 {len(missing_fields)} 个缺失字段")
@@ -232,39 +238,174 @@ class XTFSyncEngine:
             return []
         return self.api.get_all_records(self.config.app_token, self.config.table_id)
     
+    def iter_bitable_records(self) -> Iterator[Dict]:
+        """逐页迭代多维表格记录（边拉取边处理，内存占用为单页大小）"""
+        if not isinstance(self.api, BitableAPI):
+            return
+        if not self.config.app_token or not self.config.table_id:
+            self.logger.error("多维表格的 app_token 或 table_id 未配置")
+            return
+        yield from self.api.iter_all_records(self.config.app_token, self.config.table_id)
+    
+    def _diff(self, df: pd.DataFrame, existing_iter: Iterable[Dict]) -> Dict[str, Any]:
+        """
+        基于索引列对比本地数据与远程记录
+        
+        本地索引列整列转换为文本，远程记录流式构建 索引值 -> record_id 映射，
+        新增/更新/删除集合通过集合运算得到。
+        
+        Args:
+            df: 本地数据
+            existing_iter: 远程记录（列表或分页迭代器）
+            
+        Returns:
+            Dict: local_keys(逐行索引文本), existing(索引值->record_id),
+                  to_create/to_update/to_delete(索引值集合)
+        """
+        index_column = self.config.index_column
+        if index_column and index_column in df.columns:
+            local_keys = df[index_column].astype(str).tolist()
+        else:
+            local_keys = [None] * len(df)
+        
+        existing = self.converter.build_record_key_map(existing_iter, index_column)
+        new_keys = set(local_keys)
+        new_keys.discard(None)
+        existing_keys = existing.keys()
+        
+        return {
+            'local_keys': local_keys,
+            'existing': existing,
+            'to_create': new_keys - existing_keys,
+            'to_update': new_keys & existing_keys,
+            'to_delete': existing_keys - new_keys,
+        }
+    
     def process_in_batches(self, items: List[Any], batch_size: int,
                           processor_func, *args, **kwargs) -> bool:
-        """分批处理数据（多维表格模式）"""
+        """
+        分批处理数据（多维表格模式）
+
+        max_concurrency > 1 时使用线程池并发提交批次，
+        并由 AIMD 控制器根据失败和延迟自适应调整在途批次数；
+        adaptive_batch_size 开启时（串行模式）由 AdaptiveBatcher 动态调整批大小，
+        batch_size 作为批大小上限。
+        """
         if self.config.target_type != TargetType.BITABLE:
             return False
-            
-        total_batches = (len(items) + batch_size - 1) // batch_size
-        success_count = 0
         
         # 获取操作类型用于日志显示
         operation_type = self._get_operation_type(processor_func)
         
-        for i in range(0, len(items), batch_size):
-            batch = items[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            start_row = i + 1  # Excel行号从1开始
-            end_row = min(i + len(batch), len(items))
+        def run_batch(i: int, size: int, batch_label: str) -> bool:
+            return self._submit_batch(operation_type, batch_label, i + 1, items[i:i + size],
+                                      processor_func, *args, **kwargs)
+        
+        if self.config.adaptive_batch_size and self.config.max_concurrency <= 1:
+            success_count, total_batches = self._run_adaptive_batches(run_batch, len(items), batch_size)
+        else:
+            total_batches = (len(items) + batch_size - 1) // batch_size
             
-            try:
-                # 修复参数传递顺序：先传递固定参数，再传递批次数据
-                if processor_func(*args, batch, **kwargs):
-                    success_count += 1
-                    # 显示具体的行范围信息
-                    range_info = f"第{start_row}-{end_row}行" if start_row != end_row else f"第{start_row}行"
-                    self.logger.info(f"✅ {operation_type}成功: 批次{batch_num}/{total_batches}, {len(batch)}条记录 ({range_info})")
-                else:
-                    self.logger.error(f"❌ {operation_type}失败: 批次{batch_num}/{total_batches}")
-            except Exception as e:
-                self.logger.error(f"❌ {operation_type}异常: 批次{batch_num}/{total_batches}, 错误: {e}")
+            def run_fixed_batch(i: int) -> bool:
+                return run_batch(i, batch_size, f"{i // batch_size + 1}/{total_batches}")
+            
+            offsets = range(0, len(items), batch_size)
+            if self.config.max_concurrency <= 1 or total_batches <= 1:
+                success_count = sum(1 for i in offsets if run_fixed_batch(i))
+            else:
+                success_count = self._run_batches_concurrently(run_fixed_batch, offsets)
         
         self.logger.info(f"🎉 {operation_type}完成: {success_count}/{total_batches} 个批次成功")
         return success_count == total_batches
     
+    def _submit_batch(self, operation_type: str, batch_label: str, start_row: int, batch: List[Any],
+                      processor_func, *args, **kwargs) -> bool:
+        """提交单个批次并记录结果日志（start_row 为批次首行的 1-based 行号）"""
+        end_row = start_row + len(batch) - 1
+        
+        try:
+            # 修复参数传递顺序：先传递固定参数，再传递批次数据
+            if processor_func(*args, batch, **kwargs):
+                # 显示具体的行范围信息
+                range_info = f"第{start_row}-{end_row}行" if start_row != end_row else f"第{start_row}行"
+                self.logger.info(f"✅ {operation_type}成功: 批次{batch_label}, {len(batch)}条记录 ({range_info})")
+                return True
+            self.logger.error(f"❌ {operation_type}失败: 批次{batch_label}")
+        except Exception as e:
+            self.logger.error(f"❌ {operation_type}异常: 批次{batch_label}, 错误: {e}")
+        return False
+    
+    def process_df_in_batches(self, df: pd.DataFrame, field_types: Optional[Dict[str, int]],
+                              processor_func, *args, **kwargs) -> bool:
+        """
+        将 DataFrame 按批转换为记录并提交（多维表格模式）
+        
+        串行模式下边转换边提交，任一时刻只保留一个批次的记录；
+        并发或自适应批大小模式需要随机访问批次，回退为先整体转换再分批。
+        """
+        if self.config.target_type != TargetType.BITABLE:
+            return False
+        
+        batch_size = self.config.batch_size
+        if self.config.max_concurrency > 1 or self.config.adaptive_batch_size:
+            records = self.converter.df_to_records(df, field_types)
+            return self.process_in_batches(records, batch_size, processor_func, *args, **kwargs)
+        
+        operation_type = self._get_operation_type(processor_func)
+        total_batches = (len(df) + batch_size - 1) // batch_size
+        success_count = 0
+        
+        batches = self.converter.iter_record_batches(df, field_types, batch_size)
+        for batch_index, batch in enumerate(batches):
+            if self._submit_batch(operation_type, f"{batch_index + 1}/{total_batches}",
+                                  batch_index * batch_size + 1, batch,
+                                  processor_func, *args, **kwargs):
+                success_count += 1
+        
+        self.logger.info(f"🎉 {operation_type}完成: {success_count}/{total_batches} 个批次成功")
+        return success_count == total_batches
+    
+    def _run_adaptive_batches(self, run_batch, total_items: int, max_batch_size: int) -> Tuple[int, int]:
+        """按自适应批大小串行执行批次，返回 (成功批次数, 总批次数)"""
+        batcher = AdaptiveBatcher(initial=min(100, max_batch_size), max_size=max_batch_size,
+                                  min_size=min(10, max_batch_size))
+        success_count = 0
+        batch_num = 0
+        i = 0
+        
+        while i < total_items:
+            size = batcher.next_size()
+            batch_num += 1
+            started = time.time()
+            ok = run_batch(i, size, f"{batch_num} (批大小 {size})")
+            batcher.observe(time.time() - started, ok)
+            if ok:
+                success_count += 1
+            i += size
+        
+        return success_count, batch_num
+    
+    def _run_batches_concurrently(self, run_batch, offsets) -> int:
+        """使用AIMD控制的线程池并发执行批次，返回成功批次数"""
+        controller = AIMDController(c_min=1, c_max=self.config.max_concurrency)
+        
+        def guarded(i: int) -> bool:
+            controller.acquire()
+            try:
+                started = time.time()
+                ok = run_batch(i)
+                if ok:
+                    controller.on_success(time.time() - started)
+                else:
+                    controller.on_error()
+                return ok
+            finally:
+                controller.release()
+        
+        with ThreadPoolExecutor(max_workers=self.config.max_concurrency) as executor:
+            results = list(executor.map(guarded, offsets))
+        return sum(1 for ok in results if ok)
+    
     def _get_operation_type(self, processor_func) -> str:
         """根据处理函数获取操作类型"""
         func_name = getattr(processor_func, '__name__', str(processor_func))
@@ -373,58 +514,51 @@ class XTFSyncEngine:
         if not self.config.index_column:
             self.logger.warning("未指定索引列，将执行纯新增操作")
             field_types = self.get_field_types()
-            new_records = self.converter.df_to_records(df, field_types)
             if isinstance(self.api, BitableAPI) and self.config.app_token and self.config.table_id:
-                return self.process_in_batches(
-                    new_records, self.config.batch_size,
+                return self.process_df_in_batches(
+                    df, field_types,
                     self.api.batch_create_records,
                     self.config.app_token, self.config.table_id
                 )
             return False
         
         # 获取现有记录并建立索引
-        existing_records = self.get_all_bitable_records()
-        self.logger.info(f"🔍 获取到现有记录数量: {len(existing_records)}")
-        
-        existing_index = self.converter.build_record_index(existing_records, self.config.index_column)
-        self.logger.info(f"🔍 构建索引成功，索引数量: {len(existing_index)}")
-        
-        # 打印前几个现有记录的索引列值用于调试
-        if existing_records and len(existing_records) > 0:
-            for i, record in enumerate(existing_records[:3]):
-                fields = record.get('fields', {})
-                index_value = fields.get(self.config.index_column, '未找到')
-                self.logger.info(f"🔍 现有记录 {i+1} 索引列 '{self.config.index_column}' 值: '{index_value}'")
-        
-        field_types = self.get_field_types()
+        record_count = 0
+        
+        def preview_records():
+            # 边拉取边建索引，同时打印前几个现有记录的索引列值用于调试
+            nonlocal record_count
+            for record in self.iter_bitable_records():
+                if record_count < 3:
+                    fields = record.get('fields', {})
+                    index_value = fields.get(self.config.index_column, '未找到')
+                    self.logger.info(f"🔍 现有记录 {record_count+1} 索引列 '{self.config.index_column}' 值: '{index_value}'")
+                record_count += 1
+                yield record
+        
+        diff = self._diff(df, preview_records())
+        existing = diff['existing']
+        self.logger.info(f"🔍 获取到现有记录数量: {record_count}")
+        self.logger.info(f"🔍 构建索引成功，索引数量: {len(existing)}")
+        
+        transformers = self.converter.build_transformers(self.get_field_types())
         
         # 分类本地数据
         records_to_update = []
         records_to_create = []
         
-        for i, (_, row) in enumerate(df.iterrows()):
-            index_hash = self.converter.get_index_value_hash(row, self.config.index_column)
-            index_value = row.get(self.config.index_column, '未找到')
-            
+        for i, (row, key) in enumerate(zip(iter_row_dicts(df), diff['local_keys'])):
             # 打印前几条记录的匹配信息用于调试
             if i < 3:
-                self.logger.info(f"🔍 新数据记录 {i+1} 索引列 '{self.config.index_column}' 值: '{index_value}' -> 哈希: {index_hash}")
-                self.logger.info(f"🔍 哈希是否在现有索引中: {index_hash in existing_index if index_hash else False}")
+                self.logger.info(f"🔍 新数据记录 {i+1} 索引列 '{self.config.index_column}' 值: '{key}'")
+                self.logger.info(f"🔍 是否在现有索引中: {key in diff['to_update']}")
             
             # 使用字段类型转换构建记录
-            fields = {}
-            for k, v in row.to_dict().items():
-                if pd.notnull(v):
-                    converted_value = self.converter.convert_field_value_safe(str(k), v, field_types)
-                    if converted_value is not None:
-                        fields[str(k)] = converted_value
-            
-            record = {"fields": fields}
+            record = {"fields": self.converter.row_to_fields(row, transformers)}
             
-            if index_hash and index_hash in existing_index:
+            if key in diff['to_update']:
                 # 需要更新的记录
-                existing_record = existing_index[index_hash]
-                record["record_id"] = existing_record["record_id"]
+                record["record_id"] = existing[key]
                 records_to_update.append(record)
             else:
                 # 需要新增的记录
@@ -646,43 +780,28 @@ class XTFSyncEngine:
         if not self.config.index_column:
             self.logger.warning("未指定索引列，将执行纯新增操作")
             field_types = self.get_field_types()
-            new_records = self.converter.df_to_records(df, field_types)
             if isinstance(self.api, BitableAPI) and self.config.app_token and self.config.table_id:
-                return self.process_in_batches(
-                    new_records, self.config.batch_size,
+                return self.process_df_in_batches(
+                    df, field_types,
                     self.api.batch_create_records,
                     self.config.app_token, self.config.table_id
                 )
             return False
         
         # 获取现有记录并建立索引
-        existing_records = self.get_all_bitable_records()
-        existing_index = self.converter.build_record_index(existing_records, self.config.index_column)
+        diff = self._diff(df, self.iter_bitable_records())
         field_types = self.get_field_types()
         
-        # 筛选出需要新增的记录
-        records_to_create = []
-        
-        for _, row in df.iterrows():
-            index_hash = self.converter.get_index_value_hash(row, self.config.index_column)
-            
-            if not index_hash or index_hash not in existing_index:
-                # 使用字段类型转换构建记录
-                fields = {}
-                for k, v in row.to_dict().items():
-                    if pd.notnull(v):
-                        converted_value = self.converter.convert_field_value_safe(str(k), v, field_types)
-                        if converted_value is not None:
-                            fields[str(k)] = converted_value
-                
-                record = {"fields": fields}
-                records_to_create.append(record)
+        # 筛选出需要新增的记录（索引值不在远程记录中的行）
+        to_create = diff['to_create']
+        mask = [key is None or key in to_create for key in diff['local_keys']]
+        df_to_create = df[mask]
         
-        self.logger.info(f"增量同步计划: 新增 {len(records_to_create)} 条记录")
+        self.logger.info(f"增量同步计划: 新增 {len(df_to_create)} 条记录")
         
-        if records_to_create and isinstance(self.api, BitableAPI) and self.config.app_token and self.config.table_id:
-            return self.process_in_batches(
-                records_to_create, self.config.batch_size,
+        if not df_to_create.empty and isinstance(self.api, BitableAPI) and self.config.app_token and self.config.table_id:
+            return self.process_df_in_batches(
+                df_to_create, field_types,
                 self.api.batch_create_records,
                 self.config.app_token, self.config.table_id
             )
@@ -843,18 +962,12 @@ class XTFSyncEngine:
     def _sync_overwrite_bitable(self, df: pd.DataFrame) -> bool:
         """多维表格覆盖同步"""
         # 获取现有记录并建立索引
-        existing_records = self.get_all_bitable_records()
-        existing_index = self.converter.build_record_index(existing_records, self.config.index_column)
+        diff = self._diff(df, self.iter_bitable_records())
         field_types = self.get_field_types()
         
-        # 找出需要删除的记录
-        record_ids_to_delete = []
-        
-        for _, row in df.iterrows():
-            index_hash = self.converter.get_index_value_hash(row, self.config.index_column)
-            if index_hash and index_hash in existing_index:
-                existing_record = existing_index[index_hash]
-                record_ids_to_delete.append(existing_record["record_id"])
+        # 找出需要删除的记录（本地索引值已存在于远程的记录）
+        existing = diff['existing']
+        record_ids_to_delete = [existing[key] for key in diff['to_update']]
         
         self.logger.info(f"覆盖同步计划: 删除 {len(record_ids_to_delete)} 条已存在记录，然后新增 {len(df)} 条记录")
         
@@ -868,11 +981,10 @@ class XTFSyncEngine:
             )
         
         # 新增全部记录
-        new_records = self.converter.df_to_records(df, field_types)
         create_success = False
         if isinstance(self.api, BitableAPI) and self.config.app_token and self.config.table_id:
-            create_success = self.process_in_batches(
-                new_records, self.config.batch_size,
+            create_success = self.process_df_in_batches(
+                df, field_types,
                 self.api.batch_create_records,
                 self.config.app_token, self.config.table_id
             )
@@ -1012,8 +1124,7 @@ class XTFSyncEngine:
     def _sync_clone_bitable(self, df: pd.DataFrame) -> bool:
         """多维表格克隆同步"""
         # 获取所有现有记录
-        existing_records = self.get_all_bitable_records()
-        existing_record_ids = [record["record_id"] for record in existing_records]
+        existing_record_ids = [record["record_id"] for record in self.iter_bitable_records()]
         
         self.logger.info(f"克隆同步计划: 删除 {len(existing_record_ids)} 条已有记录，然后新增 {len(df)} 条记录")
         
@@ -1028,11 +1139,10 @@ class XTFSyncEngine:
         
         # 新增全部记录
         field_types = self.get_field_types()
-        new_records = self.converter.df_to_records(df, field_types)
         create_success = False
         if isinstance(self.api, BitableAPI) and self.config.app_token and self.config.table_id:
-            create_success = self.process_in_batches(
-                new_records, self.config.batch_size,
+            create_success = self.process_df_in_batches(
+                df, field_types,
                 self.api.batch_create_records,
                 self.config.app_token, self.config.table_id
             )
@@ -1108,16 +1218,18 @@ class XTFSyncEngine:
         
         success = True
         
+        # 各列的绝对列字母只计算一次（重名列以首次出现的位置为准）
+        start_col_num = self.api.column_letter_to_number(self.config.start_column)
+        column_letters: Dict[str, str] = {}
+        for col_index_in_df, column_name in enumerate(df.columns):
+            column_letters.setdefault(column_name, self.api.column_number_to_letter(start_col_num + col_index_in_df))
+        
         # 1. 配置下拉列表 (base策略跳过)
         if strategy_name != 'base':
             for dropdown_config in field_config['dropdown_configs']:
                 column_name = dropdown_config['column']
                 
-                # 计算列的绝对位置
-                start_col_num = self.api.column_letter_to_number(self.config.start_column)
-                col_index_in_df = list(df.columns).index(column_name)
-                actual_col_num = start_col_num + col_index_in_df
-                col_letter = self.api.column_number_to_letter(actual_col_num)
+                col_letter = column_letters[column_name]
                 
                 # 计算行的绝对范围 (数据行，不含表头)
                 start_data_row = self.config.start_row + 1
@@ -1156,62 +1268,34 @@ class XTFSyncEngine:
         else:
             self.logger.info("base策略跳过下拉列表配置")
         
-        # 2. 配置日期格式
-        if field_config['date_columns'] and isinstance(self.api, SheetAPI) and self.config.spreadsheet_token:
-            date_ranges = []
-            for column_name in field_config['date_columns']:
-                start_col_num = self.api.column_letter_to_number(self.config.start_column)
-                col_index_in_df = list(df.columns).index(column_name)
-                actual_col_num = start_col_num + col_index_in_df
-                col_letter = self.api.column_number_to_letter(actual_col_num)
-
-                start_data_row = self.config.start_row + 1
-                end_data_row = self.config.start_row + len(df)
-                
-                if end_data_row >= start_data_row:
-                    range_str = f"{self.config.sheet_id}!{col_letter}{start_data_row}:{col_letter}{end_data_row}"
-                    date_ranges.append(range_str)
+        # 2/3. 配置日期格式和数字格式（合并为尽量少的样式批量请求）
+        if (field_config['date_columns'] or field_config['number_columns']) and \
+                isinstance(self.api, SheetAPI) and self.config.spreadsheet_token:
+            start_data_row = self.config.start_row + 1
+            end_data_row = self.config.start_row + len(df)
             
-            # 设置日期格式
-            date_success = self.api.set_date_format(
-                self.config.spreadsheet_token,
-                date_ranges,
-                "yyyy/MM/dd"
-            )
+            def column_ranges(column_names: List[str]) -> List[str]:
+                if end_data_row < start_data_row:
+                    return []
+                return [f"{self.config.sheet_id}!{column_letters[name]}{start_data_row}:"
+                        f"{column_letters[name]}{end_data_row}" for name in column_names]
             
-            if date_success:
-                self.logger.info(f"成功为 {len(date_ranges)} 个日期列设置格式")
-            else:
-                self.logger.error("设置日期格式失败")
-                # 不设置success = False，允许继续其他操作
-        
-        # 3. 配置数字格式
-        if field_config['number_columns'] and isinstance(self.api, SheetAPI) and self.config.spreadsheet_token:
-            number_ranges = []
-            for column_name in field_config['number_columns']:
-                start_col_num = self.api.column_letter_to_number(self.config.start_column)
-                col_index_in_df = list(df.columns).index(column_name)
-                actual_col_num = start_col_num + col_index_in_df
-                col_letter = self.api.column_number_to_letter(actual_col_num)
-                
-                start_data_row = self.config.start_row + 1
-                end_data_row = self.config.start_row + len(df)
-
-                if end_data_row >= start_data_row:
-                    range_str = f"{self.config.sheet_id}!{col_letter}{start_data_row}:{col_letter}{end_data_row}"
-                    number_ranges.append(range_str)
+            date_ranges = column_ranges(field_config['date_columns'])
+            number_ranges = column_ranges(field_config['number_columns'])
             
-            # 设置数字格式
-            number_success = self.api.set_number_format(
-                self.config.spreadsheet_token,
-                number_ranges,
-                "#,##0.00"
-            )
+            with self.api.batch_styles(self.config.spreadsheet_token) as style_batch:
+                if date_ranges:
+                    self.api.set_date_format(self.config.spreadsheet_token, date_ranges, "yyyy/MM/dd")
+                if number_ranges:
+                    self.api.set_number_format(self.config.spreadsheet_token, number_ranges, "#,##0.00")
             
-            if number_success:
-                self.logger.info(f"成功为 {len(number_ranges)} 个数字列设置格式")
+            if style_batch.success:
+                if date_ranges:
+                    self.logger.info(f"成功为 {len(date_ranges)} 个日期列设置格式")
+                if number_ranges:
+                    self.logger.info(f"成功为 {len(number_ranges)} 个数字列设置格式")
             else:
-                self.logger.error("设置数字格式失败")
+                self.logger.error("设置日期/数字格式失败")
                 # 不设置success = False，允许继续其他操作
         
         # 输出配置摘要
@@ -1281,6 +1365,10 @@ class XTFSyncEngine:
                 self.logger.info("程序将自动进行强制类型转换...")
             else:
                 self.logger.info("✅ 数据类型匹配良好")
+            
+            # 按字段类型整列预规范化，索引列保持原样以免影响记录匹配
+            exclude = [self.config.index_column] if self.config.index_column else []
+            df = normalize_for_feishu(df, field_types, exclude=exclude)
         
         # 根据同步模式执行对应操作
         sync_result = False
@@ -9,10 +9,12 @@
 - CSV (.csv): 🧪 实验性支持，测试阶段
 """
 
+import os
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 # 导入智能Excel读取引擎（性能优化）
 try:
@@ -21,6 +23,14 @@ try:
 except ImportError:
     SMART_EXCEL_AVAILABLE = False
 
+# 导入PyArrow CSV解析器（多线程C++实现，可选依赖）
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_CSV_AVAILABLE = True
+except ImportError:
+    PYARROW_CSV_AVAILABLE = False
+
 
 class DataFileReader:
     """
@@ -50,9 +60,20 @@ class DataFileReader:
         '.csv': 'CSV (实验性)',
     }
 
-    def __init__(self):
-        """初始化文件读取器"""
+    def __init__(self, excel_engine: str = 'auto', sheet_names: Optional[List[str]] = None,
+                 concurrent_sheets: bool = True):
+        """
+        初始化文件读取器
+
+        Args:
+            excel_engine: Excel 读取引擎，auto/calamine/openpyxl/xlrd
+            sheet_names: 需要合并读取的多个工作表名称，None 表示只读第一个工作表
+            concurrent_sheets: 多工作表时是否并发读取
+        """
         self.logger = logging.getLogger('XTF.reader')
+        self.excel_engine = excel_engine
+        self.sheet_names = sheet_names
+        self.concurrent_sheets = concurrent_sheets
 
     def read_file(self, file_path: Path, **kwargs) -> pd.DataFrame:
         """
@@ -84,6 +105,10 @@ class DataFileReader:
         if file_ext == '.csv':
             return self._read_csv(file_path, **kwargs)
         elif file_ext in ['.xlsx', '.xls']:
+            if self.sheet_names and len(self.sheet_names) > 1:
+                return self._read_excel_sheets(file_path, self.sheet_names, **kwargs)
+            if self.sheet_names:
+                kwargs.setdefault('sheet_name', self.sheet_names[0])
             return self._read_excel(file_path, **kwargs)
         else:
             supported = ', '.join(self.SUPPORTED_FORMATS.keys())
@@ -108,13 +133,13 @@ class DataFileReader:
         """
         if SMART_EXCEL_AVAILABLE:
             # 使用智能Excel读取引擎（性能优化）
-            self.logger.debug(f"使用 smart_read_excel (Calamine引擎) 读取文件: {file_path}")
+            self.logger.debug(f"使用 smart_read_excel (引擎: {self.excel_engine}) 读取文件: {file_path}")
             try:
-                df = smart_read_excel(file_path, **kwargs)
-                self.logger.info(f"Excel文件读取成功 (Calamine引擎): {len(df)} 行 × {len(df.columns)} 列")
+                df = smart_read_excel(file_path, engine=self.excel_engine, **kwargs)
+                self.logger.info(f"Excel文件读取成功 (引擎: {self.excel_engine}): {len(df)} 行 × {len(df.columns)} 列")
                 return df
             except Exception as e:
-                self.logger.warning(f"Calamine引擎读取失败，回退到OpenPyXL: {e}")
+                self.logger.warning(f"智能引擎读取失败，回退到 pd.read_excel: {e}")
                 # 继续使用传统方式
 
         # 传统方式（兜底）
@@ -127,6 +152,36 @@ class DataFileReader:
             self.logger.error(f"Excel文件读取失败: {e}")
             raise
 
+    def _read_excel_sheets(self, file_path: Path, sheet_names: List[str], **kwargs) -> pd.DataFrame:
+        """
+        读取多个工作表并按顺序纵向合并
+
+        各工作表在 xlsx 中是独立的 zip 成员，可并行解压和解析，
+        concurrent_sheets 开启时使用线程池并发读取。
+
+        Args:
+            file_path: Excel文件路径
+            sheet_names: 工作表名称列表
+            **kwargs: pandas.read_excel的额外参数
+
+        Returns:
+            pd.DataFrame: 合并后的数据
+        """
+        def read_sheet(sheet_name: str) -> pd.DataFrame:
+            return self._read_excel(file_path, sheet_name=sheet_name, **kwargs)
+
+        if self.concurrent_sheets:
+            max_workers = min(len(sheet_names), os.cpu_count() or 1)
+            self.logger.info(f"并发读取 {len(sheet_names)} 个工作表 (线程数: {max_workers})")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                frames = list(executor.map(read_sheet, sheet_names))
+        else:
+            frames = [read_sheet(name) for name in sheet_names]
+
+        df = pd.concat(frames, ignore_index=True)
+        self.logger.info(f"多工作表合并完成: {len(sheet_names)} 个工作表, {len(df)} 行 × {len(df.columns)} 列")
+        return df
+
     def _read_csv(self, file_path: Path, **kwargs) -> pd.DataFrame:
         """
         读取CSV文件，自动处理编码问题
@@ -147,6 +202,18 @@ class DataFileReader:
             - 默认使用逗号作为分隔符
             - 默认第一行为表头
         """
+        # 无额外参数时优先使用PyArrow多线程解析
+        if PYARROW_CSV_AVAILABLE and not kwargs:
+            for encoding in ('utf-8', 'gbk'):
+                try:
+                    df = self._read_csv_pyarrow(file_path, encoding)
+                    self.logger.info(f"CSV文件读取成功 (PyArrow, 编码: {encoding}): "
+                                   f"{len(df)} 行 × {len(df.columns)} 列")
+                    return df
+                except Exception as e:
+                    self.logger.debug(f"PyArrow 以 {encoding} 编码读取失败: {e}")
+            self.logger.debug("PyArrow 读取失败，回退到 pd.read_csv")
+        
         # 设置合理的默认值
         default_kwargs = {
             'encoding': 'utf-8',      # 优先尝试UTF-8
@@ -191,6 +258,33 @@ class DataFileReader:
             self.logger.error(f"CSV文件读取失败: {e}")
             raise
 
+    def _read_csv_pyarrow(self, file_path: Path, encoding: str = 'utf-8') -> pd.DataFrame:
+        """
+        使用 PyArrow 多线程解析CSV文件
+
+        空字符串按缺失值处理，转换为 NumPy 类型的 DataFrame。
+        PyArrow 会把日期/时间文本推断为 date32、timestamp 等类型，而 pd.read_csv 保留原文本，
+        因此这些列改按字符串读取，取值与 pd.read_csv 一致（原文本格式不变）。
+
+        Args:
+            file_path: CSV文件路径
+            encoding: 文件编码
+
+        Returns:
+            pd.DataFrame: 读取的数据
+        """
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20, encoding=encoding)
+        convert_options = pacsv.ConvertOptions(strings_can_be_null=True)
+        
+        # read_csv 按首个数据块推断列类型，流式读取器只解析首块即可得到相同的推断结果
+        schema = pacsv.open_csv(file_path, read_options=read_options, convert_options=convert_options).schema
+        temporal_columns = {field.name: pa.string() for field in schema if pa.types.is_temporal(field.type)}
+        if temporal_columns:
+            convert_options = pacsv.ConvertOptions(strings_can_be_null=True, column_types=temporal_columns)
+        
+        table = pacsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+        return table.to_pandas()
+
     @classmethod
     def get_supported_formats(cls) -> str:
         """
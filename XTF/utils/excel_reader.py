@@ -2,91 +2,268 @@
 Excel 智能读取模块
 
 优先使用高性能 Calamine 引擎（Rust实现，速度提升4-20倍）
-失败时自动回退到 OpenPyXL 引擎（Python实现，稳定可靠）
+失败时自动回退到 OpenPyXL 引擎（Python实现，稳定可靠），.xls 文件回退到 xlrd
 
 作者: XTF Team
 版本: 1.7.3+
 """
 import pandas as pd
 from pathlib import Path
-from typing import Union, Optional
+from typing import Union, Optional, List, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# 支持的引擎选项（auto 表示按优先级自动选择）
+EXCEL_ENGINES = ('auto', 'calamine', 'openpyxl', 'xlrd')
+
+
+def resolve_engine_ladder(file_path: Union[str, Path], engine: str = 'auto') -> List[str]:
+    """
+    根据文件扩展名和配置解析引擎尝试顺序
+
+    Args:
+        file_path: Excel 文件路径
+        engine: 引擎配置，auto 或具体引擎名称
+
+    Returns:
+        List[str]: 按优先级排列的引擎列表
+
+    Raises:
+        ValueError: 引擎名称不受支持时抛出
+    """
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"不支持的Excel引擎: {engine}，可选值: {', '.join(EXCEL_ENGINES)}")
+
+    if engine != 'auto':
+        return [engine]
+
+    # .xls 为 BIFF 格式，openpyxl 无法读取，回退到 xlrd
+    if Path(file_path).suffix.lower() == '.xls':
+        return ['calamine', 'xlrd']
+    return ['calamine', 'openpyxl']
+
+
+def _normalize_calamine_cell(value: Any) -> Any:
+    """
+    将 Calamine 单元格值规范为与 pd.read_excel 一致的形式
+
+    - 空字符串视为缺失值
+    - 整数值的浮点数还原为整数（Excel 内部统一以浮点存储数字）
+    """
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _build_header(header: List[Any]) -> List[Any]:
+    """
+    按 pd.read_excel 的规则生成列名
+
+    - 空单元格命名为 "Unnamed: {列下标}"
+    - 非字符串表头（如数字 2023）保持原值
+    - 重复列名依次追加 .1、.2 …（跳过已存在的名称），与 pandas 的去重结果一致
+
+    Args:
+        header: 表头行的单元格值（空单元格为 None）
+
+    Returns:
+        List[Any]: 列名列表
+    """
+    names = []
+    unnamed = []
+    for i, col in enumerate(header):
+        if col is None:
+            unnamed.append(i)
+            names.append(f"Unnamed: {i}")
+        else:
+            names.append(col)
+
+    # 与 pandas 的表头解析相同：先处理有名称的列再处理未命名列，
+    # 追加的后缀跳过表头中已存在的名称
+    counts = {}
+    for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        col = old_col = names[i]
+        cur_count = counts.get(col, 0)
+        while cur_count > 0:
+            counts[old_col] = cur_count + 1
+            col = f"{old_col}.{cur_count}"
+            cur_count = cur_count + 1 if col in names else counts.get(col, 0)
+        names[i] = col
+        counts[col] = cur_count + 1
+    return names
+
+
+def _read_with_calamine(file_path: Path, sheet_name: Union[str, int] = 0) -> pd.DataFrame:
+    """
+    直接使用 CalamineWorkbook 读取工作表，绕过 pandas 的引擎分发
+
+    Args:
+        file_path: Excel 文件路径
+        sheet_name: 工作表名称或索引
+
+    Returns:
+        pd.DataFrame: 首行为表头的数据框
+    """
+    from python_calamine import CalamineWorkbook
+
+    workbook = CalamineWorkbook.from_path(str(file_path))
+    if isinstance(sheet_name, int):
+        sheet = workbook.get_sheet_by_index(sheet_name)
+    else:
+        sheet = workbook.get_sheet_by_name(sheet_name)
+
+    rows = sheet.to_python()
+    if not rows:
+        return pd.DataFrame()
+
+    # 表头与数据单元格同样规范化（如 2023.0 还原为 2023），再按 pandas 规则命名
+    header = _build_header([_normalize_calamine_cell(v) for v in rows[0]])
+    data = [[_normalize_calamine_cell(v) for v in row] for row in rows[1:]]
+    return pd.DataFrame(data, columns=header)
+
+
+def _read_with_openpyxl(file_path: Path, sheet_name: Union[str, int] = 0) -> pd.DataFrame:
+    """
+    以只读流式模式使用 OpenPyXL 读取工作表
+
+    read_only 模式使用流式解析器，跳过样式和公式记录，
+    内存占用与文件大小成正比，避免默认模式下的整表单元格对象膨胀。
+
+    Args:
+        file_path: Excel 文件路径
+        sheet_name: 工作表名称或索引
+
+    Returns:
+        pd.DataFrame: 首行为表头的数据框
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        if isinstance(sheet_name, int):
+            worksheet = workbook.worksheets[sheet_name]
+        else:
+            worksheet = workbook[sheet_name]
+
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+
+        width = len(header)
+        columns = _build_header(list(header))
+        data = [list(row[:width]) + [None] * (width - len(row)) for row in rows]
+    finally:
+        workbook.close()
+
+    # 只读模式可能返回尾部空行（工作表维度信息不准确时）
+    while data and all(v is None for v in data[-1]):
+        data.pop()
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def _read_with_engine(
+    file_path: Path,
+    engine: str,
+    sheet_name: Union[str, int] = 0,
+    **kwargs
+) -> pd.DataFrame:
+    """
+    使用指定引擎读取 Excel 文件
+
+    Calamine/OpenPyXL 在无额外读取参数时直接调用底层库（OpenPyXL 强制只读模式），
+    存在 header/dtype 等参数时交给 pd.read_excel 以保持参数语义。
+    读取结果通过 df.attrs 记录实际引擎与是否使用只读流式模式。
+    """
+    read_only = None
+    if engine == 'calamine' and not kwargs:
+        df = _read_with_calamine(file_path, sheet_name)
+    elif engine == 'openpyxl' and not kwargs:
+        df = _read_with_openpyxl(file_path, sheet_name)
+        read_only = True
+    else:
+        df = pd.read_excel(
+            file_path,
+            sheet_name=sheet_name,
+            engine=engine,
+            **kwargs
+        )
+
+    df.attrs['excel_engine'] = engine
+    df.attrs['excel_read_only'] = read_only
+    return df
+
+
 def smart_read_excel(
     file_path: Union[str, Path],
     sheet_name: Union[str, int] = 0,
+    engine: str = 'auto',
     **kwargs
 ) -> pd.DataFrame:
     """
     智能读取 Excel 文件，自动选择最优引擎
 
-    引擎优先级:
+    引擎优先级 (engine='auto'):
     1. Calamine (python-calamine) - Rust实现，性能优异
        - 读取速度: 4-20倍于 OpenPyXL
        - 支持格式: .xlsx, .xlsm, .xls, .xlsb, .ods
        - 限制: 仅支持读取，不支持写入
 
-    2. OpenPyXL - Python实现，功能完整
-       - 读取速度: 标准性能
+    2. OpenPyXL - Python实现，功能完整 (.xlsx)
+       - 读取速度: 标准性能（只读流式模式 read_only=True, data_only=True）
        - 支持格式: .xlsx, .xlsm
        - 优势: 稳定可靠，社区成熟
 
+    3. xlrd - 仅用于 .xls 文件的回退
+
     Args:
         file_path: Excel 文件路径
         sheet_name: 工作表名称或索引，默认为 0（第一个工作表）
+        engine: 引擎选择，auto/calamine/openpyxl/xlrd，默认 auto
         **kwargs: 传递给 pd.read_excel 的其他参数
 
     Returns:
         pd.DataFrame: 读取的数据框
 
     Raises:
+        ValueError: 引擎名称不受支持时抛出
         Exception: 当所有引擎都无法读取文件时抛出异常
 
     Examples:
         >>> df = smart_read_excel('data.xlsx')
         >>> df = smart_read_excel('data.xlsx', sheet_name='Sheet1')
+        >>> df = smart_read_excel('data.xlsx', engine='openpyxl')
         >>> df = smart_read_excel('data.xlsx', header=0, dtype={'col': str})
     """
     file_path = Path(file_path)
+    ladder = resolve_engine_ladder(file_path, engine)
 
-    # 尝试 1: Calamine 引擎 (高性能)
-    try:
-        df = pd.read_excel(
-            file_path,
-            sheet_name=sheet_name,
-            engine='calamine',
-            **kwargs
-        )
-        logger.debug(f"✅ Calamine 引擎读取成功: {file_path.name}")
-        return df
+    last_error: Optional[Exception] = None
+    for name in ladder:
+        try:
+            df = _read_with_engine(file_path, name, sheet_name, **kwargs)
+            logger.debug(f"✅ {name} 引擎读取成功: {file_path.name}")
+            return df
 
-    except ImportError:
-        # python-calamine 未安装
-        logger.debug("⚠️ python-calamine 未安装，使用 OpenPyXL 引擎")
+        except ImportError as e:
+            # 引擎依赖未安装
+            logger.debug(f"⚠️ {name} 引擎未安装，尝试下一个引擎")
+            last_error = e
 
-    except Exception as e:
-        # Calamine 引擎读取失败（可能是文件格式问题）
-        logger.warning(f"⚠️ Calamine 引擎失败，切换到 OpenPyXL: {e}")
+        except Exception as e:
+            # 引擎读取失败（可能是文件格式问题）
+            logger.warning(f"⚠️ {name} 引擎读取失败: {e}")
+            last_error = e
 
-    # 尝试 2: OpenPyXL 引擎 (备用)
-    try:
-        df = pd.read_excel(
-            file_path,
-            sheet_name=sheet_name,
-            engine='openpyxl',
-            **kwargs
-        )
-        logger.debug(f"✅ OpenPyXL 引擎读取成功: {file_path.name}")
-        return df
-
-    except Exception as e:
-        # 所有引擎都失败
-        error_msg = f"❌ 无法读取 Excel 文件 {file_path.name}: {e}"
-        logger.error(error_msg)
-        raise Exception(error_msg) from e
+    # 所有引擎都失败
+    error_msg = f"❌ 无法读取 Excel 文件 {file_path.name} (尝试引擎: {', '.join(ladder)}): {last_error}"
+    logger.error(error_msg)
+    raise Exception(error_msg) from last_error
 
 
 def get_available_engines() -> dict:
@@ -98,6 +275,7 @@ def get_available_engines() -> dict:
             {
                 'calamine': bool,
                 'openpyxl': bool,
+                'xlrd': bool,
                 'primary': str,  # 主引擎名称
                 'fallback': str  # 备用引擎名称
             }
@@ -109,6 +287,7 @@ def get_available_engines() -> dict:
     engines = {
         'calamine': False,
         'openpyxl': False,
+        'xlrd': False,
         'primary': None,
         'fallback': None
     }
@@ -132,19 +311,23 @@ def get_available_engines() -> dict:
     except ImportError:
         pass
 
-    # 如果 Calamine 可用，OpenPyXL 作为备用
-    if engines['calamine'] and engines['openpyxl']:
-        engines['fallback'] = 'openpyxl'
+    # 检测 xlrd（仅用于 .xls）
+    try:
+        import xlrd
+        engines['xlrd'] = True
+    except ImportError:
+        pass
 
     return engines
 
 
-def print_engine_info(verbose: bool = True) -> Optional[str]:
+def print_engine_info(verbose: bool = True, engine: str = 'auto') -> Optional[str]:
     """
     打印当前可用的 Excel 引擎信息
 
     Args:
         verbose: 是否打印详细信息，默认为 True
+        engine: 配置的引擎（config.excel_engine），默认 auto
 
     Returns:
         str: 引擎信息字符串（当 verbose=False 时返回）
@@ -152,11 +335,19 @@ def print_engine_info(verbose: bool = True) -> Optional[str]:
     Examples:
         >>> print_engine_info()
         🚀 Excel引擎: Calamine (高性能模式) + OpenPyXL (备用)
+        >>> print_engine_info(engine='openpyxl')
+        📖 Excel引擎: OpenPyXL (配置指定)
     """
     engines = get_available_engines()
+    display_names = {'calamine': 'Calamine', 'openpyxl': 'OpenPyXL', 'xlrd': 'xlrd'}
 
     # 构建信息字符串
-    if engines['calamine'] and engines['openpyxl']:
+    if engine != 'auto':
+        if engines.get(engine):
+            info = f"📖 Excel引擎: {display_names.get(engine, engine)} (配置指定)"
+        else:
+            info = f"⚠️ 警告: 配置的 Excel 引擎 {engine} 未安装，请运行: pip install {'python-calamine' if engine == 'calamine' else engine}"
+    elif engines['calamine'] and engines['openpyxl']:
         info = "🚀 Excel引擎: Calamine (高性能模式) + OpenPyXL (备用)"
     elif engines['calamine']:
         info = "🚀 Excel引擎: Calamine (高性能模式)"
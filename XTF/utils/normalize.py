@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DataFrame 预规范化模块
+
+在构建多维表格记录之前，按目标字段类型对整列做一次向量化转换，
+使逐单元格的转换函数只需处理已是目标形态的值。
+"""
+
+import pandas as pd
+from typing import Dict, Iterable
+
+# 毫秒级时间戳下限（与 DataConverter._force_to_timestamp 的毫秒判断阈值一致，约为 1970-01-30）
+_MS_TIMESTAMP_THRESHOLD = 2524608000
+
+
+def normalize_for_feishu(df: pd.DataFrame, field_types: Dict[str, int],
+                         exclude: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    按飞书字段类型向量化规范化 DataFrame 列
+
+    - 日期字段(5) 的 datetime64 列: 整列转换为毫秒时间戳（可空整数）
+    - 文本字段(1) 的数值/object 列: 整列转换为字符串，缺失值保持缺失
+
+    转换结果与逐单元格转换完全一致；无法保证一致的列（如存在 1970-01-30 及以前的日期，
+    其毫秒时间戳会被逐单元格转换当作秒级时间戳）保持原样。
+
+    Args:
+        df: 原始数据
+        field_types: 字段名 -> 飞书字段类型
+        exclude: 不参与规范化的列（如索引列，保持其匹配语义不变）
+
+    Returns:
+        pd.DataFrame: 规范化后的新数据框（原数据不变）
+    """
+    excluded = set(exclude)
+    converted = {}
+
+    for col in df.columns:
+        if col in excluded or col not in field_types:
+            continue
+        series = df[col]
+        field_type = field_types[col]
+
+        if field_type == 5 and pd.api.types.is_datetime64_any_dtype(series.dtype):
+            # pandas 2 的 datetime64 列可能是 s/ms/us 精度，先统一到毫秒再取整数值
+            if hasattr(series.dt, 'as_unit'):
+                ms = series.dt.as_unit('ms').astype('int64')
+            else:
+                ms = series.astype('int64') // 10**6
+            ms = ms.astype('Int64').mask(series.isna())
+            if (ms.dropna() > _MS_TIMESTAMP_THRESHOLD).all():
+                converted[col] = ms
+        elif field_type == 1 and (pd.api.types.is_numeric_dtype(series.dtype) or series.dtype == object):
+            if pd.api.types.is_bool_dtype(series.dtype):
+                continue
+            converted[col] = series.astype(str).where(series.notna(), None)
+
+    if not converted:
+        return df
+    return df.assign(**converted)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DataFrame 行记录构建模块
+
+按列一次性完成缺失值处理和 Python 对象转换，再按行拼装字典，
+避免 df.iterrows() 逐行构造 Series 带来的开销。
+"""
+
+import pandas as pd
+from itertools import islice
+from typing import Dict, Any, Iterator, List
+
+
+def df_to_records(df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """
+    将 DataFrame 按行转换为 {列名: 值} 字典
+
+    缺失值（NaN/NaT/None）统一转换为 None，列名统一转换为字符串。
+
+    Args:
+        df: 数据框
+
+    Yields:
+        Dict[str, Any]: 单行数据字典
+
+    Examples:
+        >>> for row in df_to_records(df):
+        ...     print(row['ID'])
+    """
+    cols, arrays = _column_arrays(df)
+    for row in zip(*arrays):
+        yield dict(zip(cols, row))
+
+
+def iter_batches(df: pd.DataFrame, size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    将 DataFrame 按批转换为行字典列表，任一时刻只构建一个批次
+
+    Args:
+        df: 数据框
+        size: 每批行数
+
+    Yields:
+        List[Dict[str, Any]]: 单批行数据字典
+    """
+    cols, arrays = _column_arrays(df)
+    rows = zip(*arrays)
+    while True:
+        batch = [dict(zip(cols, row)) for row in islice(rows, size)]
+        if not batch:
+            return
+        yield batch
+
+
+def _column_arrays(df: pd.DataFrame):
+    """按列转换为 object 数组（缺失值为 None），返回 (列名列表, 数组列表)"""
+    cols = [str(c) for c in df.columns]
+    arrays = []
+    for i in range(len(cols)):
+        series = df.iloc[:, i]
+        arrays.append(series.astype(object).where(series.notna(), None).to_numpy())
+    return cols, arrays
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+xlsx 轻量探测模块
+
+xlsx 本质是 zip 包，工作表名称只记录在 xl/workbook.xml 中。
+直接读取该成员即可列出工作表，无需解析任何单元格数据。
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Union
+
+
+def list_sheets(file_path: Union[str, Path]) -> List[str]:
+    """
+    列出 xlsx/xlsm 文件中的工作表名称（按工作簿顺序）
+
+    zipfile 只读取中央目录和 xl/workbook.xml 成员，读取量通常只有几KB。
+
+    Args:
+        file_path: Excel 文件路径
+
+    Returns:
+        List[str]: 工作表名称列表
+
+    Raises:
+        ValueError: 文件不是有效的 xlsx 压缩包时抛出
+
+    Examples:
+        >>> list_sheets('data.xlsx')
+        ['Sheet1', 'Sheet2']
+    """
+    sheets = []
+    try:
+        with zipfile.ZipFile(file_path) as zf, zf.open('xl/workbook.xml') as workbook:
+            for _, element in ET.iterparse(workbook):
+                if element.tag.rsplit('}', 1)[-1] == 'sheet':
+                    sheets.append(element.get('name'))
+                element.clear()
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"不是有效的 xlsx 文件: {file_path}: {e}") from e
+    return sheets